@@ -8,17 +8,35 @@ Author: DSS UAS Project
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.cluster import KMeans
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
+import hashlib
+import threading
+from collections import OrderedDict
+import json
+import os
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
+# Shared services live next to the Flask API
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+from compact_forest import COMPACT_FILE, CompactForest, compact_enabled
+from compact_frame import compact_frame
+from facets import FacetIndex
+from lazy_import import import_report, lazy_import
+from publisher_leaderboard import PublisherLeaderboard
+from preprocess import NUMERIC_COLUMNS, SELECTED_COLUMNS
+from state_dir import default_state_dir
+from warm_cache import WarmCache, inputs_key, source_files
+from year_cube import MomentCube, YearCube
+
+# Plotly is imported on the first chart, sklearn only when the model is trained
+px = lazy_import('plotly.express')
+go = lazy_import('plotly.graph_objects')
+plotly_subplots = lazy_import('plotly.subplots')
+
+# Trained model and cubes are snapshotted here, keyed by the dataset and code; empty disables
+WARM_CACHE_DIR = os.environ.get('DSS_WARM_CACHE', default_state_dir('warm-cache'))
+
 # ==================== PAGE CONFIG ====================
 st.set_page_config(
     page_title="🎮 DSS Video Games Analysis",
@@ -133,38 +151,65 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ==================== LOAD DATA & TRAIN MODEL ====================
-@st.cache_data
+@st.cache_resource
 def load_data():
-    """Load and preprocess all datasets"""
-    df_clean = pd.read_csv('dataset/clean_data_video_games.csv')
-    df_cluster = pd.read_csv('dataset/data_with_cluster.csv')
+    """Load the games once per process as one compact table.
+
+    df_clean is a column view of df_cluster (the same rows without the
+    cluster columns), not a second copy.
+    """
+    df_cluster = compact_frame(pd.read_csv('dataset/data_with_cluster.csv'))
+    df_clean = df_cluster[SELECTED_COLUMNS]
     return df_clean, df_cluster
 
+@st.cache_resource
+def get_warm_cache(name):
+    """Snapshot file for the current dataset, app and backend code"""
+    if not WARM_CACHE_DIR:
+        return None
+    key = inputs_key(['dataset/data_with_cluster.csv', 'app.py', *source_files('backend')])
+    return WarmCache(WARM_CACHE_DIR, key, name=name)
+
+@st.cache_resource
+def load_warm_state(name):
+    """Memory-mapped state of an earlier run with the same inputs ({} if none)"""
+    cache = get_warm_cache(name)
+    return (cache.load() if cache else None) or {}
+
+def warm_or_build(snapshot, name, build, df):
+    state = load_warm_state(snapshot)
+    return state[name] if name in state else build(df)
+
 @st.cache_resource
 def train_model(df):
     """Train the prediction model"""
-    # Feature Engineering
-    def categorize_success(sales):
-        if sales >= 5:
-            return 'Blockbuster'
-        elif sales >= 2:
-            return 'Hit'
-        elif sales >= 1:
-            return 'Moderate'
-        else:
-            return 'Low'
-    
-    df_model = df.copy()
-    df_model['Success_Category'] = df_model['Global_Sales'].apply(categorize_success)
+    # The model has its own snapshot, so loading the cubes does not import sklearn
+    warm = load_warm_state('streamlit-model').get('train_model')
+    if warm is not None:
+        return warm
+
+    from sklearn.preprocessing import LabelEncoder
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.model_selection import train_test_split
+    from sklearn.metrics import accuracy_score
+
+    # Feature Engineering: Low < 1M <= Moderate < 2M <= Hit < 5M <= Blockbuster
+    success_category = pd.cut(df['Global_Sales'], bins=[-np.inf, 1, 2, 5, np.inf], right=False,
+                              labels=['Low', 'Moderate', 'Hit', 'Blockbuster'])
     
-    # Encode categorical variables
-    le_platform = LabelEncoder()
-    le_genre = LabelEncoder()
-    le_publisher = LabelEncoder()
+    # Encode categorical variables: the columns are categoricals with sorted
+    # categories, so their codes are exactly the LabelEncoder codes
+    le_platform = LabelEncoder().fit(df['Platform'].cat.categories)
+    le_genre = LabelEncoder().fit(df['Genre'].cat.categories)
+    le_publisher = LabelEncoder().fit(df['Publisher'].cat.categories)
     
-    df_model['Platform_Encoded'] = le_platform.fit_transform(df_model['Platform'])
-    df_model['Genre_Encoded'] = le_genre.fit_transform(df_model['Genre'])
-    df_model['Publisher_Encoded'] = le_publisher.fit_transform(df_model['Publisher'])
+    # Derived columns on top of df; the game columns themselves are shared, not copied
+    df_model = df.assign(
+        Success_Category=success_category,
+        Platform_Encoded=df['Platform'].cat.codes,
+        Genre_Encoded=df['Genre'].cat.codes,
+        Publisher_Encoded=df['Publisher'].cat.codes
+    )
     
     # Features and Target
     feature_cols = ['Platform_Encoded', 'Genre_Encoded', 'Publisher_Encoded', 
@@ -196,10 +241,146 @@ def train_model(df):
     
     return rf_model, le_platform, le_genre, le_publisher, accuracy, feature_importance, df_model
 
+def warm_up(df):
+    """Train the model and build the cubes, then snapshot them if the warm cache missed"""
+    for snapshot, builders in WARM_SNAPSHOTS.items():
+        state = {name: build(df) for name, build in builders.items()}
+        cache = get_warm_cache(snapshot)
+        if cache and not load_warm_state(snapshot):
+            try:
+                cache.save(state)
+            except OSError:
+                pass
+
+@st.cache_resource
+def start_model_warmup(df):
+    """Train the model in a background thread; train_model() callers wait for it"""
+    thread = threading.Thread(target=warm_up, args=(df,), name='model-warmup', daemon=True)
+    thread.start()
+    return thread
+
+@st.cache_data
+def load_exported_metadata():
+    """Pre-serialized metadata of the exported model"""
+    with open('models/metadata.json') as f:
+        return json.load(f)
+
+@st.cache_resource
+def load_compact_model():
+    """Exported compact forest for predictions when DSS_COMPACT_FOREST is set"""
+    path = os.path.join('models', COMPACT_FILE)
+    return CompactForest.load(path) if compact_enabled() and os.path.exists(path) else None
+
+@st.cache_resource
+def build_publisher_leaderboard(df):
+    """Precompute publisher totals and success rates"""
+    return warm_or_build('streamlit-cubes', 'publisher_leaderboard', PublisherLeaderboard.from_frame, df)
+
+@st.cache_resource
+def build_year_cube(df):
+    """Prefix sums per platform/genre over years for range totals"""
+    return warm_or_build('streamlit-cubes', 'year_cube', YearCube, df)
+
+@st.cache_resource
+def build_moment_cube(df):
+    """Correlation moments per platform/genre over years"""
+    return warm_or_build('streamlit-cubes', 'moment_cube', MomentCube, df)
+
+@st.cache_resource
+def build_facet_index(df):
+    """Row bitmaps per platform/genre/publisher/year for live filter counts"""
+    return warm_or_build('streamlit-cubes', 'facet_index', FacetIndex, df)
+
+# Everything warm_up() builds and snapshots, per snapshot file
+WARM_SNAPSHOTS = {
+    'streamlit-model': {'train_model': train_model},
+    'streamlit-cubes': {
+        'publisher_leaderboard': build_publisher_leaderboard,
+        'year_cube': build_year_cube,
+        'moment_cube': build_moment_cube,
+        'facet_index': build_facet_index
+    }
+}
+
+# ==================== FIGURE CACHE ====================
+def data_fingerprint(*parts):
+    """Stable content hash of the inputs a chart is built from"""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, pd.DataFrame):
+            h.update(repr(list(part.columns)).encode())
+            h.update(pd.util.hash_pandas_object(part, index=True).values.tobytes())
+        elif isinstance(part, pd.Series):
+            h.update(repr(part.name).encode())
+            h.update(pd.util.hash_pandas_object(part, index=True).values.tobytes())
+        else:
+            h.update(repr(part).encode())
+    return h.hexdigest()
+
+
+class FigureCache:
+    """LRU store of built Plotly figures keyed on chart id + data fingerprint.
+
+    Figures are kept as objects, so a hit skips both the build and any JSON
+    round trip; st.plotly_chart only reads them. Sizes are measured from the
+    figure JSON once, when the figure is built.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, chart_id, data, build):
+        key = (chart_id, data_fingerprint(*data) if isinstance(data, tuple) else data_fingerprint(data))
+        with self._lock:
+            entry = self._figures.get(key)
+            if entry is not None:
+                self._figures.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+        fig = build()
+        size = len(fig.to_json())
+        with self._lock:
+            self.misses += 1
+            if key not in self._figures:
+                self._figures[key] = (fig, size)
+                self.bytes_used += size
+            while self.bytes_used > self.max_bytes and len(self._figures) > 1:
+                _, (_, evicted_size) = self._figures.popitem(last=False)
+                self.bytes_used -= evicted_size
+        return fig
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._figures),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "bytes": self.bytes_used
+            }
+
+
+@st.cache_resource
+def get_figure_cache():
+    """One figure cache per server process, shared across reruns and sessions"""
+    return FigureCache()
+
+
+def cached_chart(chart_id, data, build):
+    """Render a chart, rebuilding the figure only when its input data changed"""
+    fig = get_figure_cache().get_or_build(chart_id, data, build)
+    st.plotly_chart(fig, use_container_width=True)
+
 # Load data
 try:
     df_clean, df_cluster = load_data()
-    rf_model, le_platform, le_genre, le_publisher, model_accuracy, feature_importance, df_model = train_model(df_clean)
+    model_warmup = start_model_warmup(df_clean)
     data_loaded = True
 except Exception as e:
     st.error(f"Error loading data: {e}")
@@ -235,8 +416,27 @@ with st.sidebar:
     
     st.markdown("### ⚙️ Model Performance")
     if data_loaded:
-        st.metric("Accuracy", f"{model_accuracy:.1%}")
-    
+        if model_warmup.is_alive():
+            st.metric("Accuracy", f"{load_exported_metadata()['model_accuracy']:.1%}",
+                      help="Exported model; the app's model is still training")
+        else:
+            st.metric("Accuracy", f"{train_model(df_clean)[4]:.1%}")
+
+    st.markdown("---")
+
+    st.markdown("### 🗂️ Chart Cache")
+    cache_stats = get_figure_cache().stats()
+    st.caption(
+        f"Hit rate: {cache_stats['hit_rate']:.0%} "
+        f"({cache_stats['hits']}/{cache_stats['hits'] + cache_stats['misses']}) · "
+        f"{cache_stats['entries']} charts · {cache_stats['bytes'] / 1024:.0f} KB"
+    )
+
+    import_ms = import_report()
+    if import_ms:
+        st.markdown("### ⏱️ Import Times")
+        st.caption(" · ".join(f"{name} {ms:.0f} ms" for name, ms in import_ms.items()))
+
     st.markdown("---")
     st.markdown("""
     <div style='text-align: center; color: #666; font-size: 0.8rem;'>
@@ -256,16 +456,18 @@ if data_loaded:
         # Key Metrics
         col1, col2, col3, col4 = st.columns(4)
         
+        totals = build_year_cube(df_clean).totals()
+        
         with col1:
             st.markdown("""
             <div class='metric-card'>
                 <div class='metric-value'>{:,}</div>
                 <div class='metric-label'>Total Games</div>
             </div>
-            """.format(len(df_clean)), unsafe_allow_html=True)
+            """.format(int(totals['count'])), unsafe_allow_html=True)
         
         with col2:
-            total_sales = df_clean['Global_Sales'].sum()
+            total_sales = totals['Global_Sales']
             st.markdown(f"""
             <div class='metric-card' style='background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%);'>
                 <div class='metric-value'>{total_sales:.1f}M</div>
@@ -274,7 +476,7 @@ if data_loaded:
             """, unsafe_allow_html=True)
         
         with col3:
-            avg_critic = df_clean['Critic_Score'].mean()
+            avg_critic = totals['Critic_Score'] / totals['count']
             st.markdown(f"""
             <div class='metric-card' style='background: linear-gradient(135deg, #FF6B6B 0%, #FF8E53 100%);'>
                 <div class='metric-value'>{avg_critic:.1f}</div>
@@ -283,7 +485,7 @@ if data_loaded:
             """, unsafe_allow_html=True)
         
         with col4:
-            avg_user = df_clean['User_Score'].mean()
+            avg_user = totals['User_Score'] / totals['count']
             st.markdown(f"""
             <div class='metric-card' style='background: linear-gradient(135deg, #4ECDC4 0%, #44A08D 100%);'>
                 <div class='metric-value'>{avg_user:.1f}</div>
@@ -298,33 +500,41 @@ if data_loaded:
         
         with col1:
             st.markdown("### 📊 Sales by Genre")
-            genre_sales = df_clean.groupby('Genre')['Global_Sales'].sum().sort_values(ascending=True)
-            fig = px.bar(
-                x=genre_sales.values,
-                y=genre_sales.index,
-                orientation='h',
-                color=genre_sales.values,
-                color_continuous_scale='Viridis'
-            )
-            fig.update_layout(
-                xaxis_title="Total Sales (Million Units)",
-                yaxis_title="",
-                showlegend=False,
-                height=400
-            )
-            st.plotly_chart(fig, use_container_width=True)
+
+            def build_genre_sales():
+                genre_sales = df_clean.groupby('Genre', observed=True)['Global_Sales'].sum().sort_values(ascending=True)
+                fig = px.bar(
+                    x=genre_sales.values,
+                    y=genre_sales.index,
+                    orientation='h',
+                    color=genre_sales.values,
+                    color_continuous_scale='Viridis'
+                )
+                fig.update_layout(
+                    xaxis_title="Total Sales (Million Units)",
+                    yaxis_title="",
+                    showlegend=False,
+                    height=400
+                )
+                return fig
+
+            cached_chart('dashboard_genre_sales', df_clean, build_genre_sales)
         
         with col2:
             st.markdown("### 🎮 Top Platforms")
-            platform_sales = df_clean.groupby('Platform')['Global_Sales'].sum().sort_values(ascending=False).head(10)
-            fig = px.pie(
-                values=platform_sales.values,
-                names=platform_sales.index,
-                hole=0.4,
-                color_discrete_sequence=px.colors.qualitative.Set2
-            )
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
+
+            def build_top_platforms():
+                platform_sales = df_clean.groupby('Platform', observed=True)['Global_Sales'].sum().sort_values(ascending=False).head(10)
+                fig = px.pie(
+                    values=platform_sales.values,
+                    names=platform_sales.index,
+                    hole=0.4,
+                    color_discrete_sequence=px.colors.qualitative.Set2
+                )
+                fig.update_layout(height=400)
+                return fig
+
+            cached_chart('dashboard_top_platforms', df_clean, build_top_platforms)
         
         # Charts Row 2
         col1, col2 = st.columns(2)
@@ -333,59 +543,81 @@ if data_loaded:
             st.markdown("### 🌍 Regional Sales Distribution")
             regions = ['NA_Sales', 'EU_Sales', 'JP_Sales', 'Other_Sales']
             region_names = ['North America', 'Europe', 'Japan', 'Other']
-            region_totals = [df_clean[col].sum() for col in regions]
-            
-            fig = px.pie(
-                values=region_totals,
-                names=region_names,
-                color_discrete_sequence=['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4']
-            )
-            fig.update_layout(height=350)
-            st.plotly_chart(fig, use_container_width=True)
+
+            def build_regional_sales():
+                region_totals = [df_clean[col].sum() for col in regions]
+                fig = px.pie(
+                    values=region_totals,
+                    names=region_names,
+                    color_discrete_sequence=['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4']
+                )
+                fig.update_layout(height=350)
+                return fig
+
+            cached_chart('dashboard_regional_sales', df_clean[regions], build_regional_sales)
         
         with col2:
             st.markdown("### ⭐ Score vs Sales")
-            fig = px.scatter(
-                df_clean,
-                x='Critic_Score',
-                y='User_Score',
-                size='Global_Sales',
-                color='Genre',
-                hover_name='Name',
-                size_max=30,
-                opacity=0.7
-            )
-            fig.update_layout(height=350)
-            st.plotly_chart(fig, use_container_width=True)
+
+            def build_score_vs_sales():
+                fig = px.scatter(
+                    df_clean,
+                    x='Critic_Score',
+                    y='User_Score',
+                    size='Global_Sales',
+                    color='Genre',
+                    hover_name='Name',
+                    size_max=30,
+                    opacity=0.7
+                )
+                fig.update_layout(height=350)
+                return fig
+
+            cached_chart('dashboard_score_vs_sales', df_clean, build_score_vs_sales)
     
     # ========== DATA EXPLORER ==========
     elif menu == "📊 Data Explorer":
         st.markdown("## 📊 Data Explorer")
         st.markdown("Jelajahi dataset video games dengan filter interaktif")
         
-        # Filters
+        # Filters, each option labelled with the games it would leave under the other filters
+        year_bounds = (int(df_clean['Year_of_Release'].min()), int(df_clean['Year_of_Release'].max()))
+        facet_counts = build_facet_index(df_clean).counts(
+            platform=st.session_state.get('explorer_platforms'),
+            genre=st.session_state.get('explorer_genres'),
+            year_min=st.session_state.get('explorer_years', year_bounds)[0],
+            year_max=st.session_state.get('explorer_years', year_bounds)[1]
+        )['facets']
+        platform_counts = {f['value']: f['count'] for f in facet_counts['platform']}
+        genre_counts = {f['value']: f['count'] for f in facet_counts['genre']}
+        
         col1, col2, col3 = st.columns(3)
         
         with col1:
             selected_platforms = st.multiselect(
                 "Platform",
                 options=df_clean['Platform'].unique(),
-                default=[]
+                default=[],
+                format_func=lambda p: f"{p} ({platform_counts.get(p, 0)})",
+                key='explorer_platforms'
             )
         
         with col2:
             selected_genres = st.multiselect(
                 "Genre",
                 options=df_clean['Genre'].unique(),
-                default=[]
+                default=[],
+                format_func=lambda g: f"{g} ({genre_counts.get(g, 0)})",
+                key='explorer_genres'
             )
         
         with col3:
             year_range = st.slider(
                 "Year Range",
-                min_value=int(df_clean['Year_of_Release'].min()),
-                max_value=int(df_clean['Year_of_Release'].max()),
-                value=(int(df_clean['Year_of_Release'].min()), int(df_clean['Year_of_Release'].max()))
+                min_value=year_bounds[0],
+                max_value=year_bounds[1],
+                value=year_bounds,
+                key='explorer_years'
             )
         
         # Apply filters
@@ -399,12 +631,16 @@ if data_loaded:
             (filtered_df['Year_of_Release'] <= year_range[1])
         ]
         
-        # Display metrics
+        # Display metrics (range totals from the year cube, no pass over the rows)
+        totals = build_year_cube(df_clean).totals(
+            platform=selected_platforms, genre=selected_genres, year_min=year_range[0], year_max=year_range[1]
+        )
+        n_filtered = int(totals['count'])
         col1, col2, col3, col4 = st.columns(4)
-        col1.metric("Filtered Games", f"{len(filtered_df):,}")
-        col2.metric("Total Sales", f"{filtered_df['Global_Sales'].sum():.1f}M")
-        col3.metric("Avg Critic Score", f"{filtered_df['Critic_Score'].mean():.1f}")
-        col4.metric("Avg User Score", f"{filtered_df['User_Score'].mean():.1f}")
+        col1.metric("Filtered Games", f"{n_filtered:,}")
+        col2.metric("Total Sales", f"{totals['Global_Sales']:.1f}M")
+        col3.metric("Avg Critic Score", f"{totals['Critic_Score'] / n_filtered:.1f}" if n_filtered else "nan")
+        col4.metric("Avg User Score", f"{totals['User_Score'] / n_filtered:.1f}" if n_filtered else "nan")
         
         st.markdown("---")
         
@@ -430,10 +666,14 @@ if data_loaded:
             
             with col2:
                 st.markdown("### Top Publishers")
-                top_pub = filtered_df.groupby('Publisher')['Global_Sales'].sum().nlargest(10)
-                fig = px.bar(x=top_pub.values, y=top_pub.index, orientation='h')
-                fig.update_layout(xaxis_title="Total Sales (M)", yaxis_title="")
-                st.plotly_chart(fig, use_container_width=True)
+
+                def build_top_publishers():
+                    top_pub = filtered_df.groupby('Publisher', observed=True)['Global_Sales'].sum().nlargest(10)
+                    fig = px.bar(x=top_pub.values, y=top_pub.index, orientation='h')
+                    fig.update_layout(xaxis_title="Total Sales (M)", yaxis_title="")
+                    return fig
+
+                cached_chart('explorer_top_publishers', filtered_df[['Publisher', 'Global_Sales']], build_top_publishers)
         
         with tab3:
             search_term = st.text_input("🔍 Search Game by Name")
@@ -449,6 +689,7 @@ if data_loaded:
     elif menu == "🔮 Prediction Tool":
         st.markdown("## 🔮 Game Success Prediction")
         st.markdown("Prediksi kesuksesan video game berdasarkan karakteristik game")
+        rf_model, le_platform, le_genre, le_publisher, model_accuracy, feature_importance, df_model = train_model(df_clean)
         
         col1, col2 = st.columns([1, 1])
         
@@ -522,9 +763,10 @@ if data_loaded:
                                      critic_score, user_score, year]])
                 
                 # Predict
-                prediction = rf_model.predict(features)[0]
-                probabilities = rf_model.predict_proba(features)[0]
-                prob_dict = dict(zip(rf_model.classes_, probabilities))
+                predictor = load_compact_model() or rf_model
+                prediction = predictor.predict(features)[0]
+                probabilities = predictor.predict_proba(features)[0]
+                prob_dict = dict(zip(predictor.classes_, probabilities))
                 
                 # Display result
                 color_map = {
@@ -560,22 +802,25 @@ if data_loaded:
                     'Category': list(prob_dict.keys()),
                     'Probability': list(prob_dict.values())
                 }).sort_values('Probability', ascending=True)
-                
-                fig = px.bar(
-                    prob_df,
-                    x='Probability',
-                    y='Category',
-                    orientation='h',
-                    color='Probability',
-                    color_continuous_scale='Viridis'
-                )
-                fig.update_layout(
-                    showlegend=False,
-                    xaxis_title="Probability",
-                    yaxis_title="",
-                    xaxis_tickformat='.0%'
-                )
-                st.plotly_chart(fig, use_container_width=True)
+
+                def build_probabilities():
+                    fig = px.bar(
+                        prob_df,
+                        x='Probability',
+                        y='Category',
+                        orientation='h',
+                        color='Probability',
+                        color_continuous_scale='Viridis'
+                    )
+                    fig.update_layout(
+                        showlegend=False,
+                        xaxis_title="Probability",
+                        yaxis_title="",
+                        xaxis_tickformat='.0%'
+                    )
+                    return fig
+
+                cached_chart('prediction_probabilities', prob_df, build_probabilities)
                 
                 # Recommendations
                 st.markdown("### 💡 Recommendations")
@@ -613,16 +858,20 @@ if data_loaded:
                 
                 # Show feature importance
                 st.markdown("### 🎯 Key Success Factors")
-                fig = px.bar(
-                    feature_importance,
-                    x='Importance',
-                    y='Feature',
-                    orientation='h',
-                    color='Importance',
-                    color_continuous_scale='Blues'
-                )
-                fig.update_layout(showlegend=False, yaxis_title="")
-                st.plotly_chart(fig, use_container_width=True)
+
+                def build_feature_importance():
+                    fig = px.bar(
+                        feature_importance,
+                        x='Importance',
+                        y='Feature',
+                        orientation='h',
+                        color='Importance',
+                        color_continuous_scale='Blues'
+                    )
+                    fig.update_layout(showlegend=False, yaxis_title="")
+                    return fig
+
+                cached_chart('prediction_feature_importance', feature_importance, build_feature_importance)
     
     # ========== ANALYTICS ==========
     elif menu == "📈 Analytics":
@@ -638,30 +887,34 @@ if data_loaded:
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    cluster_counts = df_cluster['Cluster_Label'].value_counts()
-                    fig = px.pie(
-                        values=cluster_counts.values,
-                        names=cluster_counts.index,
-                        title="Distribution by Cluster",
-                        color_discrete_sequence=px.colors.qualitative.Set2
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
+                    def build_cluster_distribution():
+                        cluster_counts = df_cluster['Cluster_Label'].value_counts()
+                        return px.pie(
+                            values=cluster_counts.values,
+                            names=cluster_counts.index,
+                            title="Distribution by Cluster",
+                            color_discrete_sequence=px.colors.qualitative.Set2
+                        )
+
+                    cached_chart('analytics_cluster_distribution', df_cluster['Cluster_Label'], build_cluster_distribution)
                 
                 with col2:
-                    fig = px.scatter(
-                        df_cluster,
-                        x='Global_Sales',
-                        y='Critic_Score',
-                        color='Cluster_Label',
-                        hover_name='Name',
-                        title="Cluster Distribution (Sales vs Score)",
-                        opacity=0.7
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
+                    def build_cluster_scatter():
+                        return px.scatter(
+                            df_cluster,
+                            x='Global_Sales',
+                            y='Critic_Score',
+                            color='Cluster_Label',
+                            hover_name='Name',
+                            title="Cluster Distribution (Sales vs Score)",
+                            opacity=0.7
+                        )
+
+                    cached_chart('analytics_cluster_scatter', df_cluster, build_cluster_scatter)
                 
                 # Cluster statistics
                 st.markdown("### 📊 Cluster Statistics")
-                cluster_stats = df_cluster.groupby('Cluster_Label').agg({
+                cluster_stats = df_cluster.groupby('Cluster_Label', observed=True).agg({
                     'Global_Sales': ['mean', 'sum', 'count'],
                     'Critic_Score': 'mean',
                     'User_Score': 'mean'
@@ -673,59 +926,78 @@ if data_loaded:
             st.markdown("### 📈 Trend Analysis")
             
             # Yearly trends
-            yearly_data = df_clean.groupby('Year_of_Release').agg({
-                'Global_Sales': 'sum',
-                'Critic_Score': 'mean',
-                'Name': 'count'
-            }).reset_index()
-            yearly_data.columns = ['Year', 'Total Sales', 'Avg Score', 'Game Count']
-            
-            fig = make_subplots(specs=[[{"secondary_y": True}]])
-            
-            fig.add_trace(
-                go.Bar(x=yearly_data['Year'], y=yearly_data['Total Sales'], name="Total Sales", marker_color='#4ECDC4'),
-                secondary_y=False
-            )
-            
-            fig.add_trace(
-                go.Scatter(x=yearly_data['Year'], y=yearly_data['Avg Score'], name="Avg Score", line=dict(color='#FF6B6B', width=3)),
-                secondary_y=True
-            )
-            
-            fig.update_layout(title="Yearly Sales & Average Score Trend", height=400)
-            fig.update_xaxes(title_text="Year")
-            fig.update_yaxes(title_text="Total Sales (M)", secondary_y=False)
-            fig.update_yaxes(title_text="Average Critic Score", secondary_y=True)
+            def build_yearly_trend():
+                yearly_data = df_clean.groupby('Year_of_Release').agg({
+                    'Global_Sales': 'sum',
+                    'Critic_Score': 'mean',
+                    'Name': 'count'
+                }).reset_index()
+                yearly_data.columns = ['Year', 'Total Sales', 'Avg Score', 'Game Count']
+                
+                fig = plotly_subplots.make_subplots(specs=[[{"secondary_y": True}]])
+                
+                fig.add_trace(
+                    go.Bar(x=yearly_data['Year'], y=yearly_data['Total Sales'], name="Total Sales", marker_color='#4ECDC4'),
+                    secondary_y=False
+                )
+                
+                fig.add_trace(
+                    go.Scatter(x=yearly_data['Year'], y=yearly_data['Avg Score'], name="Avg Score", line=dict(color='#FF6B6B', width=3)),
+                    secondary_y=True
+                )
+                
+                fig.update_layout(title="Yearly Sales & Average Score Trend", height=400)
+                fig.update_xaxes(title_text="Year")
+                fig.update_yaxes(title_text="Total Sales (M)", secondary_y=False)
+                fig.update_yaxes(title_text="Average Critic Score", secondary_y=True)
+                return fig
             
-            st.plotly_chart(fig, use_container_width=True)
+            cached_chart('analytics_yearly_trend', df_clean, build_yearly_trend)
             
             # Genre trend
-            genre_yearly = df_clean.groupby(['Year_of_Release', 'Genre'])['Global_Sales'].sum().reset_index()
-            fig = px.area(
-                genre_yearly,
-                x='Year_of_Release',
-                y='Global_Sales',
-                color='Genre',
-                title="Genre Sales Trend Over Years"
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            def build_genre_trend():
+                genre_yearly = df_clean.groupby(['Year_of_Release', 'Genre'], observed=True)['Global_Sales'].sum().reset_index()
+                return px.area(
+                    genre_yearly,
+                    x='Year_of_Release',
+                    y='Global_Sales',
+                    color='Genre',
+                    title="Genre Sales Trend Over Years"
+                )
+            
+            cached_chart('analytics_genre_trend', df_clean, build_genre_trend)
         
         with tab3:
             st.markdown("### 🔗 Correlation Analysis")
             
-            numeric_cols = ['NA_Sales', 'EU_Sales', 'JP_Sales', 'Other_Sales', 'Global_Sales', 'Critic_Score', 'User_Score']
-            corr_matrix = df_clean[numeric_cols].corr()
+            numeric_cols = NUMERIC_COLUMNS
+            col1, col2 = st.columns(2)
+            with col1:
+                corr_platforms = st.multiselect("Platform", options=sorted(df_clean['Platform'].unique()),
+                                                default=[], key='corr_platforms')
+            with col2:
+                corr_genres = st.multiselect("Genre", options=sorted(df_clean['Genre'].unique()),
+                                             default=[], key='corr_genres')
+
+            # Merged from per-group moments, no pass over the rows
+            corr_count, corr_values = build_moment_cube(df_clean).correlation(
+                platform=corr_platforms, genre=corr_genres)
+            corr_matrix = pd.DataFrame(corr_values, index=numeric_cols, columns=numeric_cols)
+            st.caption(f"{corr_count:,} games")
+            
+            def build_correlation_heatmap():
+                fig = px.imshow(
+                    corr_matrix,
+                    labels=dict(color="Correlation"),
+                    x=numeric_cols,
+                    y=numeric_cols,
+                    color_continuous_scale='RdBu_r',
+                    aspect='auto'
+                )
+                fig.update_layout(title="Correlation Heatmap", height=500)
+                return fig
             
-            fig = px.imshow(
-                corr_matrix,
-                labels=dict(color="Correlation"),
-                x=numeric_cols,
-                y=numeric_cols,
-                color_continuous_scale='RdBu_r',
-                aspect='auto'
-            )
-            fig.update_layout(title="Correlation Heatmap", height=500)
-            st.plotly_chart(fig, use_container_width=True)
+            cached_chart('analytics_correlation_heatmap', corr_matrix, build_correlation_heatmap)
             
             # Key insights
             st.markdown("### 💡 Key Insights")
@@ -743,6 +1015,7 @@ if data_loaded:
     elif menu == "🎯 Recommendations":
         st.markdown("## 🎯 Strategic Recommendations")
         st.markdown("Rekomendasi berdasarkan analisis data untuk stakeholder")
+        rf_model, le_platform, le_genre, le_publisher, model_accuracy, feature_importance, df_model = train_model(df_clean)
         
         # Best performers
         best_genre = df_model[df_model['Success_Category']=='Blockbuster']['Genre'].value_counts().idxmax() if len(df_model[df_model['Success_Category']=='Blockbuster']) > 0 else "Action"
@@ -873,24 +1146,24 @@ if data_loaded:
             
             # Publisher performance
             st.markdown("### 🏆 Top Performing Publishers")
-            pub_performance = df_model.groupby('Publisher').agg({
-                'Global_Sales': 'sum',
-                'Success_Category': lambda x: (x.isin(['Blockbuster', 'Hit']).sum() / len(x)) * 100
-            }).round(2)
-            pub_performance.columns = ['Total Sales (M)', 'Success Rate (%)']
-            pub_performance = pub_performance.sort_values('Total Sales (M)', ascending=False).head(10)
-            
-            fig = px.scatter(
-                pub_performance.reset_index(),
-                x='Total Sales (M)',
-                y='Success Rate (%)',
-                size='Total Sales (M)',
-                hover_name='Publisher',
-                color='Success Rate (%)',
-                color_continuous_scale='Greens'
-            )
-            fig.update_layout(title="Publisher Performance: Sales vs Success Rate")
-            st.plotly_chart(fig, use_container_width=True)
+            pub_performance = build_publisher_leaderboard(df_clean).to_frame(top_n=10)[
+                ['Total Sales (M)', 'Success Rate (%)']
+            ]
+            
+            def build_publisher_performance():
+                fig = px.scatter(
+                    pub_performance.reset_index(),
+                    x='Total Sales (M)',
+                    y='Success Rate (%)',
+                    size='Total Sales (M)',
+                    hover_name='Publisher',
+                    color='Success Rate (%)',
+                    color_continuous_scale='Greens'
+                )
+                fig.update_layout(title="Publisher Performance: Sales vs Success Rate")
+                return fig
+            
+            cached_chart('investor_publisher_performance', pub_performance, build_publisher_performance)
 
 else:
     st.error("Failed to load data. Please check if the dataset files exist in the 'dataset' folder.")
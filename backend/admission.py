@@ -0,0 +1,200 @@
+"""
+🎮 DSS Video Games - Admission Control
+Per-process admission for API requests: a concurrency cap shared by all
+routes, per-route limits for expensive routes, a priority queue that lets
+cheap reads overtake queued inference, per-client token buckets, and early
+shedding (429/503 with Retry-After) when the queue is full or a wait times out.
+"""
+
+import heapq
+import itertools
+import math
+import threading
+import time
+from collections import defaultdict, deque
+
+# Seconds clients are told to wait after a queue-full or timeout shed
+RETRY_AFTER_SECONDS = 1
+# Recent admission waits kept per route for the percentiles
+WAIT_SAMPLES = 1000
+# Idle (full) client buckets are dropped once this many clients are tracked
+MAX_CLIENTS = 10000
+
+
+def parse_route_limits(value):
+    """'/api/predict=2,/api/predict/batch=1' -> {'/api/predict': 2, '/api/predict/batch': 1}"""
+    limits = {}
+    for item in (value or '').split(','):
+        if '=' in item:
+            route, limit = item.rsplit('=', 1)
+            limits[route.strip()] = int(limit)
+    return limits
+
+
+class Shed(Exception):
+    """A request turned away; status is 429 (rate limited) or 503 (overloaded)"""
+
+    def __init__(self, status, message, retry_after):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class _Waiter:
+    __slots__ = ('route', 'granted', 'event')
+
+    def __init__(self, route):
+        self.route = route
+        self.granted = False
+        self.event = threading.Event()
+
+
+class _RouteStats:
+    __slots__ = ('admitted', 'queued', 'rate_limited', 'queue_full', 'timed_out', 'waits_ms')
+
+    def __init__(self):
+        self.admitted = 0
+        self.queued = 0
+        self.rate_limited = 0
+        self.queue_full = 0
+        self.timed_out = 0
+        self.waits_ms = deque(maxlen=WAIT_SAMPLES)
+
+
+class AdmissionController:
+    """Decides whether, and when, a request may run.
+
+    ``capacity`` requests run at once, at most ``route_limits[route]`` of them
+    on a limited route. Requests that cannot run wait in a queue ordered by
+    route cost (``route_costs``, 0 for unlisted cheap reads), so freed capacity
+    goes to cheap reads first. Limited routes are also rate limited per client
+    with a token bucket of ``rate`` requests/s and ``burst`` tokens.
+    """
+
+    def __init__(self, capacity, max_queue, max_wait, route_limits=None, route_costs=None,
+                 rate=0.0, burst=1):
+        self.capacity = capacity
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.route_limits = dict(route_limits or {})
+        self.route_costs = dict(route_costs or {})
+        self.rate = rate
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._running = 0
+        self._active = defaultdict(int)
+        self._queue = []
+        self._seq = itertools.count()
+        self._buckets = {}
+        self._stats = defaultdict(_RouteStats)
+        self._max_depth = 0
+
+    def _can_run(self, route):
+        return (self._running < self.capacity and
+                self._active[route] < self.route_limits.get(route, self.capacity))
+
+    def _start(self, route):
+        self._running += 1
+        self._active[route] += 1
+
+    def _take_token(self, client, now):
+        """Seconds until the client has a token again; 0 if one was taken"""
+        tokens, last = self._buckets.get(client, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - last) * self.rate)
+        if tokens < 1:
+            self._buckets[client] = (tokens, now)
+            return (1 - tokens) / self.rate
+        if len(self._buckets) >= MAX_CLIENTS and client not in self._buckets:
+            self._buckets = {c: (t, l) for c, (t, l) in self._buckets.items()
+                             if t + (now - l) * self.rate < self.burst}
+        self._buckets[client] = (tokens - 1, now)
+        return 0
+
+    def acquire(self, route, client):
+        """Block until the request may run; returns seconds waited or raises Shed"""
+        start = time.monotonic()
+        with self._lock:
+            stats = self._stats[route]
+            if self.rate > 0 and route in self.route_limits:
+                retry_after = self._take_token(client, start)
+                if retry_after:
+                    stats.rate_limited += 1
+                    raise Shed(429, "Rate limit exceeded", retry_after)
+            if self._can_run(route):
+                self._start(route)
+                stats.admitted += 1
+                stats.waits_ms.append(0.0)
+                return 0.0
+            if len(self._queue) >= self.max_queue:
+                stats.queue_full += 1
+                raise Shed(503, "Server busy, try again shortly", RETRY_AFTER_SECONDS)
+            waiter = _Waiter(route)
+            entry = (self.route_costs.get(route, 0), next(self._seq), waiter)
+            heapq.heappush(self._queue, entry)
+            stats.queued += 1
+            self._max_depth = max(self._max_depth, len(self._queue))
+
+        waiter.event.wait(self.max_wait)
+        with self._lock:
+            waited = time.monotonic() - start
+            if not waiter.granted:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                stats.timed_out += 1
+                raise Shed(503, "Server busy, try again shortly", RETRY_AFTER_SECONDS)
+            stats.admitted += 1
+            stats.waits_ms.append(waited * 1000)
+            return waited
+
+    def release(self, route):
+        """Free the request's slot and hand it to the cheapest waiter that can run"""
+        with self._lock:
+            self._running -= 1
+            self._active[route] -= 1
+            if not self._queue:
+                return
+            waiting = []
+            for entry in sorted(self._queue):
+                waiter = entry[2]
+                if self._can_run(waiter.route):
+                    self._start(waiter.route)
+                    waiter.granted = True
+                    waiter.event.set()
+                else:
+                    waiting.append(entry)
+            self._queue = waiting  # sorted, so still a valid heap
+
+    def metrics(self):
+        """Running/queued requests plus per-route admission and shed counts and wait times"""
+        with self._lock:
+            depth = defaultdict(int)
+            for _, _, waiter in self._queue:
+                depth[waiter.route] += 1
+            routes = {}
+            for route, stats in sorted(self._stats.items()):
+                waits = sorted(stats.waits_ms)
+                routes[route] = {
+                    "running": self._active[route],
+                    "queued_now": depth[route],
+                    "limit": self.route_limits.get(route),
+                    "cost": self.route_costs.get(route, 0),
+                    "admitted": stats.admitted,
+                    "queued": stats.queued,
+                    "shed": {"rate_limited": stats.rate_limited, "queue_full": stats.queue_full,
+                             "timed_out": stats.timed_out},
+                    "wait_ms": {
+                        "p50": round(waits[len(waits) // 2], 3) if waits else None,
+                        "p95": round(waits[int(len(waits) * 0.95)], 3) if waits else None,
+                        "max": round(waits[-1], 3) if waits else None
+                    }
+                }
+            return {
+                "capacity": self.capacity,
+                "running": self._running,
+                "queue_depth": len(self._queue),
+                "max_queue_depth": self._max_depth,
+                "max_queue": self.max_queue,
+                "max_wait_seconds": self.max_wait,
+                "rate_limit": {"rate": self.rate, "burst": self.burst},
+                "routes": routes
+            }
@@ -3,13 +3,38 @@
 Flask REST API for Video Games Success Prediction
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify
 from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
 import joblib
 import json
 import numpy as np
 import pandas as pd
+import functools
+import hmac
 import os
+import threading
+import time
+
+from admission import AdmissionController, Shed, parse_route_limits
+from compact_forest import load_forest
+from compact_frame import memory_report
+from facets import FacetIndex
+from forest_explainer import ForestExplainer
+from game_store import GameStore, SegmentAssigner, build_snapshot, with_rows
+from lazy_import import import_report
+from prediction_audit import DriftStats, PredictionAudit
+from prediction_stream import HEARTBEAT_SECONDS, StreamHub
+from preprocess import NUMERIC_COLUMNS
+from publisher_leaderboard import PublisherLeaderboard
+from request_profiler import RequestProfiler, parse_route_rates
+from result_cache import ResultCache, query_etag
+from rule_mining import SUCCESS_TARGETS, RuleIndex, RuleMiner, format_items, game_items
+from similar_games import MAX_NEIGHBOURS, SimilarGames
+from single_flight import SingleFlight
+from state_dir import default_state_dir
+from warm_cache import WarmCache, inputs_key, source_files
+from year_cube import AGGREGATE_FIELDS, MomentCube, YearCube
 
 app = Flask(__name__)
 CORS(app, resources={r"/api/*": {"origins": "*"}})
@@ -18,15 +43,70 @@ CORS(app, resources={r"/api/*": {"origins": "*"}})
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 MODELS_DIR = os.path.join(BASE_DIR, 'models')
 DATASET_DIR = os.path.join(BASE_DIR, 'dataset')
+SEGMENT_MODELS_DIR = os.path.join(BASE_DIR, 'backend', 'app', 'models')
+
+# Ingested games are journaled here and replayed by every worker
+INGEST_JOURNAL = os.environ.get('DSS_INGEST_JOURNAL', os.path.join(DATASET_DIR, 'ingested_games.ndjson'))
+
+# Set to a local directory to also coalesce identical requests across gunicorn workers
+SINGLE_FLIGHT_DIR = os.environ.get('DSS_SINGLE_FLIGHT_DIR')
+
+# Request profiling: fraction of requests profiled (all routes / per route) and where profiles go
+PROFILE_RATE = float(os.environ.get('DSS_PROFILE', 0) or 0)
+PROFILE_ROUTES = parse_route_rates(os.environ.get('DSS_PROFILE_ROUTES'))
+PROFILE_DIR = os.environ.get('DSS_PROFILE_DIR', default_state_dir('profiles'))
+
+# Admission control per worker process: concurrent requests, queued requests and
+# seconds a queued request waits before a 503; per-route limits for expensive routes,
+# which are also rate limited per client (requests/s, burst; rate 0 disables).
+# One Prediction Tool action calls four limited routes, so the default allows
+# ten actions at once and five per second
+ADMIT_CONCURRENCY = int(os.environ.get('DSS_ADMIT_CONCURRENCY', 8))
+ADMIT_QUEUE = int(os.environ.get('DSS_ADMIT_QUEUE', 32))
+ADMIT_WAIT = float(os.environ.get('DSS_ADMIT_WAIT', 10))
+ROUTE_LIMITS = parse_route_limits(os.environ.get(
+    'DSS_ROUTE_LIMITS',
+    '/api/predict=2,/api/predict/batch=1,/api/predict/surface=1,/api/predict/matrix=1,/api/games/similar=2'))
+RATE_LIMIT = float(os.environ.get('DSS_RATE_LIMIT', 20))
+RATE_BURST = int(os.environ.get('DSS_RATE_BURST', 40))
+
+# Reverse proxies in front of the API that append to X-Forwarded-For (the
+# Next.js rewrite, a load balancer); only hops they added are trusted for the
+# client address
+PROXY_HOPS = int(os.environ.get('DSS_PROXY_HOPS', 0))
+
+# Memory budget (MB) of serialized /api/games and /api/games/facets responses
+RESULT_CACHE_MB = float(os.environ.get('DSS_RESULT_CACHE_MB', 32))
+
+# Served predictions are logged here (one rotating NDJSON file per worker, MB
+# before rotation, rotated files kept); set to empty to disable
+AUDIT_DIR = os.environ.get('DSS_AUDIT_DIR', default_state_dir('audit'))
+AUDIT_MAX_MB = float(os.environ.get('DSS_AUDIT_MAX_MB', 16))
+AUDIT_BACKUPS = int(os.environ.get('DSS_AUDIT_BACKUPS', 5))
+
+# Live prediction streams per worker (each holds a server thread), and where
+# workers bind the sockets that relay stream updates to each other
+STREAM_MAX = int(os.environ.get('DSS_STREAM_MAX', 4))
+STREAM_DIR = os.environ.get('DSS_STREAM_DIR', default_state_dir('streams'))
+
+# Sent as X-Admin-Token to use the /api/debug endpoints; unset disables them
+ADMIN_TOKEN = os.environ.get('DSS_ADMIN_TOKEN')
+
+# Computed state (indexes, cubes, default payloads) is snapshotted here, keyed by
+# a hash of the dataset, model and backend files; set to empty to disable
+WARM_CACHE_DIR = os.environ.get('DSS_WARM_CACHE', default_state_dir('warm-cache'))
 
 # Load models and data
 print("Loading models...")
-rf_model = joblib.load(os.path.join(MODELS_DIR, 'rf_model.joblib'))
+# Compact quantized export when DSS_COMPACT_FOREST=1, else the sklearn model
+rf_model = load_forest(MODELS_DIR)
 le_platform = joblib.load(os.path.join(MODELS_DIR, 'le_platform.joblib'))
 le_genre = joblib.load(os.path.join(MODELS_DIR, 'le_genre.joblib'))
 le_publisher = joblib.load(os.path.join(MODELS_DIR, 'le_publisher.joblib'))
 scaler = joblib.load(os.path.join(MODELS_DIR, 'scaler.joblib'))
 kmeans = joblib.load(os.path.join(MODELS_DIR, 'kmeans.joblib'))
+segment_scaler = joblib.load(os.path.join(SEGMENT_MODELS_DIR, 'scaler_cluster.pkl'))
+segment_kmeans = joblib.load(os.path.join(SEGMENT_MODELS_DIR, 'model_kmeans.pkl'))
 
 # Load JSON data
 with open(os.path.join(MODELS_DIR, 'metadata.json'), 'r') as f:
@@ -41,11 +121,397 @@ with open(os.path.join(MODELS_DIR, 'top_games.json'), 'r') as f:
 with open(os.path.join(MODELS_DIR, 'cluster_data.json'), 'r') as f:
     cluster_data = json.load(f)
 
-# Load CSV data
-df_clean = pd.read_csv(os.path.join(DATASET_DIR, 'clean_data_video_games.csv'))
-df_cluster = pd.read_csv(os.path.join(DATASET_DIR, 'data_with_cluster.csv'))
+RULE_CSVS = {
+    "success_factors": os.path.join(DATASET_DIR, 'rules_success_factors.csv'),
+    "dss": os.path.join(DATASET_DIR, 'dss_association_rules.csv')
+}
+
+# Identifies the base data and code; with the row count it tags every data version
+INPUTS_KEY = inputs_key([
+    os.path.join(DATASET_DIR, 'data_with_cluster.csv'), *RULE_CSVS.values(),
+    *sorted(os.path.join(MODELS_DIR, f) for f in os.listdir(MODELS_DIR)),
+    *sorted(os.path.join(SEGMENT_MODELS_DIR, f) for f in os.listdir(SEGMENT_MODELS_DIR)),
+    *source_files(os.path.dirname(os.path.abspath(__file__)))
+])
+warm_cache = WarmCache(WARM_CACHE_DIR, INPUTS_KEY) if WARM_CACHE_DIR else None
+warm_state = warm_cache.load() if warm_cache else None
+
+if warm_state:
+    base_snapshot, rule_index = warm_state["snapshot"], warm_state["rule_index"]
+else:
+    # Load CSV data (clean games plus their market-segment cluster) into the one
+    # compact table every snapshot and derived view shares
+    base_snapshot = build_snapshot(pd.read_csv(os.path.join(DATASET_DIR, 'data_with_cluster.csv')))
+    # Exported association rules, indexed by antecedent item for per-input matching
+    rule_index = RuleIndex.from_csvs(RULE_CSVS)
+
+game_store = GameStore(
+    base_snapshot.df,
+    SegmentAssigner.from_frame(segment_scaler, segment_kmeans, base_snapshot.df),
+    journal_path=INGEST_JOURNAL or None,
+    snapshot=base_snapshot
+)
+
+print("✅ All models and data loaded successfully!" + (" (warm cache)" if warm_state else ""))
+
+
+# Upper bound on grid steps per axis for /api/predict/surface
+MAX_SURFACE_STEPS = 101
+
+# Upper bound on games per /api/predict/batch request
+MAX_BATCH_SIZE = 10000
+
+# Dimensions /api/predict/matrix can vary -> their feature column
+MATRIX_DIMENSIONS = {'platform': 0, 'genre': 1, 'publisher': 2, 'year': 5}
+
+# Classes whose summed probability ranks /api/predict/matrix cells by default, and cells ranked
+MATRIX_RANK_BY = ['Blockbuster', 'Hit']
+MATRIX_TOP = 20
+
+# Matched association rules returned per prediction
+MAX_MATCHED_RULES = 5
+
+# Model features reported by ?explain=1 as the submitted input field
+EXPLAIN_INPUTS = {
+    'Platform_Encoded': 'platform',
+    'Genre_Encoded': 'genre',
+    'Publisher_Encoded': 'publisher'
+}
+
+# Tree-path attribution tables; the compact model keeps no internal node
+# values, so in that mode they are built from the joblib model on first use
+explainer = ForestExplainer(rf_model) if hasattr(rf_model, 'estimators_') else None
+explainer_lock = threading.Lock()
+
+# Label -> code lookups, so encoding skips LabelEncoder.transform per value
+category_codes = {
+    name: {label: code for code, label in enumerate(encoder.classes_)}
+    for name, encoder in (('platform', le_platform), ('genre', le_genre), ('publisher', le_publisher))
+}
+
+# Prediction log and drift statistics against the base (training) dataset
+prediction_audit = PredictionAudit(
+    AUDIT_DIR,
+    DriftStats(game_store.base.df, category_codes, rf_model.classes_),
+    max_bytes=int(AUDIT_MAX_MB * 1024 * 1024),
+    backups=AUDIT_BACKUPS
+) if AUDIT_DIR else None
+
+
+# Open /api/predict/stream sessions of this worker
+prediction_streams = StreamHub(STREAM_DIR, max_sessions=STREAM_MAX)
+
+
+# ==================== HELPERS ====================
+
+def encode_context(platform, genre, publisher):
+    """Encode the categorical part of a prediction input (0 for labels unseen in training)"""
+    return (category_codes['platform'].get(platform, 0),
+            category_codes['genre'].get(genre, 0),
+            category_codes['publisher'].get(publisher, 0))
+
 
-print("✅ All models and data loaded successfully!")
+def normalize_year(year):
+    """Normalize year to training range (2013-2016)"""
+    # Map future years to the training range to maintain model compatibility
+    if year >= 2025:
+        # Map 2025-2030 to 2014-2016 (recent years in training data)
+        return 2014 + min((year - 2025) // 2, 2)
+    return year
+
+
+def prediction_input(data):
+    """Prediction input fields with their defaults"""
+    game = {
+        "platform": data.get('platform'),
+        "genre": data.get('genre'),
+        "publisher": data.get('publisher'),
+        "critic_score": float(data.get('critic_score', 75)),
+        "user_score": float(data.get('user_score', 7.0)),
+        "year": int(data.get('year', 2026))
+    }
+    # float() accepts "nan" and "inf", which the model and rule matching cannot use
+    for field in ('critic_score', 'user_score'):
+        if not np.isfinite(game[field]):
+            raise ValueError(f"{field} must be a finite number (got {game[field]})")
+    return game
+
+
+def feature_row(game):
+    """Model feature vector for one prediction input"""
+    return [*encode_context(game['platform'], game['genre'], game['publisher']),
+            game['critic_score'], game['user_score'], normalize_year(game['year'])]
+
+
+def stream_update(data):
+    """Scores and year of a live prediction update, validated like /api/predict input"""
+    game = prediction_input(data)
+    return {"seq": int(data.get('seq', 0)), "critic_score": game['critic_score'],
+            "user_score": game['user_score'], "year": game['year']}
+
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def matrix_values(dimension, values):
+    """Values swept along one /api/predict/matrix dimension and their feature codes"""
+    if dimension == 'year':
+        if not isinstance(values, list) or not values:
+            raise ValueError("year must be a non-empty list of years")
+        years = [int(v) for v in values]
+        return years, [normalize_year(y) for y in years]
+    codes = category_codes[dimension]
+    if values == 'all':
+        values = list(codes)
+    if not isinstance(values, list) or not values:
+        raise ValueError(f'{dimension} must be a non-empty list of values or "all"')
+    unknown = [str(v) for v in values if v not in codes]
+    if unknown:
+        raise ValueError(f"Unknown {dimension}: {', '.join(unknown[:5])}")
+    return values, [codes[v] for v in values]
+
+
+def matched_rules(game):
+    """Exported association rules whose antecedents all hold for the input"""
+    return rule_index.match(game_items(game['platform'], game['genre'], game['critic_score']),
+                            limit=MAX_MATCHED_RULES)
+
+
+def explain_requested():
+    return request.args.get('explain', '').lower() in ('1', 'true', 'yes')
+
+
+def get_explainer():
+    global explainer
+    if explainer is None:
+        with explainer_lock:
+            if explainer is None:
+                explainer = ForestExplainer(joblib.load(os.path.join(MODELS_DIR, 'rf_model.joblib')),
+                                            n_trees=rf_model.n_estimators)
+    return explainer
+
+
+def explain_predictions(features, games, predictions):
+    """Per-feature contributions to each game's predicted class probability"""
+    explanations = get_explainer().explain(features, predictions)
+    for explanation, game in zip(explanations, games):
+        for item in explanation['contributions']:
+            if item['feature'] in EXPLAIN_INPUTS:
+                item['value'] = game[EXPLAIN_INPUTS[item['feature']]]
+    return explanations
+
+
+def dump_response(result):
+    body, status, mimetype = result
+    return json.dumps([status, mimetype]).encode() + b'\n' + body
+
+
+def load_response(data):
+    header, body = data.split(b'\n', 1)
+    status, mimetype = json.loads(header)
+    return body, status, mimetype
+
+
+single_flight = SingleFlight(SINGLE_FLIGHT_DIR, dump=dump_response, load=load_response)
+request_profiler = RequestProfiler(PROFILE_DIR, sample_rate=PROFILE_RATE, route_rates=PROFILE_ROUTES)
+result_cache = ResultCache(int(RESULT_CACHE_MB * 1024 * 1024))
+
+# Queue order when over capacity: cheap reads (cost 0) first, then by inference cost
+ROUTE_COSTS = {
+    '/api/predict': 1,
+    '/api/games/similar': 1,
+    '/api/predict/batch': 2,
+    '/api/predict/surface': 2,
+    '/api/predict/matrix': 2
+}
+admission = AdmissionController(ADMIT_CONCURRENCY, ADMIT_QUEUE, ADMIT_WAIT, route_limits=ROUTE_LIMITS,
+                                route_costs=ROUTE_COSTS, rate=RATE_LIMIT, burst=RATE_BURST)
+
+
+def coalesced(view):
+    """Concurrent identical requests (same route, query and data version) share one computation"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        query = tuple(sorted((k, v) for k, v in request.args.items(multi=True) if v != ''))
+        key = (request.path, query, game_store.current().version)
+
+        def compute():
+            response = app.make_response(view(*args, **kwargs))
+            return response.get_data(), response.status_code, response.mimetype
+
+        if query:
+            body, status, mimetype = single_flight.do(key, compute)
+        else:
+            # Unfiltered payloads are kept per data version (and in the warm cache)
+            body, status, mimetype = game_store.current().memo(
+                ('payload', request.path), lambda: single_flight.do(key, compute))
+        return app.response_class(body, status=status, mimetype=mimetype)
+    return wrapper
+
+
+def games_filters(args):
+    """The /api/games filters, normalized: blanks dropped, search lowercased"""
+    filters = {
+        "platform": args.get('platform') or None,
+        "genre": args.get('genre') or None,
+        "publisher": args.get('publisher') or None,
+        "year_min": args.get('year_min', type=int),
+        "year_max": args.get('year_max', type=int),
+        "search": (args.get('search') or '').lower() or None
+    }
+    return {k: v for k, v in filters.items() if v is not None}
+
+
+def games_query(args):
+    """Normalized /api/games parameters, with paging and sort defaults filled in"""
+    return {
+        **games_filters(args),
+        "limit": args.get('limit', 100, type=int),
+        "offset": args.get('offset', 0, type=int),
+        "sort_by": args.get('sort_by', 'Global_Sales'),
+        "sort_order": 'asc' if args.get('sort_order') == 'asc' else 'desc'
+    }
+
+
+def result_cached(normalize):
+    """Serve repeated queries from the result cache, or 304 if the client's ETag matches.
+
+    The key is the route, the normalized query and the data version (base data
+    key plus row count, which agrees across workers replaying the same journal).
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            key = (request.path, tuple(sorted(normalize(request.args).items())),
+                   INPUTS_KEY, len(game_store.current()))
+            etag = query_etag(key)
+            if request.if_none_match.contains(etag):
+                result_cache.count_not_modified()
+                response = app.response_class(status=304)
+            else:
+                cached = result_cache.get(key)
+                if cached is None:
+                    response = app.make_response(view(*args, **kwargs))
+                    cached = response.get_data(), response.status_code, response.mimetype
+                    if response.status_code != 200:
+                        return response
+                    result_cache.put(key, cached)
+                body, status, mimetype = cached
+                response = app.response_class(body, status=status, mimetype=mimetype)
+            response.set_etag(etag)
+            # Browsers keep the body but revalidate, so a new data version is never missed
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
+
+
+def similar_games():
+    """Nearest-neighbour index of the current game table"""
+    snapshot = game_store.current()
+    return snapshot.memo('similar_games', lambda: SimilarGames(snapshot.df, scaler))
+
+
+def find_similar(queries, k, filters):
+    """Neighbours for a list of queries, each a game id or a hypothetical spec"""
+    if not 1 <= k <= MAX_NEIGHBOURS:
+        raise ValueError(f"k must be between 1 and {MAX_NEIGHBOURS}")
+    index = similar_games()
+    features = np.empty((len(queries), index.features.shape[1]))
+    exclude = [None] * len(queries)
+    ids = [i for i, q in enumerate(queries) if q.get('id') is not None]
+    specs = [i for i, q in enumerate(queries) if q.get('id') is None]
+    for i in ids:
+        row = int(queries[i]['id'])
+        if not 0 <= row < len(index):
+            raise ValueError(f"Unknown game id: {row}")
+        features[i] = index.features[row]
+        exclude[i] = row
+    if specs:
+        features[specs] = index.encode_specs([queries[i] for i in specs])
+
+    allowed = index.allowed_rows(**filters)
+    return [
+        {
+            "query": index.records([exclude[i]], [0.0])[0] if exclude[i] is not None else queries[i],
+            "similar": index.records(rows, distances)
+        }
+        for i, (rows, distances) in enumerate(index.query(features, k, allowed, exclude))
+    ]
+
+
+def warm_up():
+    """Fill the per-version memos and unfiltered payloads, then snapshot them"""
+    client = app.test_client()
+    for route in WARM_ROUTES:
+        client.get(route)
+    try:
+        warm_cache.save({"snapshot": game_store.base, "rule_index": rule_index})
+    except OSError as e:
+        print(f"⚠️ Warm cache not saved: {e}")
+
+
+# Build the KD-tree before the first request
+similar_games()
+
+
+# ==================== ADMISSION CONTROL ====================
+
+if PROXY_HOPS:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=PROXY_HOPS)
+
+
+def client_id():
+    """Client address; behind DSS_PROXY_HOPS proxies, the one the outermost trusted proxy saw"""
+    return request.remote_addr or 'unknown'
+
+
+@app.before_request
+def admit_request():
+    """Wait for a slot, or shed the request with 429/503 and Retry-After"""
+    if (request.method == 'OPTIONS' or request.url_rule is None or
+            request.path == '/api/health' or request.path.startswith('/api/debug/')):
+        return
+    route = request.url_rule.rule
+    try:
+        admission.acquire(route, client_id())
+    except Shed as e:
+        return jsonify({"success": False, "error": str(e)}), e.status, {"Retry-After": str(e.retry_after)}
+    g.admitted_route = route
+
+
+@app.teardown_request
+def release_request(exc):
+    route = g.pop('admitted_route', None)
+    if route:
+        admission.release(route)
+
+
+# ==================== REQUEST PROFILING ====================
+
+@app.before_request
+def start_request_profile():
+    """Profile a sampled fraction of requests when profiling is switched on"""
+    if not request_profiler.active() or request.path.startswith('/api/debug/'):
+        return
+    route = request.url_rule.rule if request.url_rule else request.path
+    if request_profiler.should_sample(route):
+        profile = request_profiler.start()
+        if profile:
+            g.request_profile = (route, profile, time.perf_counter())
+
+
+@app.teardown_request
+def finish_request_profile(exc):
+    sample = g.pop('request_profile', None)
+    if sample:
+        request_profiler.finish(*sample)
+
+
+def admin_authorized():
+    token = request.headers.get('X-Admin-Token', '')
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode())
 
 
 # ==================== API ROUTES ====================
@@ -53,10 +519,18 @@ print("✅ All models and data loaded successfully!")
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
+    health = {
         "status": "healthy",
-        "message": "DSS Video Games API is running"
-    })
+        "message": "DSS Video Games API is running",
+        "data_version": game_store.version
+    }
+    # Per-module import times, recorded when started through fast_start.py
+    import_ms = import_report()
+    if import_ms:
+        health["import_ms"] = import_ms
+    health["result_cache"] = result_cache.stats()
+    health["prediction_streams"] = prediction_streams.metrics()
+    return jsonify(health)
 
 
 @app.route('/api/metadata', methods=['GET'])
@@ -79,40 +553,24 @@ def get_top_games():
 
 
 @app.route('/api/games', methods=['GET'])
+@result_cached(games_query)
+@coalesced
 def get_games():
     """Get games with filters"""
     # Get query parameters
-    platform = request.args.get('platform')
-    genre = request.args.get('genre')
-    publisher = request.args.get('publisher')
-    year_min = request.args.get('year_min', type=int)
-    year_max = request.args.get('year_max', type=int)
-    search = request.args.get('search')
-    limit = request.args.get('limit', 100, type=int)
-    offset = request.args.get('offset', 0, type=int)
-    sort_by = request.args.get('sort_by', 'Global_Sales')
-    sort_order = request.args.get('sort_order', 'desc')
-    
-    # Filter dataframe
-    filtered_df = df_clean.copy()
+    query = games_query(request.args)
+    limit, offset, sort_by = query['limit'], query['offset'], query['sort_by']
     
-    if platform:
-        filtered_df = filtered_df[filtered_df['Platform'] == platform]
-    if genre:
-        filtered_df = filtered_df[filtered_df['Genre'] == genre]
-    if publisher:
-        filtered_df = filtered_df[filtered_df['Publisher'] == publisher]
-    if year_min:
-        filtered_df = filtered_df[filtered_df['Year_of_Release'] >= year_min]
-    if year_max:
-        filtered_df = filtered_df[filtered_df['Year_of_Release'] <= year_max]
-    if search:
-        filtered_df = filtered_df[filtered_df['Name'].str.contains(search, case=False, na=False)]
+    # Filter through the value and name indexes
+    snapshot = game_store.current()
+    rows = snapshot.filter_rows(**games_filters(request.args))
+    filtered_df = snapshot.games if rows is None else snapshot.games.iloc[rows]
     
     # Sort
-    ascending = sort_order == 'asc'
+    ascending = query['sort_order'] == 'asc'
     if sort_by in filtered_df.columns:
-        filtered_df = filtered_df.sort_values(sort_by, ascending=ascending)
+        # Stable, so ties keep dataset order whatever the column's dtype
+        filtered_df = filtered_df.sort_values(sort_by, ascending=ascending, kind='mergesort')
     
     # Get total count before pagination
     total_count = len(filtered_df)
@@ -120,8 +578,8 @@ def get_games():
     # Paginate
     filtered_df = filtered_df.iloc[offset:offset + limit]
     
-    # Convert to records
-    games = filtered_df.to_dict('records')
+    # Convert to records, keeping the row id used by /api/games/similar
+    games = filtered_df.rename_axis('id').reset_index().to_dict('records')
     
     return jsonify({
         "games": games,
@@ -131,6 +589,61 @@ def get_games():
     })
 
 
+@app.route('/api/games/facets', methods=['GET'])
+@result_cached(games_filters)
+@coalesced
+def get_game_facets():
+    """Game counts per Platform/Genre/Publisher/year value under the /api/games filters"""
+    snapshot = game_store.current()
+    index = snapshot.memo('facet_index', lambda: FacetIndex(snapshot.df), extend=with_rows)
+    filters = games_filters(request.args)
+    search = filters.pop('search', None)
+    rows = index.rows_bitmap(snapshot.search_rows(search)) if search else None
+    return jsonify(index.counts(**filters, rows=rows))
+
+
+@app.route('/api/games/similar', methods=['GET', 'POST'])
+def get_similar_games():
+    """Nearest games to existing games (by id) or hypothetical specs"""
+    try:
+        if request.method == 'GET':
+            queries = [{"id": request.args.get('id', type=int)}]
+            if queries[0]['id'] is None:
+                raise ValueError("id is required; POST a spec for hypothetical games")
+            k = request.args.get('k', 10, type=int)
+            filters = {
+                "platform": request.args.get('platform'),
+                "genre": request.args.get('genre'),
+                "year_min": request.args.get('year_min', type=int),
+                "year_max": request.args.get('year_max', type=int)
+            }
+        else:
+            data = request.json or {}
+            queries = data.get('queries') or [data.get('query', data)]
+            k = int(data.get('k', 10))
+            filters = {key: data.get('filters', {}).get(key)
+                       for key in ('platform', 'genre', 'year_min', 'year_max')}
+        
+        return jsonify({"success": True, "k": k, "results": find_similar(queries, k, filters)})
+    
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+
+@app.route('/api/games/ingest', methods=['POST'])
+def ingest_games():
+    """Append new game records to the live dataset"""
+    data = request.json
+    records = data.get('games') if isinstance(data, dict) else data
+    
+    try:
+        result = game_store.ingest(records)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    
+    return jsonify({"success": True, **result})
+
+
 @app.route('/api/predict', methods=['POST'])
 def predict():
     """Predict game success"""
@@ -138,40 +651,10 @@ def predict():
     
     try:
         # Get input values
-        platform = data.get('platform')
-        genre = data.get('genre')
-        publisher = data.get('publisher')
-        critic_score = float(data.get('critic_score', 75))
-        user_score = float(data.get('user_score', 7.0))
-        year = int(data.get('year', 2026))
-        
-        # Normalize year to training range (2013-2016)
-        # Map future years to the training range to maintain model compatibility
-        if year >= 2025:
-            # Map 2025-2030 to 2014-2016 (recent years in training data)
-            normalized_year = 2014 + min((year - 2025) // 2, 2)
-        else:
-            normalized_year = year
-        
-        # Encode categorical variables
-        try:
-            platform_enc = le_platform.transform([platform])[0]
-        except:
-            platform_enc = 0
-        
-        try:
-            genre_enc = le_genre.transform([genre])[0]
-        except:
-            genre_enc = 0
-        
-        try:
-            publisher_enc = le_publisher.transform([publisher])[0]
-        except:
-            publisher_enc = 0
+        game = prediction_input(data)
         
         # Create feature array
-        features = np.array([[platform_enc, genre_enc, publisher_enc, 
-                            critic_score, user_score, normalized_year]])
+        features = np.array([feature_row(game)])
         
         # Predict
         prediction = rf_model.predict(features)[0]
@@ -179,20 +662,130 @@ def predict():
         prob_dict = {cls: float(prob) for cls, prob in zip(rf_model.classes_, probabilities)}
         
         # Generate recommendations
-        recommendations = generate_recommendations(prediction, critic_score, user_score, genre, platform)
+        recommendations = generate_recommendations(prediction, game['critic_score'], game['user_score'],
+                                                   game['genre'], game['platform'])
         
-        return jsonify({
+        result = {
             "success": True,
             "prediction": prediction,
             "probabilities": prob_dict,
             "confidence": float(max(probabilities)),
             "recommendations": recommendations,
+            "matched_rules": matched_rules(game),
+            "input": game
+        }
+        if explain_requested():
+            result["explanation"] = explain_predictions(features, [game], [prediction])[0]
+        if prediction_audit:
+            prediction_audit.record('/api/predict', [game], features, [prediction], [probabilities])
+        return jsonify(result)
+    
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+
+
+@app.route('/api/predict/batch', methods=['POST'])
+def predict_batch():
+    """Predict success for many games in one forest pass"""
+    data = request.json
+    records = data.get('games') if isinstance(data, dict) else data
+    
+    try:
+        if not isinstance(records, list) or not records:
+            raise ValueError("Expected a non-empty list of games")
+        if len(records) > MAX_BATCH_SIZE:
+            raise ValueError(f"At most {MAX_BATCH_SIZE} games per batch")
+        
+        games = []
+        for i, record in enumerate(records):
+            try:
+                games.append(prediction_input(record))
+            except (AttributeError, TypeError, ValueError) as e:
+                raise ValueError(f"Game {i}: {e}")
+        
+        features = np.array([feature_row(game) for game in games], dtype=float)
+        probabilities = rf_model.predict_proba(features)
+        predictions = rf_model.classes_[probabilities.argmax(axis=1)].tolist()
+        
+        results = [
+            {
+                "prediction": prediction,
+                "probabilities": dict(zip(rf_model.classes_, probs.tolist())),
+                "confidence": float(probs.max()),
+                "matched_rules": matched_rules(game),
+                "input": game
+            }
+            for game, prediction, probs in zip(games, predictions, probabilities)
+        ]
+        if explain_requested():
+            for result, explanation in zip(results, explain_predictions(features, games, predictions)):
+                result["explanation"] = explanation
+        if prediction_audit:
+            prediction_audit.record('/api/predict/batch', games, features, predictions, probabilities)
+        
+        return jsonify({
+            "success": True,
+            "count": len(games),
+            "results": results
+        })
+    
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+
+
+@app.route('/api/predict/surface', methods=['POST'])
+def predict_surface():
+    """Predict success over a critic_score x user_score grid for one game context"""
+    data = request.json or {}
+    
+    try:
+        platform = data.get('platform')
+        genre = data.get('genre')
+        publisher = data.get('publisher')
+        year = int(data.get('year', 2026))
+        resolution = int(data.get('resolution', 21))
+        critic_steps = int(data.get('critic_steps', resolution))
+        user_steps = int(data.get('user_steps', resolution))
+        
+        if not (2 <= critic_steps <= MAX_SURFACE_STEPS and 2 <= user_steps <= MAX_SURFACE_STEPS):
+            raise ValueError(f"Grid steps must be between 2 and {MAX_SURFACE_STEPS}")
+        
+        critic_scores = np.linspace(float(data.get('critic_min', 0)), float(data.get('critic_max', 100)), critic_steps)
+        user_scores = np.linspace(float(data.get('user_min', 0)), float(data.get('user_max', 10)), user_steps)
+        
+        # One row per grid cell: rows follow user_scores, columns follow critic_scores
+        critic_grid, user_grid = np.meshgrid(critic_scores, user_scores)
+        features = np.empty((critic_grid.size, 6))
+        features[:, :3] = encode_context(platform, genre, publisher)
+        features[:, 3] = critic_grid.ravel()
+        features[:, 4] = user_grid.ravel()
+        features[:, 5] = normalize_year(year)
+        
+        # Single batched forest pass over the whole grid
+        probabilities = rf_model.predict_proba(features)
+        grid_shape = (user_steps, critic_steps)
+        predictions = rf_model.classes_[probabilities.argmax(axis=1)].reshape(grid_shape)
+        
+        return jsonify({
+            "success": True,
+            "critic_scores": critic_scores.round(2).tolist(),
+            "user_scores": user_scores.round(2).tolist(),
+            "classes": rf_model.classes_.tolist(),
+            "probabilities": {
+                cls: probabilities[:, i].reshape(grid_shape).round(4).tolist()
+                for i, cls in enumerate(rf_model.classes_)
+            },
+            "predictions": predictions.tolist(),
             "input": {
                 "platform": platform,
                 "genre": genre,
                 "publisher": publisher,
-                "critic_score": critic_score,
-                "user_score": user_score,
                 "year": year
             }
         })
@@ -204,6 +797,151 @@ def predict():
         }), 400
 
 
+@app.route('/api/predict/matrix', methods=['POST'])
+def predict_matrix():
+    """Predict success for every combination of the varied dimensions in one forest pass"""
+    data = request.json or {}
+    
+    try:
+        base = prediction_input(data.get('base') or {})
+        vary = data.get('vary')
+        if not isinstance(vary, dict) or not vary:
+            raise ValueError("vary must map at least one dimension to its values")
+        unknown = [d for d in vary if d not in MATRIX_DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Cannot vary {', '.join(unknown)}; use {', '.join(MATRIX_DIMENSIONS)}")
+        # Grid axes follow MATRIX_DIMENSIONS order, whatever the key order of vary
+        dimensions = [d for d in MATRIX_DIMENSIONS if d in vary]
+        swept = [matrix_values(d, vary[d]) for d in dimensions]
+        shape = tuple(len(values) for values, _ in swept)
+        size = int(np.prod(shape))
+        if size > MAX_BATCH_SIZE:
+            raise ValueError(f"At most {MAX_BATCH_SIZE} combinations per matrix (got {size})")
+        
+        rank_by = data.get('rank_by', MATRIX_RANK_BY)
+        rank_by = [rank_by] if isinstance(rank_by, str) else list(rank_by)
+        class_index = {cls: i for i, cls in enumerate(rf_model.classes_)}
+        if not rank_by or any(c not in class_index for c in rank_by):
+            raise ValueError(f"rank_by must name classes from {', '.join(rf_model.classes_)}")
+        top = int(data.get('top', MATRIX_TOP))
+        
+        # Cartesian feature matrix: the base row repeated, varied columns taken from the grid
+        grid = np.indices(shape).reshape(len(shape), size)
+        features = np.tile(np.array(feature_row(base), dtype=float), (size, 1))
+        for axis, (dimension, (_, codes)) in enumerate(zip(dimensions, swept)):
+            features[:, MATRIX_DIMENSIONS[dimension]] = np.asarray(codes, dtype=float)[grid[axis]]
+        
+        # Single batched forest pass over every combination
+        probabilities = rf_model.predict_proba(features)
+        predictions = rf_model.classes_[probabilities.argmax(axis=1)]
+        scores = probabilities[:, [class_index[c] for c in rank_by]].sum(axis=1)
+        order = np.argsort(-scores, kind='stable')[:top if top > 0 else None]
+        
+        ranking = [
+            {
+                **{d: swept[axis][0][grid[axis, i]] for axis, d in enumerate(dimensions)},
+                "score": round(float(scores[i]), 4),
+                "prediction": predictions[i],
+                "probabilities": dict(zip(rf_model.classes_, probabilities[i].round(4).tolist()))
+            }
+            for i in order
+        ]
+        
+        return jsonify({
+            "success": True,
+            "dimensions": dimensions,
+            "values": {d: values for d, (values, _) in zip(dimensions, swept)},
+            "shape": list(shape),
+            "classes": rf_model.classes_.tolist(),
+            "rank_by": rank_by,
+            "probabilities": {
+                cls: probabilities[:, i].reshape(shape).round(4).tolist()
+                for i, cls in enumerate(rf_model.classes_)
+            },
+            "scores": scores.reshape(shape).round(4).tolist(),
+            "predictions": predictions.reshape(shape).tolist(),
+            "ranking": ranking,
+            "base": base
+        })
+    
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+
+
+def stream_prediction(session, update):
+    """Prediction for a stream update, from the session's already encoded context"""
+    game = {**session.labels, "critic_score": update['critic_score'],
+            "user_score": update['user_score'], "year": update['year']}
+    features = np.array([[*session.context, game['critic_score'], game['user_score'], normalize_year(game['year'])]])
+    probabilities = rf_model.predict_proba(features)[0]
+    prediction = rf_model.classes_[probabilities.argmax()]
+    if prediction_audit:
+        prediction_audit.record('/api/predict/stream', [game], features, [prediction], [probabilities])
+    return {
+        "seq": update['seq'],
+        "prediction": str(prediction),
+        "probabilities": {str(cls): float(prob) for cls, prob in zip(rf_model.classes_, probabilities)},
+        "confidence": float(max(probabilities)),
+        "recommendations": generate_recommendations(prediction, game['critic_score'], game['user_score'],
+                                                    game['genre'], game['platform']),
+        "matched_rules": matched_rules(game),
+        "input": game,
+        "superseded": session.superseded
+    }
+
+
+def stream_events(session):
+    """Event stream of a session: its id, then one prediction per evaluated update"""
+    try:
+        yield sse_event('session', {"session_id": session.id, "context": session.labels})
+        while not session.idle():
+            update = session.next_update(HEARTBEAT_SECONDS)
+            if update is None:
+                # Comment line; also how a closed connection is noticed
+                yield ": keep-alive\n\n"
+                continue
+            try:
+                yield sse_event('prediction', stream_prediction(session, update))
+            except Exception as e:
+                yield sse_event('error', {"seq": update['seq'], "error": str(e)})
+        yield sse_event('end', {"reason": "idle"})
+    finally:
+        prediction_streams.close(session)
+
+
+@app.route('/api/predict/stream', methods=['GET'])
+def predict_stream():
+    """Open a live prediction session (server-sent events) for one platform/genre/publisher"""
+    try:
+        update = stream_update(request.args)
+    except (TypeError, ValueError) as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    labels = {name: request.args.get(name) for name in ('platform', 'genre', 'publisher')}
+    session = prediction_streams.open(encode_context(**labels), labels)
+    if session is None:
+        return jsonify({"success": False, "error": "Too many live prediction streams, use /api/predict"}), \
+            503, {"Retry-After": str(HEARTBEAT_SECONDS)}
+    # The first event answers the scores and year the stream was opened with
+    session.push(update)
+    return Response(stream_events(session), mimetype='text/event-stream',
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@app.route('/api/predict/stream/<session_id>', methods=['POST'])
+def push_stream_update(session_id):
+    """Send new scores/year to a live session; an update not yet evaluated is replaced"""
+    try:
+        update = stream_update(request.json or {})
+    except (AttributeError, TypeError, ValueError) as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    if not prediction_streams.push(session_id, update):
+        return jsonify({"success": False, "error": "Unknown or closed stream session"}), 404
+    return jsonify({"success": True, "seq": update['seq']}), 202
+
+
 def generate_recommendations(prediction, critic_score, user_score, genre, platform):
     """Generate recommendations based on prediction"""
     recommendations = []
@@ -256,6 +994,7 @@ def generate_recommendations(prediction, critic_score, user_score, genre, platfo
 
 
 @app.route('/api/cluster-data', methods=['GET'])
+@coalesced
 def get_cluster_data():
     """Get cluster visualization data with proper structure for frontend"""
     # Cluster labels mapping
@@ -266,6 +1005,8 @@ def get_cluster_data():
         3: 'Massive Blockbuster'
     }
     
+    df_cluster = game_store.current().df
+    
     # Calculate cluster distribution
     cluster_counts = df_cluster['Cluster'].value_counts().to_dict()
     cluster_distribution = [
@@ -299,118 +1040,246 @@ def get_cluster_data():
     })
 
 
+def year_cube():
+    """Year prefix-sum cube of the current snapshot, built once per data version"""
+    snapshot = game_store.current()
+    return snapshot.memo('year_cube', lambda: YearCube(snapshot.df), extend=with_rows)
+
+
+def analytics_filters():
+    """platform / genre / year_min / year_max filters of the analytics routes"""
+    return {
+        "platform": request.args.get('platform') or None,
+        "genre": request.args.get('genre') or None,
+        "year_min": request.args.get('year_min', type=int),
+        "year_max": request.args.get('year_max', type=int)
+    }
+
+
 @app.route('/api/analytics/summary', methods=['GET'])
+@coalesced
 def get_analytics_summary():
     """Get analytics summary"""
+    filters = analytics_filters()
+    snapshot = game_store.current()
+    cube = year_cube()
+    totals = cube.totals(**filters)
+    total_games = int(totals['count'])
+    if not total_games:
+        return jsonify({"success": False, "error": "No games match the filters"}), 404
+
+    sales = AGGREGATE_FIELDS.index('Global_Sales')
+    genres, genre_sums = cube.group_sums('Genre', **filters)
+    platforms, platform_sums = cube.group_sums('Platform', **filters)
+    years, _ = cube.group_sums('Year_of_Release', **filters)
+    # Publisher is not a cube dimension; it is summed over the filtered rows only
+    codes, publishers = snapshot.memo('publisher_codes', lambda: pd.factorize(snapshot.df['Publisher'], sort=True))
+    global_sales = snapshot.df['Global_Sales'].to_numpy()
+    rows = snapshot.filter_rows(**filters)
+    if rows is not None:
+        codes, global_sales = codes[rows], global_sales[rows]
+    present = np.flatnonzero(np.bincount(codes, minlength=len(publishers)))
+    publisher_sales = np.bincount(codes, weights=global_sales, minlength=len(publishers))[present]
+    publishers = publishers[present]
     summary = {
-        "total_games": len(df_clean),
-        "total_sales": float(df_clean['Global_Sales'].sum()),
-        "avg_critic_score": float(df_clean['Critic_Score'].mean()),
-        "avg_user_score": float(df_clean['User_Score'].mean()),
-        "unique_platforms": int(df_clean['Platform'].nunique()),
-        "unique_genres": int(df_clean['Genre'].nunique()),
-        "unique_publishers": int(df_clean['Publisher'].nunique()),
+        "total_games": total_games,
+        "total_sales": float(totals['Global_Sales']),
+        "avg_critic_score": float(totals['Critic_Score'] / total_games),
+        "avg_user_score": float(totals['User_Score'] / total_games),
+        "unique_platforms": len(platforms),
+        "unique_genres": len(genres),
+        "unique_publishers": len(publishers),
         "year_range": {
-            "min": int(df_clean['Year_of_Release'].min()),
-            "max": int(df_clean['Year_of_Release'].max())
+            "min": int(min(years)),
+            "max": int(max(years))
         },
-        "top_genre": df_clean.groupby('Genre')['Global_Sales'].sum().idxmax(),
-        "top_platform": df_clean.groupby('Platform')['Global_Sales'].sum().idxmax(),
-        "top_publisher": df_clean.groupby('Publisher')['Global_Sales'].sum().idxmax()
+        "top_genre": genres[int(genre_sums[:, sales].argmax())],
+        "top_platform": platforms[int(platform_sums[:, sales].argmax())],
+        "top_publisher": publishers[int(publisher_sales.argmax())]
     }
     return jsonify(summary)
 
 
+def group_analytics(column):
+    """Sales and score statistics per value of column for the request's filters, from the year cube"""
+    keys, sums = year_cube().group_sums(column, **analytics_filters())
+    fields = {name: i for i, name in enumerate(AGGREGATE_FIELDS)}
+    count = sums[:, fields['count']]
+    sales = sums[:, fields['Global_Sales']]
+    stats = np.column_stack([
+        sales,
+        sales / count,
+        sums[:, fields['Critic_Score']] / count,
+        sums[:, fields['User_Score']] / count
+    ]).round(2).tolist()
+    return [
+        {column: key, "total_sales": total, "avg_sales": avg, "game_count": int(n),
+         "avg_critic": critic, "avg_user": user}
+        for key, n, (total, avg, critic, user) in zip(keys, count.tolist(), stats)
+    ]
+
+
 @app.route('/api/analytics/genre', methods=['GET'])
+@coalesced
 def get_genre_analytics():
     """Get genre-specific analytics"""
-    genre_stats = df_clean.groupby('Genre').agg({
-        'Global_Sales': ['sum', 'mean', 'count'],
-        'Critic_Score': 'mean',
-        'User_Score': 'mean'
-    }).round(2)
-    genre_stats.columns = ['total_sales', 'avg_sales', 'game_count', 'avg_critic', 'avg_user']
-    genre_stats = genre_stats.reset_index().to_dict('records')
+    genre_stats = group_analytics('Genre')
     return jsonify(genre_stats)
 
 
 @app.route('/api/analytics/platform', methods=['GET'])
+@coalesced
 def get_platform_analytics():
     """Get platform-specific analytics"""
-    platform_stats = df_clean.groupby('Platform').agg({
-        'Global_Sales': ['sum', 'mean', 'count'],
-        'Critic_Score': 'mean',
-        'User_Score': 'mean'
-    }).round(2)
-    platform_stats.columns = ['total_sales', 'avg_sales', 'game_count', 'avg_critic', 'avg_user']
-    platform_stats = platform_stats.reset_index().to_dict('records')
+    platform_stats = group_analytics('Platform')
     return jsonify(platform_stats)
 
 
+@app.route('/api/analytics/publishers', methods=['GET'])
+@coalesced
+def get_publisher_analytics():
+    """Get publisher leaderboard with success rates"""
+    top_n = request.args.get('top_n', 10, type=int)
+    min_games = request.args.get('min_games', 1, type=int)
+    sort_by = request.args.get('sort_by', 'total_sales')
+    snapshot = game_store.current()
+    publisher_leaderboard = snapshot.memo(
+        'publisher_leaderboard', lambda: PublisherLeaderboard.from_frame(snapshot.df), extend=with_rows)
+    try:
+        return jsonify(publisher_leaderboard.top(top_n=top_n, min_games=min_games, sort_by=sort_by))
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+
 @app.route('/api/analytics/yearly', methods=['GET'])
+@coalesced
 def get_yearly_analytics():
     """Get yearly analytics"""
-    yearly_stats = df_clean.groupby('Year_of_Release').agg({
-        'Global_Sales': ['sum', 'mean', 'count'],
-        'Critic_Score': 'mean',
-        'User_Score': 'mean'
-    }).round(2)
-    yearly_stats.columns = ['total_sales', 'avg_sales', 'game_count', 'avg_critic', 'avg_user']
-    yearly_stats = yearly_stats.reset_index()
-    yearly_stats['Year_of_Release'] = yearly_stats['Year_of_Release'].astype(int)
-    return jsonify(yearly_stats.to_dict('records'))
+    yearly_stats = group_analytics('Year_of_Release')
+    return jsonify(yearly_stats)
 
 
 @app.route('/api/analytics/correlation', methods=['GET'])
+@coalesced
 def get_correlation():
-    """Get correlation matrix"""
-    numeric_cols = ['NA_Sales', 'EU_Sales', 'JP_Sales', 'Other_Sales', 'Global_Sales', 'Critic_Score', 'User_Score']
-    corr = df_clean[numeric_cols].corr().round(3).to_dict()
-    return jsonify(corr)
+    """Get correlation matrix, merged from the per-group moments of the filtered games"""
+    snapshot = game_store.current()
+    cube = snapshot.memo('moment_cube', lambda: MomentCube(snapshot.df), extend=with_rows)
+    count, corr = cube.correlation(**analytics_filters())
+    if not count:
+        return jsonify({"success": False, "error": "No games match the filters"}), 404
+    corr = np.round(corr, 3)
+    return jsonify({
+        a: {b: float(corr[j, i]) if np.isfinite(corr[j, i]) else None for j, b in enumerate(NUMERIC_COLUMNS)}
+        for i, a in enumerate(NUMERIC_COLUMNS)
+    })
 
 
 @app.route('/api/analytics/rules', methods=['GET'])
+@coalesced
 def get_association_rules():
-    """Get association rules data"""
+    """Mine association rules from the current games with the requested thresholds"""
+    target = request.args.get('target')
+    if target is None:
+        targets = SUCCESS_TARGETS
+    elif target.lower() in ('', 'all', 'any'):
+        targets = None
+    else:
+        targets = [t.strip() for t in target.split(',') if t.strip()]
+    limit = request.args.get('limit', 20, type=int)
+
+    snapshot = game_store.current()
+    miner = snapshot.memo('rule_miner', lambda: RuleMiner.from_frame(snapshot.df))
     try:
-        rules_path = os.path.join(DATASET_DIR, 'rules_success_factors.csv')
-        if os.path.exists(rules_path):
-            rules_df = pd.read_csv(rules_path)
-            # Format rules for frontend - handle Indonesian column names
-            rules_list = []
-            for _, row in rules_df.head(20).iterrows():
-                # Try different possible column names
-                antecedent = str(row.get('Sebab (Antecedents)', 
-                               row.get('antecedents', 
-                               row.get('antecedent', 'N/A'))))
-                consequent = str(row.get('Akibat (Consequents)', 
-                               row.get('consequents', 
-                               row.get('consequent', 'N/A'))))
-                
-                # Clean up the text - remove frozenset formatting if present
-                antecedent = antecedent.replace("frozenset({", "").replace("})", "").replace("'", "")
-                consequent = consequent.replace("frozenset({", "").replace("})", "").replace("'", "")
-                
-                rules_list.append({
-                    "antecedent": antecedent,
-                    "consequent": consequent,
-                    "support": float(row.get('support', 0)),
-                    "confidence": float(row.get('confidence', 0)),
-                    "lift": float(row.get('lift', 0))
-                })
-            return jsonify(rules_list)
-        else:
-            return jsonify([])
-    except Exception as e:
-        print(f"Error loading rules: {e}")
-        return jsonify([])
+        rules = miner.rules(
+            min_support=request.args.get('min_support', 0.01, type=float),
+            min_confidence=request.args.get('min_confidence', 0.0, type=float),
+            min_lift=request.args.get('min_lift', 1.0, type=float),
+            target=targets,
+            max_len=request.args.get('max_len', type=int)
+        )
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    if limit:
+        rules = rules.head(limit)
+    return jsonify([
+        {
+            "antecedent": format_items(antecedents),
+            "consequent": format_items(consequents),
+            "support": float(support),
+            "confidence": float(confidence),
+            "lift": float(lift)
+        }
+        for antecedents, consequents, support, confidence, lift in rules.itertuples(index=False)
+    ])
+
+
+
+@app.route('/api/monitoring/drift', methods=['GET'])
+def monitoring_drift():
+    """Input and predicted-class drift of all workers' predictions against the training data"""
+    if prediction_audit is None:
+        return jsonify({"success": False, "error": "Prediction audit disabled (DSS_AUDIT_DIR)"}), 404
+    return jsonify({"success": True, **prediction_audit.report()})
+
+
+@app.route('/api/debug/admission', methods=['GET'])
+def debug_admission():
+    """Admission queue depth, shed counts and wait times of this worker"""
+    if not admin_authorized():
+        return jsonify({"success": False, "error": "Forbidden"}), 403
+    return jsonify({"success": True, "worker_pid": os.getpid(), **admission.metrics()})
+
+
+@app.route('/api/debug/memory', methods=['GET'])
+def debug_memory():
+    """Bytes held per column of the live game table in this worker"""
+    if not admin_authorized():
+        return jsonify({"success": False, "error": "Forbidden"}), 403
+    snapshot = game_store.current()
+    return jsonify({"success": True, "worker_pid": os.getpid(), "data_version": snapshot.version,
+                    **memory_report(snapshot.df)})
+
+
+@app.route('/api/debug/profile', methods=['GET', 'POST'])
+def debug_profile():
+    """Hotspot summary of profiled requests (GET) or change the sampling rates (POST)"""
+    if not admin_authorized():
+        return jsonify({"success": False, "error": "Admin token required (DSS_ADMIN_TOKEN)"}), 403
+    try:
+        if request.method == 'POST':
+            data = request.json or {}
+            if data.get('reset'):
+                request_profiler.reset()
+            return jsonify(request_profiler.configure(sample_rate=data.get('sample_rate'),
+                                                      routes=data.get('routes')))
+        return jsonify({
+            "config": request_profiler.config(),
+            "routes": request_profiler.hotspots(
+                route=request.args.get('route'),
+                top_n=request.args.get('top_n', 20, type=int),
+                sort_by=request.args.get('sort_by', 'tottime')
+            )
+        })
+    except (TypeError, ValueError, AttributeError) as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+
+# Routes whose memos and payloads are computed before they are snapshotted
+WARM_ROUTES = ['/api/games', '/api/games/facets', '/api/cluster-data', '/api/analytics/summary',
+               '/api/analytics/genre', '/api/analytics/platform', '/api/analytics/publishers',
+               '/api/analytics/yearly', '/api/analytics/correlation', '/api/analytics/rules']
+
+if warm_cache and not warm_state:
+    threading.Thread(target=warm_up, name='warm-cache', daemon=True).start()
 
 
 if __name__ == '__main__':
     print("\n" + "="*60)
     print("🎮 DSS Video Games API")
     print("="*60)
-    print(f"📊 Loaded {len(df_clean)} games")
+    print(f"📊 Loaded {len(game_store.current())} games")
     print(f"🎯 Model Accuracy: {metadata['model_accuracy']:.1%}")
     print("="*60 + "\n")
     
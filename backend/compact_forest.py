@@ -0,0 +1,245 @@
+"""
+🎮 DSS Video Games - Compact Forest
+Quantized, numpy-only export of the Random Forest classifier: float32
+thresholds, small-integer node indices and 8-bit leaf probabilities in one
+.npz file, with a vectorized predictor that needs no sklearn at load time
+"""
+
+import io
+import json
+import os
+import time
+
+import numpy as np
+
+FORMAT_VERSION = 1
+
+# Opt-in switch read by backend/api.py and app.py
+COMPACT_ENV = 'DSS_COMPACT_FOREST'
+COMPACT_FILE = 'rf_compact.npz'
+
+# Trees kept x bits per leaf probability swept by the comparison report
+SWEEP_TREES = (10, 25, 50, 100)
+SWEEP_BITS = (4, 6, 8)
+
+
+def _float32_floor(values):
+    """Largest float32 <= each value, so float32 x <= t keeps sklearn's float64 comparison exact"""
+    rounded = values.astype(np.float32)
+    return np.where(rounded > values, np.nextafter(rounded, np.float32(-np.inf)), rounded).astype(np.float32)
+
+
+def _index_dtype(n):
+    return np.uint8 if n < 2 ** 8 else np.uint16 if n < 2 ** 16 else np.uint32
+
+
+class CompactForest:
+    """Drop-in for RandomForestClassifier.predict / predict_proba / classes_.
+
+    Nodes of all trees are stored back to back. Leaves point to themselves,
+    so every sample can take the same number of steps (the forest depth).
+    """
+
+    def __init__(self, classes, feature, threshold, left, right, leaf_value, roots, depth,
+                 prob_scale, feature_names=None):
+        self.classes_ = np.asarray(classes)
+        self.feature_names_in_ = None if feature_names is None else np.asarray(feature_names, dtype=object)
+        self.n_estimators = len(roots)
+        self.depth = int(depth)
+        self.prob_scale = int(prob_scale)
+        # Stored compactly with per-tree child indices; widened to global ids here
+        self.roots = roots.astype(np.intp)
+        base = np.repeat(self.roots, np.diff(np.append(self.roots, len(feature))))
+        self.feature = feature.astype(np.intp)
+        self.threshold = threshold.astype(np.float32)
+        self.left = left.astype(np.intp) + base
+        self.right = right.astype(np.intp) + base
+        # children[2 * node + went_right], so a step is one gather instead of a where()
+        self.children = np.stack([self.left, self.right], axis=1).ravel()
+        self.leaf_value = leaf_value
+        self._stored = dict(feature=feature, threshold=threshold, left=left, right=right,
+                            leaf_value=leaf_value, roots=roots)
+
+    @classmethod
+    def from_sklearn(cls, model, n_trees=None, prob_bits=8):
+        """Quantize the first n_trees estimators of a fitted RandomForestClassifier"""
+        if not 1 <= prob_bits <= 16:
+            raise ValueError("prob_bits must be between 1 and 16")
+        estimators = model.estimators_[:n_trees] if n_trees else model.estimators_
+        prob_scale = 2 ** prob_bits - 1
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset, depth = 0, 0
+        for estimator in estimators:
+            tree = estimator.tree_
+            nodes = np.arange(tree.node_count)
+            leaf = tree.children_left == -1
+            # Leaves loop back to themselves and test feature 0 against +inf
+            features.append(np.where(leaf, 0, tree.feature))
+            thresholds.append(np.where(leaf, np.inf, tree.threshold))
+            lefts.append(np.where(leaf, nodes, tree.children_left))
+            rights.append(np.where(leaf, nodes, tree.children_right))
+            proba = tree.value[:, 0, :]
+            proba = proba / proba.sum(axis=1, keepdims=True)
+            values.append(np.rint(proba * prob_scale))
+            roots.append(offset)
+            offset += tree.node_count
+            depth = max(depth, tree.max_depth)
+
+        # Child indices are per-tree, so they fit the smallest type for the largest tree
+        local_dtype = _index_dtype(max(len(f) for f in features))
+        return cls(
+            classes=model.classes_,
+            feature=np.concatenate(features).astype(_index_dtype(model.n_features_in_)),
+            threshold=_float32_floor(np.concatenate(thresholds)),
+            left=np.concatenate(lefts).astype(local_dtype),
+            right=np.concatenate(rights).astype(local_dtype),
+            leaf_value=np.concatenate(values).astype(np.uint8 if prob_bits <= 8 else np.uint16),
+            roots=np.asarray(roots, dtype=np.uint32),
+            depth=depth,
+            prob_scale=prob_scale,
+            feature_names=getattr(model, 'feature_names_in_', None)
+        )
+
+    def save(self, path):
+        """Write the .npz export to a path or a binary file object"""
+        meta = {
+            "format_version": FORMAT_VERSION,
+            "classes": self.classes_.tolist(),
+            "depth": self.depth,
+            "prob_scale": self.prob_scale,
+            "feature_names": None if self.feature_names_in_ is None else self.feature_names_in_.tolist()
+        }
+        arrays = dict(meta=np.frombuffer(json.dumps(meta).encode(), dtype=np.uint8), **self._stored)
+        if hasattr(path, 'write'):
+            np.savez_compressed(path, **arrays)
+            return
+        with open(path, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            meta = json.loads(data['meta'].tobytes())
+            if meta['format_version'] != FORMAT_VERSION:
+                raise ValueError(f"Unsupported compact forest version {meta['format_version']}")
+            arrays = {key: data[key] for key in ('feature', 'threshold', 'left', 'right', 'leaf_value', 'roots')}
+        return cls(meta['classes'], depth=meta['depth'], prob_scale=meta['prob_scale'],
+                   feature_names=meta['feature_names'], **arrays)
+
+    def leaves(self, X):
+        """Leaf node id of every sample in every tree, shape (n_samples, n_trees)"""
+        X = np.asarray(X, dtype=np.float32)
+        flat = X.ravel()
+        # Flat offsets of each sample's row, cheaper to gather than X[rows, features]
+        offsets = (np.arange(len(X)) * X.shape[1])[:, None]
+        nodes = np.broadcast_to(self.roots, (len(X), self.n_estimators))
+        for _ in range(self.depth):
+            # Not x > t: a NaN feature goes right, as in the original comparison
+            went_right = ~(flat[offsets + self.feature[nodes]] <= self.threshold[nodes])
+            nodes = self.children[2 * nodes + went_right]
+        return nodes
+
+    def predict_proba(self, X):
+        if hasattr(X, 'to_numpy'):
+            X = X.to_numpy()
+        totals = np.take(self.leaf_value, self.leaves(X), axis=0).sum(axis=1, dtype=np.float64)
+        return totals / totals.sum(axis=1, keepdims=True)
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+    def nbytes(self):
+        return sum(a.nbytes for a in self._stored.values())
+
+
+def compact_enabled():
+    return os.environ.get(COMPACT_ENV, '').lower() in ('1', 'true', 'yes')
+
+
+def load_forest(models_dir, compact=None):
+    """Random Forest for serving: the compact export when enabled and present, else the joblib model.
+
+    ``compact`` defaults to the DSS_COMPACT_FOREST environment variable.
+    """
+    if compact is None:
+        compact = compact_enabled()
+    compact_path = os.path.join(models_dir, COMPACT_FILE)
+    if compact and os.path.exists(compact_path):
+        return CompactForest.load(compact_path)
+    import joblib
+    return joblib.load(os.path.join(models_dir, 'rf_model.joblib'))
+
+
+def _median_seconds(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times))
+
+
+def _timing_inputs(X_test):
+    """One row and a 1000-row batch (the test rows repeated) for latency timings"""
+    return X_test[:1], np.repeat(X_test, -(-1000 // len(X_test)), axis=0)[:1000]
+
+
+def sweep_forests(model, X_test, y_test, tree_counts=SWEEP_TREES, bit_widths=SWEEP_BITS, repeat=20):
+    """Size, latency, accuracy and agreement with the full model per (trees, bits) export"""
+    X_test = np.asarray(X_test, dtype=float)
+    y_test = np.asarray(y_test)
+    single, batch = _timing_inputs(X_test)
+    original_proba = model.predict_proba(X_test)
+    original_pred = model.classes_[original_proba.argmax(axis=1)]
+    rows = []
+    for n_trees in sorted({min(n, model.n_estimators) for n in tree_counts}):
+        for prob_bits in bit_widths:
+            compact = CompactForest.from_sklearn(model, n_trees=n_trees, prob_bits=prob_bits)
+            buffer = io.BytesIO()
+            compact.save(buffer)
+            proba = compact.predict_proba(X_test)
+            predictions = compact.classes_[proba.argmax(axis=1)]
+            rows.append({
+                "trees": n_trees,
+                "prob_bits": prob_bits,
+                "file_bytes": buffer.tell(),
+                "predict_proba_1_ms": round(_median_seconds(lambda: compact.predict_proba(single), repeat) * 1000, 3),
+                "predict_proba_1000_ms": round(_median_seconds(lambda: compact.predict_proba(batch), repeat) * 1000, 3),
+                "accuracy": round(float((predictions == y_test).mean()), 4),
+                "agreement": round(float((predictions == original_pred).mean()), 4),
+                "max_proba_diff": round(float(np.abs(original_proba - proba).max()), 4)
+            })
+    return rows
+
+
+def compare_forests(original_path, compact_path, X_test, y_test, repeat=20):
+    """Size, load time, latency and held-out accuracy of both model files"""
+    import joblib
+
+    original = joblib.load(original_path)
+    compact = CompactForest.load(compact_path)
+    X_test = np.asarray(X_test, dtype=float)
+    y_test = np.asarray(y_test)
+    single, batch = _timing_inputs(X_test)
+
+    report = {}
+    for name, path, model, load in (
+        ('original', original_path, original, lambda: joblib.load(original_path)),
+        ('compact', compact_path, compact, lambda: CompactForest.load(compact_path))
+    ):
+        predictions = model.predict(X_test)
+        report[name] = {
+            "file_bytes": os.path.getsize(path),
+            "trees": int(model.n_estimators),
+            "load_ms": round(_median_seconds(load, max(3, repeat // 4)) * 1000, 3),
+            "predict_proba_1_ms": round(_median_seconds(lambda: model.predict_proba(single), repeat) * 1000, 3),
+            "predict_proba_1000_ms": round(_median_seconds(lambda: model.predict_proba(batch), repeat) * 1000, 3),
+            "accuracy": round(float((predictions == y_test).mean()), 4)
+        }
+
+    original_proba = original.predict_proba(X_test)
+    compact_proba = compact.predict_proba(X_test)
+    report["agreement"] = round(float((original.predict(X_test) == compact.predict(X_test)).mean()), 4)
+    report["max_proba_diff"] = round(float(np.abs(original_proba - compact_proba).max()), 4)
+    report["size_ratio"] = round(report["compact"]["file_bytes"] / report["original"]["file_bytes"], 4)
+    return report
@@ -0,0 +1,72 @@
+"""
+🎮 DSS Video Games - Compact Frame
+Memory-lean dtypes for the game table: categoricals for the repeated label
+columns and the smallest integer type for whole-number columns. Float columns
+stay float64, since means over float32 would shift the values the API reports.
+Appends keep the categoricals, and memory_report() breaks the footprint down
+per column.
+"""
+
+import pandas as pd
+
+CATEGORY_COLUMNS = ['Platform', 'Genre', 'Publisher', 'Cluster_Label']
+
+
+def _downcast(series):
+    """Integer series in the smallest integer dtype that holds its values"""
+    if pd.api.types.is_integer_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return pd.to_numeric(series, downcast='integer')
+    return series
+
+
+def _categories(frames, column):
+    """Sorted union of a column's values, so categorical order matches string order"""
+    values = set()
+    for df in frames:
+        column_values = df[column]
+        if isinstance(column_values.dtype, pd.CategoricalDtype):
+            values.update(column_values.cat.categories)
+        else:
+            values.update(column_values.dropna().unique())
+    return sorted(values)
+
+
+def compact_frame(df):
+    """df with categorical label columns and downcast numeric columns"""
+    columns = {}
+    for column in df.columns:
+        if column in CATEGORY_COLUMNS:
+            columns[column] = df[column].astype(pd.CategoricalDtype(_categories([df], column)))
+        else:
+            columns[column] = _downcast(df[column])
+    return pd.DataFrame(columns, index=df.index)
+
+
+def append_rows(df, df_new):
+    """Compact df with df_new appended; categories are merged, not re-factorized"""
+    frames = [df, df_new]
+    dtypes = {column: pd.CategoricalDtype(_categories(frames, column))
+              for column in CATEGORY_COLUMNS if column in df.columns and column in df_new.columns}
+    # Other text columns keep the table's string dtype rather than widening to object
+    for column in df.columns:
+        if column in df_new.columns and column not in dtypes and pd.api.types.is_string_dtype(df[column]):
+            dtypes[column] = df[column].dtype
+    combined = pd.concat([frame.astype(dtypes) for frame in frames], ignore_index=True)
+    return combined.assign(**{column: _downcast(combined[column]) for column in combined.columns
+                              if column not in CATEGORY_COLUMNS})
+
+
+def memory_report(df):
+    """Bytes held per column (deep, so string contents count) and in total"""
+    usage = df.memory_usage(deep=True, index=True)
+    total = int(usage.sum())
+    return {
+        "rows": len(df),
+        "total_bytes": total,
+        "bytes_per_row": round(total / len(df), 1) if len(df) else 0.0,
+        "columns": [
+            {"column": column, "dtype": str(df[column].dtype) if column != 'Index' else 'index',
+             "bytes": int(usage[column])}
+            for column in usage.index
+        ]
+    }
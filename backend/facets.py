@@ -0,0 +1,143 @@
+"""
+🎮 DSS Video Games - Facet Counts
+Per-value row bitmaps for the Data Explorer filters. The count of games each
+Platform, Genre, Publisher or year would leave under the current filters is
+the popcount of that value's bitmap ANDed with the other filters' bitmaps.
+"""
+
+import copy
+
+import numpy as np
+import pandas as pd
+
+from rule_mining import popcount
+
+# Facet name in requests and responses -> column it counts
+FACET_COLUMNS = {
+    'platform': 'Platform',
+    'genre': 'Genre',
+    'publisher': 'Publisher',
+    'year': 'Year_of_Release'
+}
+
+
+def _as_list(values):
+    if values is None or isinstance(values, str) or np.isscalar(values):
+        return [values] if values else []
+    return list(values)
+
+
+def _append_bits(bitmaps, n_rows, bits):
+    """Packed (values x n_rows) bitmaps with the boolean (values x new rows) bits appended"""
+    tail = n_rows % 8
+    if not tail:
+        return np.hstack([bitmaps, np.packbits(bits, axis=1)])
+    # The last byte is only partly used: unpack it and repack it with the new bits
+    last = np.unpackbits(bitmaps[:, -1:], axis=1)[:, :tail]
+    return np.hstack([bitmaps[:, :-1], np.packbits(np.hstack([last, bits]), axis=1)])
+
+
+class FacetIndex:
+    """Packed row bitmaps, one per value of every facet column.
+
+    Filters combine like /api/games: values within a facet are ORed, facets
+    are ANDed, and each facet is counted under every filter except its own, so
+    switching to another value of an already filtered facet shows its count.
+    """
+
+    def __init__(self, df):
+        self.n_rows = len(df)
+        self.values = {}
+        self.bitmaps = {}
+        for facet, column in FACET_COLUMNS.items():
+            codes, uniques = pd.factorize(df[column].to_numpy(), sort=True)
+            valid = codes >= 0
+            one_hot = np.zeros((len(uniques), self.n_rows), dtype=bool)
+            one_hot[codes[valid], np.flatnonzero(valid)] = True
+            self.values[facet] = uniques.tolist()
+            self.bitmaps[facet] = np.packbits(one_hot, axis=1)
+        self.positions = {facet: {v: i for i, v in enumerate(values)}
+                          for facet, values in self.values.items()}
+        self.all_rows = np.packbits(np.ones(self.n_rows, dtype=bool))
+
+    def with_rows(self, df):
+        """Index with df's rows appended; new values get a bitmap that is empty before them"""
+        index = copy.copy(self)
+        index.n_rows = self.n_rows + len(df)
+        index.values, index.bitmaps, index.positions = {}, {}, {}
+        for facet, column in FACET_COLUMNS.items():
+            new = df[column].to_numpy()
+            values = self.values[facet]
+            bitmaps = self.bitmaps[facet]
+            added = set(pd.unique(new[pd.notna(new)]).tolist()) - self.positions[facet].keys()
+            if added:
+                # Keep values sorted: old bitmaps move to their new positions
+                values = sorted(values + list(added))
+                moved = np.zeros((len(values), bitmaps.shape[1]), dtype=np.uint8)
+                positions = {v: i for i, v in enumerate(values)}
+                moved[[positions[v] for v in self.values[facet]]] = bitmaps
+                bitmaps = moved
+            else:
+                positions = self.positions[facet]
+            codes = np.array([positions.get(v, -1) for v in new.tolist()], dtype=np.int64)
+            valid = codes >= 0
+            bits = np.zeros((len(values), len(df)), dtype=bool)
+            bits[codes[valid], np.flatnonzero(valid)] = True
+            index.values[facet] = values
+            index.bitmaps[facet] = _append_bits(bitmaps, self.n_rows, bits)
+            index.positions[facet] = positions
+        index.all_rows = np.packbits(np.ones(index.n_rows, dtype=bool))
+        return index
+
+    def rows_bitmap(self, rows):
+        """Packed bitmap of a row id array, e.g. search matches"""
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[rows] = True
+        return np.packbits(mask)
+
+    def _value_mask(self, facet, values):
+        positions = [self.positions[facet][v] for v in values if v in self.positions[facet]]
+        if not positions:
+            return np.zeros_like(self.all_rows)
+        return np.bitwise_or.reduce(self.bitmaps[facet][positions], axis=0)
+
+    def _year_mask(self, year_min, year_max):
+        years = np.asarray(self.values['year'], dtype=float)
+        keep = np.ones(len(years), dtype=bool)
+        if year_min:
+            keep &= years >= year_min
+        if year_max:
+            keep &= years <= year_max
+        if not keep.any():
+            return np.zeros_like(self.all_rows)
+        return np.bitwise_or.reduce(self.bitmaps['year'][keep], axis=0)
+
+    def counts(self, platform=None, genre=None, publisher=None,
+               year_min=None, year_max=None, rows=None):
+        """Total matching games plus a count for every value of every facet.
+
+        rows is an optional packed bitmap applied to every count (the name search).
+        """
+        masks = {}
+        for facet, value in (('platform', platform), ('genre', genre), ('publisher', publisher)):
+            values = _as_list(value)
+            if values:
+                masks[facet] = self._value_mask(facet, values)
+        if year_min or year_max:
+            masks['year'] = self._year_mask(year_min, year_max)
+
+        base = self.all_rows if rows is None else rows
+        facets = {}
+        for facet in FACET_COLUMNS:
+            mask = base
+            for other, other_mask in masks.items():
+                if other != facet:
+                    mask = mask & other_mask
+            counts = popcount(self.bitmaps[facet] & mask)
+            facets[facet] = [{"value": value, "count": int(count)}
+                             for value, count in zip(self.values[facet], counts)]
+
+        total = base
+        for mask in masks.values():
+            total = total & mask
+        return {"total": int(popcount(total)), "facets": facets}
@@ -0,0 +1,148 @@
+"""
+🎮 DSS Video Games - Fast Start
+WSGI entry point for quick readiness: health and the precomputed JSON
+endpoints are answered straight away from pre-serialized files while
+backend/api.py (pandas, sklearn, the forest and every index) is imported in a
+background warm-up thread. Other requests wait for the warm-up, after which
+everything is served by api.app.
+
+    gunicorn fast_start:app
+    python fast_start.py --report    # per-module import times
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+from flask import Flask, Response, jsonify, request
+from flask_cors import CORS
+
+from lazy_import import import_report, timed_import
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS_DIR = os.path.join(BASE_DIR, 'models')
+
+# Imported in this order, so each module's time excludes what earlier ones
+# pulled in; 'api' is left with its own imports plus loading every artifact
+WARMUP_MODULES = ['numpy', 'pandas', 'joblib', 'sklearn.ensemble', 'sklearn.neighbors', 'api']
+
+# Seconds a request for a non-precomputed route waits for the warm-up before a 503
+# (below gunicorn's default 30 s worker timeout)
+WARMUP_WAIT_SECONDS = float(os.environ.get('DSS_WARMUP_WAIT', 20))
+
+DEFAULT_TOP_GAMES = 100
+
+
+class Warmup:
+    """Background import of the full API"""
+
+    def __init__(self, modules):
+        self.modules = modules
+        self.ready = threading.Event()
+        self.api_app = None
+        self.error = None
+        self.started = time.perf_counter()
+        self.seconds = None
+
+    def run(self):
+        try:
+            for name in self.modules:
+                module = timed_import(name)
+            self.api_app = module.app
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            print(f"❌ Warm-up failed: {self.error}")
+        finally:
+            self.seconds = time.perf_counter() - self.started
+            self.ready.set()
+
+    def start(self):
+        threading.Thread(target=self.run, name='api-warmup', daemon=True).start()
+        return self
+
+    def status(self):
+        return {
+            "ready": self.api_app is not None,
+            "elapsed_ms": round(((self.seconds if self.ready.is_set() else
+                                  time.perf_counter() - self.started)) * 1000, 1),
+            "error": self.error,
+            "import_ms": import_report()
+        }
+
+
+def _load_json(name):
+    with open(os.path.join(MODELS_DIR, name), 'r') as f:
+        return json.load(f)
+
+
+fast_app = Flask(__name__)
+CORS(fast_app, resources={r"/api/*": {"origins": "*"}})
+
+top_games = _load_json('top_games.json')
+with fast_app.app_context():
+    PRESERIALIZED = {
+        '/api/metadata': jsonify(_load_json('metadata.json')).get_data(),
+        '/api/chart-data': jsonify(_load_json('chart_data.json')).get_data(),
+        '/api/top-games': jsonify(top_games[:DEFAULT_TOP_GAMES]).get_data()
+    }
+
+# Routes fast_app answers by itself while the warm-up runs
+FAST_ROUTES = {'/api/health', *PRESERIALIZED}
+
+warmup = Warmup(WARMUP_MODULES)
+
+
+@fast_app.route('/api/health', methods=['GET'])
+def health_check():
+    """Health check while the full API is still loading; 503 once the warm-up has failed"""
+    return jsonify({
+        "status": "failed" if warmup.error else "warming",
+        "message": "DSS Video Games API is starting",
+        "warmup": warmup.status()
+    }), 503 if warmup.error else 200
+
+
+@fast_app.route('/api/metadata', methods=['GET'])
+@fast_app.route('/api/chart-data', methods=['GET'])
+def get_preserialized():
+    return Response(PRESERIALIZED[request.path], mimetype='application/json')
+
+
+@fast_app.route('/api/top-games', methods=['GET'])
+def get_top_games():
+    limit = request.args.get('limit', DEFAULT_TOP_GAMES, type=int)
+    if limit == DEFAULT_TOP_GAMES:
+        return Response(PRESERIALIZED[request.path], mimetype='application/json')
+    return jsonify(top_games[:limit])
+
+
+@fast_app.route('/', defaults={'path': ''}, methods=['GET', 'POST', 'PUT', 'DELETE'])
+@fast_app.route('/<path:path>', methods=['GET', 'POST', 'PUT', 'DELETE'])
+def not_ready(path):
+    error = f"Warm-up failed: {warmup.error}" if warmup.error else "API is still warming up"
+    return jsonify({"success": False, "error": error}), 503, {"Retry-After": "1"}
+
+
+def app(environ, start_response):
+    """Serve from api.app once warm; until then fast routes, or wait for the warm-up"""
+    if warmup.api_app is not None:
+        return warmup.api_app(environ, start_response)
+    if environ.get('PATH_INFO') not in FAST_ROUTES and environ.get('REQUEST_METHOD') != 'OPTIONS':
+        warmup.ready.wait(WARMUP_WAIT_SECONDS)
+        if warmup.api_app is not None:
+            return warmup.api_app(environ, start_response)
+    return fast_app(environ, start_response)
+
+
+if __name__ == '__main__':
+    if '--report' in sys.argv:
+        warmup.run()
+        print(json.dumps(warmup.status(), indent=2))
+    else:
+        from werkzeug.serving import run_simple
+        warmup.start()
+        run_simple('0.0.0.0', 5000, app, threaded=True)
+else:
+    warmup.start()
@@ -0,0 +1,377 @@
+"""
+🎮 DSS Video Games - Game Store
+In-memory game table with filter and name-search indexes.
+Every change is published as a new immutable snapshot, so ingestion applies
+small deltas and never blocks readers.
+"""
+
+import json
+import os
+import threading
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from compact_frame import append_rows, compact_frame
+from preprocess import REGION_COLUMNS, SELECTED_COLUMNS
+
+try:
+    import fcntl
+except ImportError:  # Windows: journal appends are not locked across processes
+    fcntl = None
+
+SALES_COLUMNS = REGION_COLUMNS + ['Global_Sales']
+TEXT_COLUMNS = ['Name', 'Platform', 'Genre', 'Publisher']
+INDEXED_COLUMNS = ['Platform', 'Genre', 'Publisher', 'Year_of_Release']
+
+EMPTY_ROWS = np.empty(0, dtype=np.int64)
+
+
+def name_trigrams(name):
+    name = name.lower()
+    return {name[i:i + 3] for i in range(len(name) - 2)}
+
+
+def _postings(keys, offset=0):
+    """Map each key to the sorted row ids where it occurs"""
+    codes, uniques = pd.factorize(np.asarray(keys))
+    order = np.argsort(codes, kind='stable').astype(np.int64) + offset
+    bounds = np.cumsum(np.bincount(codes, minlength=len(uniques)))[:-1]
+    return dict(zip(uniques.tolist(), np.split(order, bounds)))
+
+
+def _trigram_postings(names, offset=0):
+    postings = defaultdict(list)
+    for row, name in enumerate(names, start=offset):
+        for gram in name_trigrams(name):
+            postings[gram].append(row)
+    return {gram: np.asarray(rows, dtype=np.int64) for gram, rows in postings.items()}
+
+
+def _merge_postings(base, delta):
+    merged = dict(base)
+    for key, rows in delta.items():
+        old = merged.get(key)
+        merged[key] = rows if old is None else np.concatenate((old, rows))
+    return merged
+
+
+def with_rows(value, rows):
+    """memo() extend function for derived values that implement with_rows(rows)"""
+    return value.with_rows(rows)
+
+
+class GameSnapshot:
+    """Immutable view of the game table at one data version.
+
+    Derived values memoized with an ``extend`` function are carried over to
+    the next version together with the row where its appended rows start, so
+    that version extends them with the new rows rather than rebuilding.
+    """
+
+    def __init__(self, version, df, value_index, trigram_index, inherited=None, extendable=()):
+        self.version = version
+        self.df = df
+        self.value_index = value_index
+        self.trigram_index = trigram_index
+        # key -> (value of an earlier version, first row it does not cover)
+        self._inherited = dict(inherited or {})
+        self._extendable = set(extendable)
+        self._memo = {}
+        self._memo_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.df)
+
+    def __getstate__(self):
+        # Pickled into warm-cache snapshots; the lock is per process
+        state = self.__dict__.copy()
+        del state['_memo_lock']
+        with self._memo_lock:
+            state['_memo'] = dict(self._memo)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._memo_lock = threading.Lock()
+
+    @property
+    def games(self):
+        """The clean game columns, without cluster assignments"""
+        return self.df[SELECTED_COLUMNS]
+
+    def memo(self, key, compute, extend=None):
+        """Compute a derived value once per data version.
+
+        extend(value, rows) builds it from an earlier version's value and the
+        rows appended since, or returns None to fall back to compute().
+        """
+        try:
+            return self._memo[key]
+        except KeyError:
+            pass
+        value = None
+        if extend is not None:
+            self._extendable.add(key)
+            inherited = self._inherited.get(key)
+            if inherited is not None:
+                earlier, start = inherited
+                value = extend(earlier, self.df.iloc[start:])
+        if value is None:
+            value = compute()
+        with self._memo_lock:
+            self._inherited.pop(key, None)
+            return self._memo.setdefault(key, value)
+
+    def carried_over(self, offset):
+        """Extendable values for the next version, whose rows start at offset"""
+        with self._memo_lock:
+            carried = {key: (self._memo[key], offset) for key in self._extendable if key in self._memo}
+            for key, inherited in self._inherited.items():
+                carried.setdefault(key, inherited)
+        return carried
+
+    def rows_for(self, column, value):
+        return self.value_index[column].get(value, EMPTY_ROWS)
+
+    def search_rows(self, term):
+        """Rows whose name contains term (case-insensitive, literal match)"""
+        term = term.lower()
+        names = self.df['Name']
+        if len(term) < 3:
+            return np.flatnonzero(names.str.lower().str.contains(term, regex=False, na=False).to_numpy())
+        candidates = None
+        for gram in name_trigrams(term):
+            rows = self.trigram_index.get(gram, EMPTY_ROWS)
+            candidates = rows if candidates is None else np.intersect1d(candidates, rows, assume_unique=True)
+            if not len(candidates):
+                return EMPTY_ROWS
+        lowered = names.iloc[candidates].str.lower()
+        return candidates[lowered.str.contains(term, regex=False, na=False).to_numpy()]
+
+    def filter_rows(self, platform=None, genre=None, publisher=None,
+                    year_min=None, year_max=None, search=None):
+        """Sorted row ids matching every given filter; None means no filter applied"""
+        selections = []
+        for column, value in (('Platform', platform), ('Genre', genre), ('Publisher', publisher)):
+            if value:
+                selections.append(self.rows_for(column, value))
+        if year_min or year_max:
+            years = [y for y in self.value_index['Year_of_Release']
+                     if (not year_min or y >= year_min) and (not year_max or y <= year_max)]
+            selections.append(np.sort(np.concatenate(
+                [self.value_index['Year_of_Release'][y] for y in years])) if years else EMPTY_ROWS)
+        if search:
+            selections.append(self.search_rows(search))
+        if not selections:
+            return None
+
+        # Intersect smallest first so later intersections stay cheap
+        selections.sort(key=len)
+        rows = selections[0]
+        for other in selections[1:]:
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        return rows
+
+
+def _delta_snapshot(snapshot, df_new):
+    """New snapshot with df_new appended, updating the indexes incrementally"""
+    offset = len(snapshot.df)
+    df_new = df_new.reset_index(drop=True)
+    df = append_rows(snapshot.df, df_new)
+    value_index = {
+        column: _merge_postings(snapshot.value_index[column], _postings(df_new[column], offset))
+        for column in INDEXED_COLUMNS
+    }
+    trigram_index = _merge_postings(snapshot.trigram_index, _trigram_postings(df_new['Name'], offset))
+    return GameSnapshot(snapshot.version + 1, df, value_index, trigram_index,
+                        inherited=snapshot.carried_over(offset), extendable=snapshot._extendable)
+
+
+def build_snapshot(df, version=0):
+    df = compact_frame(df.reset_index(drop=True))
+    return GameSnapshot(
+        version,
+        df,
+        {column: _postings(df[column]) for column in INDEXED_COLUMNS},
+        _trigram_postings(df['Name'])
+    )
+
+
+class SegmentAssigner:
+    """Assigns market-segment clusters with the clustering notebook's scaler + K-Means"""
+
+    def __init__(self, scaler, kmeans, labels):
+        self.scaler = scaler
+        self.kmeans = kmeans
+        self.labels = labels
+
+    @classmethod
+    def from_frame(cls, scaler, kmeans, df_cluster):
+        labels = df_cluster.groupby('Cluster')['Cluster_Label'].first().to_dict()
+        return cls(scaler, kmeans, labels)
+
+    def __call__(self, df):
+        if not len(df):
+            return df.assign(Cluster=pd.Series(dtype=int), Cluster_Label=pd.Series(dtype=object))
+        clusters = self.kmeans.predict(self.scaler.transform(np.log1p(df[REGION_COLUMNS])))
+        return df.assign(Cluster=clusters, Cluster_Label=[self.labels.get(c, f"Cluster {c}") for c in clusters])
+
+
+def validate_records(records):
+    """Coerce raw records into SELECTED_COLUMNS rows; returns (frame, rejected)"""
+    if not isinstance(records, list):
+        raise ValueError("Expected a list of game records")
+    not_objects = [i for i, record in enumerate(records) if not isinstance(record, dict)]
+    if not_objects:
+        raise ValueError(f"Game records must be JSON objects (index {not_objects[0]})")
+    df = pd.DataFrame.from_records(records)
+    missing = [c for c in SELECTED_COLUMNS if c not in df.columns and c != 'Global_Sales']
+    if missing:
+        raise ValueError(f"Missing fields: {', '.join(missing)}")
+
+    df = df.reindex(columns=SELECTED_COLUMNS)
+    for column in TEXT_COLUMNS:
+        df[column] = df[column].where(df[column].notna(), None).astype(object)
+    df['User_Score'] = df['User_Score'].replace('tbd', np.nan)
+    numeric = [c for c in SELECTED_COLUMNS if c not in TEXT_COLUMNS]
+    df[numeric] = df[numeric].apply(pd.to_numeric, errors='coerce')
+    df['Global_Sales'] = df['Global_Sales'].fillna(df[REGION_COLUMNS].sum(axis=1, min_count=len(REGION_COLUMNS)))
+
+    # Segments are assigned on log1p(sales), so sales must be finite and non-negative
+    checks = [("Missing or non-numeric fields", df.isna()),
+              ("Non-finite fields", np.isinf(df[numeric])),
+              ("Negative sales", df[SALES_COLUMNS] < 0)]
+    failed = [(error, mask.to_numpy(), mask.columns) for error, mask in checks]
+    invalid = np.logical_or.reduce([mask.any(axis=1) for _, mask, _ in failed])
+    rejected = [{"index": int(i), "error": "; ".join(f"{error}: " + ", ".join(columns[mask[i]])
+                                                    for error, mask, columns in failed if mask[i].any())}
+                for i in np.flatnonzero(invalid)]
+    df = df[~invalid]
+    df['Year_of_Release'] = df['Year_of_Release'].astype(int)
+    return df, rejected
+
+
+class GameStore:
+    """Holds the current snapshot and applies ingested batches as deltas.
+
+    With a journal path, accepted records are appended to an NDJSON journal
+    and every process replays new journal lines before serving, so all
+    gunicorn workers converge on the same rows in the same order.
+    """
+
+    def __init__(self, df, assign_segments, journal_path=None, snapshot=None):
+        self._assign = assign_segments
+        self._journal_path = journal_path
+        self._journal_offset = 0
+        self._write_lock = threading.Lock()
+        # The journal is replayed on top of this version-0 snapshot of df
+        self.base = snapshot if snapshot is not None else build_snapshot(df)
+        self._snapshot = self.base
+        if journal_path:
+            self.refresh(blocking=True)
+
+    def current(self):
+        """Latest snapshot; picks up other workers' ingests without blocking"""
+        if self._journal_path:
+            self.refresh(blocking=False)
+        return self._snapshot
+
+    @property
+    def version(self):
+        return self._snapshot.version
+
+    def _apply(self, df_new):
+        """Publish a snapshot with df_new (segments already assigned) appended"""
+        if len(df_new):
+            self._snapshot = _delta_snapshot(self._snapshot, df_new)
+
+    def _replay(self, lines):
+        """Journal lines as segment-assigned rows; unusable lines are logged and skipped"""
+        records = []
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                print(f"⚠️ Skipping unreadable journal line: {e}")
+                continue
+            if isinstance(record, dict):
+                records.append(record)
+            else:
+                print("⚠️ Skipping journal line that is not a game record")
+        if not records:
+            return None
+        try:
+            df_new, rejected = validate_records(records)
+            for row in rejected:
+                print(f"⚠️ Skipping invalid journal record: {row['error']}")
+            return self._assign(df_new)
+        except ValueError as e:
+            print(f"⚠️ Skipping {len(records)} journal records: {e}")
+            return None
+
+    def _read_journal(self, f, size):
+        """Apply complete journal lines between the replay offset and size"""
+        f.seek(self._journal_offset)
+        chunk = f.read(size - self._journal_offset)
+        # Only consume complete lines; a concurrent writer may be mid-append
+        end = chunk.rfind(b'\n') + 1
+        if not end:
+            return
+        self._journal_offset += end
+        df_new = self._replay([line for line in chunk[:end].splitlines() if line.strip()])
+        if df_new is not None:
+            self._apply(df_new)
+
+    def refresh(self, blocking=False):
+        """Apply journal lines written since the last refresh"""
+        try:
+            size = os.path.getsize(self._journal_path)
+        except OSError:
+            return
+        if size <= self._journal_offset or not self._write_lock.acquire(blocking=blocking):
+            return
+        try:
+            with open(self._journal_path, 'rb') as f:
+                self._read_journal(f, size)
+        finally:
+            self._write_lock.release()
+
+    def _append_journal(self, df_new):
+        """Journal df_new after applying the lines other workers wrote before it"""
+        payload = ''.join(json.dumps(r) + '\n' for r in df_new[SELECTED_COLUMNS].to_dict('records')).encode()
+        with open(self._journal_path, 'a+b') as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                size = f.seek(0, os.SEEK_END)
+                if size > self._journal_offset:
+                    self._read_journal(f, size)
+                if self._journal_offset < size:
+                    # Terminate a torn line so it cannot swallow the first record
+                    payload = b'\n' + payload
+                f.write(payload)
+                f.flush()
+                self._journal_offset = size + len(payload)
+            finally:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def ingest(self, records):
+        """Validate and append records; returns accepted/rejected counts and new version"""
+        df_new, rejected = validate_records(records)
+        # Assign segments before journaling, so a batch that cannot be placed
+        # never reaches the journal every worker replays
+        df_new = self._assign(df_new)
+        with self._write_lock:
+            if self._journal_path and len(df_new):
+                # Rows this worker journals are applied directly, not replayed
+                self._append_journal(df_new)
+            self._apply(df_new)
+        return {
+            "accepted": len(df_new),
+            "rejected": rejected,
+            "total": len(self._snapshot),
+            "data_version": self._snapshot.version
+        }
@@ -0,0 +1,284 @@
+"""
+🎮 DSS Video Games - Inference Benchmark
+Micro-benchmarks of the serving paths for the models in models/: batched vs
+row-by-row predict_proba, the predict + predict_proba double call, label
+encoding, and cluster assignment through scaler + kmeans, at several batch
+sizes. Every run is appended to a JSON history and compared with a stored
+baseline; the models and dependency versions of both runs are recorded, so a
+regression can be traced to what changed.
+
+Usage (from the repository root):
+    python backend/inference_bench.py                   # run, record, compare
+    python backend/inference_bench.py --compact         # serve-time compact forest
+    python backend/inference_bench.py --update-baseline # make this run the baseline
+    python backend/inference_bench.py --check           # exit 1 on a regression
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from compact_forest import load_forest
+from similar_games import SCALED_FEATURES, sales_ratios
+from warm_cache import inputs_key
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS_DIR = os.path.join(BASE_DIR, 'models')
+DATASET_DIR = os.path.join(BASE_DIR, 'dataset')
+
+HISTORY_FILE = os.path.join(MODELS_DIR, 'inference_bench.json')
+MAX_HISTORY = 100
+
+BATCH_SIZES = [1, 10, 100, 1000, 10000]
+# Row-by-row calls above this many rows would take minutes and are skipped
+ROWWISE_MAX_ROWS = 100
+# Repeats per measurement: as many as fit in the time budget, within bounds
+TIME_BUDGET_SECONDS = 1.0
+MIN_REPEAT = 5
+MAX_REPEAT = 200
+
+# A case/size is a regression when its median is this much slower than the
+# baseline, and by more than MIN_REGRESSION_MS (timer noise on tiny batches)
+REGRESSION_TOLERANCE = 0.25
+MIN_REGRESSION_MS = 0.05
+
+FEATURE_COLUMNS = ['Platform', 'Genre', 'Publisher', 'Critic_Score', 'User_Score', 'Year_of_Release']
+DEPENDENCIES = ['numpy', 'pandas', 'sklearn', 'joblib']
+
+
+def load_models(models_dir, compact):
+    encoders = {name: joblib.load(os.path.join(models_dir, f'le_{name}.joblib'))
+                for name in ('platform', 'genre', 'publisher')}
+    return {
+        "forest": load_forest(models_dir, compact=compact),
+        "encoders": encoders,
+        # Label -> code dicts, the lookup backend/api.py encodes requests with
+        "codes": {name: {label: code for code, label in enumerate(encoder.classes_)}
+                  for name, encoder in encoders.items()},
+        "scaler": joblib.load(os.path.join(models_dir, 'scaler.joblib')),
+        "kmeans": joblib.load(os.path.join(models_dir, 'kmeans.joblib'))
+    }
+
+
+def make_inputs(df, models, n, seed=42):
+    """n games resampled from the dataset, as labels, model features and cluster features"""
+    games = df.sample(n, replace=True, random_state=seed).reset_index(drop=True)
+    labels = {name: games[name.capitalize()].to_numpy() for name in ('platform', 'genre', 'publisher')}
+    encoded = [[models["codes"][name].get(v, 0) for v in labels[name]] for name in labels]
+    features = np.column_stack(encoded + [games['Critic_Score'], games['User_Score'], games['Year_of_Release']])
+    cluster = games[['Global_Sales', 'Critic_Score', 'User_Score']].assign(**sales_ratios(games))[SCALED_FEATURES]
+    return {"labels": labels, "X": features.astype(float), "cluster": cluster}
+
+
+def build_cases(models):
+    """Case name -> (description, max rows or None, inputs -> zero-argument call)"""
+    forest, encoders, codes = models["forest"], models["encoders"], models["codes"]
+    scaler, kmeans = models["scaler"], models["kmeans"]
+
+    def rowwise(X):
+        return lambda: [forest.predict_proba(X[i:i + 1]) for i in range(len(X))]
+
+    def lookup(labels):
+        platform, genre, publisher = codes['platform'], codes['genre'], codes['publisher']
+        return lambda: [(platform.get(p, 0), genre.get(g, 0), publisher.get(pub, 0))
+                        for p, g, pub in zip(labels['platform'], labels['genre'], labels['publisher'])]
+
+    return {
+        "predict_proba_batched": ("One predict_proba call over the batch", None,
+                                  lambda inp: lambda: forest.predict_proba(inp["X"])),
+        "predict_proba_rowwise": ("One predict_proba call per row", ROWWISE_MAX_ROWS,
+                                  lambda inp: rowwise(inp["X"])),
+        "predict_plus_predict_proba": ("predict then predict_proba, as /api/predict does", None,
+                                       lambda inp: lambda: (forest.predict(inp["X"]), forest.predict_proba(inp["X"]))),
+        "predict_proba_argmax": ("Labels from one predict_proba pass", None,
+                                 lambda inp: lambda: forest.classes_[forest.predict_proba(inp["X"]).argmax(axis=1)]),
+        "encode_label_encoders": ("LabelEncoder.transform per categorical column", None,
+                                  lambda inp: lambda: [encoders[c].transform(inp["labels"][c]) for c in encoders]),
+        "encode_dict_lookup": ("Label -> code dict lookups per row", None,
+                               lambda inp: lookup(inp["labels"])),
+        "cluster_assign": ("scaler.transform + kmeans.predict", None,
+                           lambda inp: lambda: kmeans.predict(scaler.transform(inp["cluster"])))
+    }
+
+
+def measure(call, n):
+    """Latency percentiles, throughput and peak traced allocation of one call"""
+    start = time.perf_counter()
+    call()  # warm-up, also sizes the repeat count
+    first = time.perf_counter() - start
+    repeat = int(min(MAX_REPEAT, max(MIN_REPEAT, TIME_BUDGET_SECONDS // max(first, 1e-9))))
+    times = np.empty(repeat)
+    for i in range(repeat):
+        start = time.perf_counter()
+        call()
+        times[i] = time.perf_counter() - start
+
+    tracemalloc.start()
+    call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    p50, p95, p99 = np.percentile(times, [50, 95, 99]) * 1000
+    return {
+        "repeat": repeat,
+        "p50_ms": round(float(p50), 4),
+        "p95_ms": round(float(p95), 4),
+        "p99_ms": round(float(p99), 4),
+        "rows_per_s": round(n / (p50 / 1000), 1),
+        "peak_alloc_kb": round(peak / 1024, 1)
+    }
+
+
+def environment(models_dir, compact):
+    """What a change in results can be traced to: models, dependencies, machine"""
+    versions = {}
+    for name in DEPENDENCIES:
+        module = sys.modules.get(name) or __import__(name)
+        versions[name] = getattr(module, '__version__', None)
+    return {
+        "python": platform.python_version(),
+        **versions,
+        "forest": "compact" if compact else "sklearn",
+        "models_key": inputs_key(sorted(os.path.join(models_dir, f) for f in os.listdir(models_dir)
+                                        if f.endswith(('.joblib', '.npz')))),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count()
+    }
+
+
+def run_benchmarks(models, df, sizes, cases=None):
+    all_cases = build_cases(models)
+    results = {}
+    for name, (description, max_rows, make_call) in all_cases.items():
+        if cases and name not in cases:
+            continue
+        results[name] = {"description": description, "sizes": {}}
+        for n in sizes:
+            if max_rows is not None and n > max_rows:
+                continue
+            results[name]["sizes"][str(n)] = measure(make_call(make_inputs(df, models, n)), n)
+    return results
+
+
+def find_regressions(results, baseline, tolerance=REGRESSION_TOLERANCE):
+    """Case/size medians slower than the baseline's by more than tolerance"""
+    regressions = []
+    for name, case in results.items():
+        base_sizes = baseline.get("results", {}).get(name, {}).get("sizes", {})
+        for size, stats in case["sizes"].items():
+            base = base_sizes.get(size)
+            if not base:
+                continue
+            slower = stats["p50_ms"] - base["p50_ms"]
+            if stats["p50_ms"] > base["p50_ms"] * (1 + tolerance) and slower > MIN_REGRESSION_MS:
+                regressions.append({"case": name, "size": int(size), "baseline_ms": base["p50_ms"],
+                                    "p50_ms": stats["p50_ms"], "ratio": round(stats["p50_ms"] / base["p50_ms"], 2)})
+    return regressions
+
+
+def load_history(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"baseline": None, "runs": []}
+
+
+def save_history(path, history):
+    history["runs"] = history["runs"][-MAX_HISTORY:]
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(history, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def print_report(run, changed, regressions, compared):
+    print("\n" + "=" * 78)
+    print("🎮 DSS Video Games - Inference Benchmark")
+    print("=" * 78)
+    env = run["environment"]
+    print(f"python {env['python']} · numpy {env['numpy']} · pandas {env['pandas']} · "
+          f"sklearn {env['sklearn']} · forest {env['forest']}")
+    print(f"{'Case':<28}{'Rows':>7}{'p50 ms':>11}{'p95 ms':>11}{'p99 ms':>11}{'rows/s':>13}{'peak KB':>10}")
+    print("-" * 78)
+    for name, case in run["results"].items():
+        for size, s in case["sizes"].items():
+            print(f"{name:<28}{size:>7}{s['p50_ms']:>11.3f}{s['p95_ms']:>11.3f}{s['p99_ms']:>11.3f}"
+                  f"{s['rows_per_s']:>13,.0f}{s['peak_alloc_kb']:>10.1f}")
+    print("-" * 78)
+    if changed:
+        print("Changed since baseline: " + ", ".join(f"{k} {v['baseline']} -> {v['current']}"
+                                                     for k, v in changed.items()))
+    if regressions:
+        print(f"⚠️ {len(regressions)} regression(s) against the baseline:")
+        for r in regressions:
+            print(f"   {r['case']} @ {r['size']} rows: {r['baseline_ms']:.3f} -> {r['p50_ms']:.3f} ms ({r['ratio']}x)")
+    elif compared:
+        print("✅ No regressions against the baseline")
+    print("=" * 78)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark DSS Video Games model inference paths")
+    parser.add_argument('--models-dir', default=MODELS_DIR)
+    parser.add_argument('--dataset', default=os.path.join(DATASET_DIR, 'clean_data_video_games.csv'))
+    parser.add_argument('--history', default=HISTORY_FILE, help="JSON file with the baseline and past runs")
+    parser.add_argument('--sizes', type=int, nargs='+', default=BATCH_SIZES)
+    parser.add_argument('--cases', nargs='+', metavar='CASE', help="Only run these cases")
+    parser.add_argument('--compact', action='store_true', help="Benchmark the compact forest export")
+    parser.add_argument('--tolerance', type=float, default=REGRESSION_TOLERANCE,
+                        help="Allowed fractional slowdown of a median before it is flagged")
+    parser.add_argument('--update-baseline', action='store_true', help="Store this run as the baseline")
+    parser.add_argument('--check', action='store_true', help="Exit with status 1 on a regression")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    models = load_models(args.models_dir, args.compact)
+    if args.cases:
+        unknown = set(args.cases) - set(build_cases(models))
+        if unknown:
+            sys.exit(f"Unknown case(s): {', '.join(sorted(unknown))}")
+    df = pd.read_csv(args.dataset)
+
+    run = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        "environment": environment(args.models_dir, args.compact),
+        "results": run_benchmarks(models, df, sorted(args.sizes), args.cases)
+    }
+
+    history = load_history(args.history)
+    baseline = history.get("baseline")
+    compared = bool(baseline) and not args.update_baseline
+    changed, regressions = {}, []
+    if compared:
+        changed = {k: {"baseline": baseline["environment"].get(k), "current": v}
+                   for k, v in run["environment"].items() if baseline["environment"].get(k) != v}
+        regressions = find_regressions(run["results"], baseline, args.tolerance)
+    run["regressions"] = regressions
+    run["changed_since_baseline"] = changed
+
+    history["runs"].append(run)
+    if baseline is None or args.update_baseline:
+        history["baseline"] = run
+    save_history(args.history, history)
+
+    print_report(run, changed, regressions, compared)
+    if not compared:
+        print(f"📌 Stored as the baseline in {args.history}")
+    if args.check and regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+🎮 DSS Video Games - Lazy Imports
+Deferred module imports with per-module import time accounting, so startup
+only pays for what the first request actually needs
+"""
+
+import importlib
+import sys
+import threading
+import time
+
+# module name -> seconds spent importing it (modules it pulled in included)
+IMPORT_TIMES = {}
+_lock = threading.Lock()
+
+
+def timed_import(name):
+    """Import a module, recording how long it took if it was not loaded yet"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    with _lock:
+        IMPORT_TIMES.setdefault(name, time.perf_counter() - start)
+    return module
+
+
+class LazyModule:
+    """Stand-in for a module that is imported on first attribute access"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = timed_import(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_import(name):
+    return LazyModule(name)
+
+
+def import_report():
+    """Recorded import times in milliseconds, slowest first"""
+    with _lock:
+        times = sorted(IMPORT_TIMES.items(), key=lambda kv: -kv[1])
+    return {name: round(seconds * 1000, 1) for name, seconds in times}
@@ -0,0 +1,555 @@
+"""
+🎮 DSS Video Games - Training Pipeline
+Rebuilds every artifact in models/ and the derived CSVs in dataset/ from the
+raw Video_Games.csv, replacing the hand-run notebooks in notebook/.
+
+Stages run in a process pool as soon as their inputs are ready, and are
+skipped when the content hash of their inputs and parameters is unchanged.
+Stages with their own worker pool (preprocess, classifier) are not nested in
+it: they run in the main process while no other stage runs, with all --jobs.
+
+Usage (from the repository root):
+    python backend/pipeline.py                 # rebuild what changed
+    python backend/pipeline.py --force         # rebuild everything
+    python backend/pipeline.py --search        # grid-search the Random Forest
+    python backend/pipeline.py --only rules_success classifier
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import product
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from preprocess import REGION_COLUMNS
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS_DIR = os.path.join(BASE_DIR, 'models')
+DATASET_DIR = os.path.join(BASE_DIR, 'dataset')
+SEGMENT_MODELS_DIR = os.path.join(BASE_DIR, 'backend', 'app', 'models')
+
+MANIFEST_NAME = '.pipeline_manifest.json'
+
+# Bump when a stage's logic changes so cached outputs are rebuilt
+PIPELINE_VERSION = 3
+
+RANDOM_STATE = 42
+
+MIN_YEAR = 2013
+ZOMBIE_PLATFORMS = ['DS', 'Wii', 'PSP', 'PS2']
+
+CLUSTER_FEATURES = ['Global_Sales', 'Critic_Score', 'User_Score', 'NA_Ratio', 'EU_Ratio', 'JP_Ratio']
+FEATURE_COLUMNS = ['Platform_Encoded', 'Genre_Encoded', 'Publisher_Encoded',
+                   'Critic_Score', 'User_Score', 'Year_of_Release']
+
+SEGMENT_LABELS = ['Low Sales / Niche', 'Moderate / Mid-Tier', 'High Sales / Hit', 'Massive / Blockbuster']
+CLUSTER_LABELS = {0: 'Massive Blockbuster', 1: 'High Sales Hit', 2: 'Moderate Mid-Tier', 3: 'Low Performer'}
+SUCCESS_ORDER = ['Blockbuster', 'Hit', 'Moderate', 'Low']
+
+RF_PARAMS = {'n_estimators': 100, 'max_depth': 10, 'min_samples_split': 5}
+RF_SEARCH_GRID = {
+    'n_estimators': [100, 200],
+    'max_depth': [8, 10, None],
+    'min_samples_split': [2, 5, 10]
+}
+
+
+def default_paths(models_dir=MODELS_DIR, dataset_dir=DATASET_DIR, segment_dir=SEGMENT_MODELS_DIR):
+    """Artifact key -> file path"""
+    return {
+        'raw': os.path.join(dataset_dir, 'Video_Games.csv'),
+        'clean': os.path.join(dataset_dir, 'clean_data_video_games.csv'),
+        'clean_stats': os.path.join(dataset_dir, 'clean_data_stats.json'),
+        'segmented': os.path.join(dataset_dir, 'data_with_cluster.csv'),
+        'processed': os.path.join(dataset_dir, 'dss_processed_data.csv'),
+        'rules_success': os.path.join(dataset_dir, 'rules_success_factors.csv'),
+        'rules_dss': os.path.join(dataset_dir, 'dss_association_rules.csv'),
+        'feature_importance': os.path.join(dataset_dir, 'dss_feature_importance.csv'),
+        'segment_kmeans': os.path.join(segment_dir, 'model_kmeans.pkl'),
+        'segment_scaler': os.path.join(segment_dir, 'scaler_cluster.pkl'),
+        'regression': os.path.join(segment_dir, 'model_regression.pkl'),
+        'regression_features': os.path.join(segment_dir, 'model_features.pkl'),
+        'scaler': os.path.join(models_dir, 'scaler.joblib'),
+        'kmeans': os.path.join(models_dir, 'kmeans.joblib'),
+        'rf_model': os.path.join(models_dir, 'rf_model.joblib'),
+        'le_platform': os.path.join(models_dir, 'le_platform.joblib'),
+        'le_genre': os.path.join(models_dir, 'le_genre.joblib'),
+        'le_publisher': os.path.join(models_dir, 'le_publisher.joblib'),
+        'metadata': os.path.join(models_dir, 'metadata.json'),
+        'chart_data': os.path.join(models_dir, 'chart_data.json'),
+        'top_games': os.path.join(models_dir, 'top_games.json'),
+        'cluster_data': os.path.join(models_dir, 'cluster_data.json'),
+        'rf_compact': os.path.join(models_dir, 'rf_compact.npz'),
+        'compact_report': os.path.join(models_dir, 'rf_compact_report.json'),
+    }
+
+
+def _write_json(path, data):
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def categorize_success(sales):
+    if sales >= 5:
+        return 'Blockbuster'
+    elif sales >= 2:
+        return 'Hit'
+    elif sales >= 1:
+        return 'Moderate'
+    else:
+        return 'Low'
+
+
+# ==================== STAGES ====================
+# Each stage reads its inputs from disk and writes its outputs to disk, so it
+# can run in any worker process. The returned dict is printed in the report.
+
+def stage_preprocess(paths, params):
+    """notebook/data_preprocessing.ipynb, streamed in parallel chunks"""
+    from preprocess import stream_preprocess
+
+    stats = stream_preprocess(paths['raw'], paths['clean'], params['min_year'], params['zombie_platforms'],
+                              chunk_size=params['chunk_size'], jobs=params['jobs'])
+    _write_json(paths['clean_stats'], stats.to_json())
+    return {"rows": stats.count}
+
+
+def stage_segments(paths, params):
+    """notebook/clustering.ipynb: log-scaled regional sales segments"""
+    from sklearn.cluster import KMeans
+    from sklearn.preprocessing import StandardScaler
+
+    df = pd.read_csv(paths['clean'])
+    scaler = StandardScaler()
+    X_scaled = scaler.fit_transform(np.log1p(df[REGION_COLUMNS]))
+    kmeans = KMeans(n_clusters=params['n_clusters'], random_state=RANDOM_STATE, n_init=10)
+    df['Cluster'] = kmeans.fit_predict(X_scaled)
+
+    # Name segments from poorest to richest by mean global sales
+    rank = df.groupby('Cluster')['Global_Sales'].mean().sort_values().index
+    df['Cluster_Label'] = df['Cluster'].map(dict(zip(rank, SEGMENT_LABELS)))
+
+    df.to_csv(paths['segmented'], index=False)
+    os.makedirs(os.path.dirname(paths['segment_kmeans']), exist_ok=True)
+    joblib.dump(kmeans, paths['segment_kmeans'])
+    joblib.dump(scaler, paths['segment_scaler'])
+    return {"clusters": df['Cluster_Label'].value_counts().to_dict()}
+
+
+def stage_features(paths, params):
+    """DSS_Video_Games_Analysis.ipynb: feature engineering and K-Means"""
+    from sklearn.cluster import KMeans
+    from sklearn.preprocessing import StandardScaler
+
+    df = pd.read_csv(paths['clean'])
+    df['Success_Category'] = df['Global_Sales'].apply(categorize_success)
+    df['Critic_Category'] = pd.cut(df['Critic_Score'], bins=[0, 60, 75, 85, 100],
+                                   labels=['Poor', 'Average', 'Good', 'Excellent'])
+    df['User_Category'] = pd.cut(df['User_Score'], bins=[0, 5, 7, 8.5, 10],
+                                 labels=['Poor', 'Average', 'Good', 'Excellent'])
+    for region in ['NA', 'EU', 'JP']:
+        df[f'{region}_Ratio'] = df[f'{region}_Sales'] / df['Global_Sales']
+
+    df = df.dropna(subset=CLUSTER_FEATURES)
+    scaler = StandardScaler()
+    X_scaled = scaler.fit_transform(df[CLUSTER_FEATURES])
+    kmeans = KMeans(n_clusters=params['n_clusters'], random_state=RANDOM_STATE, n_init=10)
+    df['Cluster'] = kmeans.fit_predict(X_scaled)
+
+    df.to_csv(paths['processed'], index=False)
+    joblib.dump(scaler, paths['scaler'])
+    joblib.dump(kmeans, paths['kmeans'])
+    return {"rows": len(df), "inertia": round(float(kmeans.inertia_), 2)}
+
+
+def stage_rules_success(paths, params):
+    """notebook/association_rules.ipynb: rules leading to Hit/Blockbuster segments"""
+    from rule_mining import RuleMiner, format_items
+
+    miner = RuleMiner.from_frame(pd.read_csv(paths['segmented']))
+    rules = miner.rules(params['min_support'], min_lift=params['min_lift'])
+    table = pd.DataFrame({
+        'Sebab (Antecedents)': rules['antecedents'].apply(format_items),
+        'Akibat (Consequents)': rules['consequents'].apply(format_items),
+        'support': rules['support'],
+        'confidence': rules['confidence'],
+        'lift': rules['lift']
+    })
+    table.to_csv(paths['rules_success'], index=False)
+    return {"itemsets": len(miner.itemsets(params['min_support'])), "rules": len(table)}
+
+
+def stage_rules_dss(paths, params):
+    """DSS_Video_Games_Analysis.ipynb: binary-feature association rules"""
+    from rule_mining import association_rules, format_items, frequent_itemsets
+
+    df = pd.read_csv(paths['processed'])
+    binary = {}
+    for platform in df['Platform'].value_counts().head(5).index:
+        binary[f'Platform_{platform}'] = df['Platform'] == platform
+    for genre in df['Genre'].value_counts().head(5).index:
+        binary[f'Genre_{genre}'] = df['Genre'] == genre
+    binary['Score_High'] = df['Critic_Score'] >= 85
+    binary['Score_Mid'] = (df['Critic_Score'] >= 70) & (df['Critic_Score'] < 85)
+    binary['Score_Low'] = df['Critic_Score'] < 70
+    binary['Is_Blockbuster'] = df['Success_Category'] == 'Blockbuster'
+    binary['Is_Hit'] = df['Success_Category'] == 'Hit'
+
+    items = list(binary)
+    matrix = np.column_stack([binary[item].to_numpy() for item in items])
+    itemsets = frequent_itemsets(matrix, params['min_support'])
+    rules = association_rules(itemsets, items, min_lift=params['min_lift'])
+    rules['antecedents'] = rules['antecedents'].apply(format_items)
+    rules['consequents'] = rules['consequents'].apply(format_items)
+    rules.to_csv(paths['rules_dss'], index=False)
+    return {"itemsets": len(itemsets), "rules": len(rules)}
+
+
+def _cv_score(X, y, rf_params, folds):
+    """Mean stratified k-fold accuracy of one Random Forest configuration"""
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.model_selection import StratifiedKFold, cross_val_score
+
+    model = RandomForestClassifier(random_state=RANDOM_STATE, n_jobs=1, **rf_params)
+    cv = StratifiedKFold(n_splits=folds, shuffle=True, random_state=RANDOM_STATE)
+    return float(cross_val_score(model, X, y, cv=cv, scoring='accuracy').mean())
+
+
+def search_rf_params(X, y, grid, folds, jobs):
+    """Grid search over RF parameters, one candidate per pool worker"""
+    candidates = [dict(zip(grid, values)) for values in product(*grid.values())]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        scores = list(pool.map(_cv_score, [X] * len(candidates), [y] * len(candidates),
+                               candidates, [folds] * len(candidates)))
+    best = int(np.argmax(scores))
+    return candidates[best], scores[best], len(candidates)
+
+
+def split_model_data(df_model):
+    """Train/test split shared by training and evaluation"""
+    from sklearn.model_selection import train_test_split
+
+    return train_test_split(df_model[FEATURE_COLUMNS], df_model['Success_Category'],
+                            test_size=0.25, random_state=RANDOM_STATE,
+                            stratify=df_model['Success_Category'])
+
+
+def encode_model_frame(df, le_platform, le_genre, le_publisher):
+    df_model = df.copy()
+    df_model['Platform_Encoded'] = le_platform.transform(df_model['Platform'])
+    df_model['Genre_Encoded'] = le_genre.transform(df_model['Genre'])
+    df_model['Publisher_Encoded'] = le_publisher.transform(df_model['Publisher'])
+    return df_model
+
+
+def stage_classifier(paths, params):
+    """DSS_Video_Games_Analysis.ipynb: Random Forest success classifier"""
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.preprocessing import LabelEncoder
+
+    df = pd.read_csv(paths['processed'])
+    le_platform = LabelEncoder().fit(df['Platform'])
+    le_genre = LabelEncoder().fit(df['Genre'])
+    le_publisher = LabelEncoder().fit(df['Publisher'])
+    df_model = encode_model_frame(df, le_platform, le_genre, le_publisher)
+    X_train, X_test, y_train, y_test = split_model_data(df_model)
+
+    info = {}
+    rf_params = dict(RF_PARAMS)
+    if params['search']:
+        rf_params, cv_accuracy, n_candidates = search_rf_params(
+            X_train, y_train, RF_SEARCH_GRID, params['cv_folds'], params['jobs'])
+        info.update({"candidates": n_candidates, "cv_accuracy": round(cv_accuracy, 4), "best_params": rf_params})
+
+    rf_model = RandomForestClassifier(random_state=RANDOM_STATE, n_jobs=params['jobs'], **rf_params)
+    rf_model.fit(X_train, y_train)
+    info["test_accuracy"] = round(float(rf_model.score(X_test, y_test)), 4)
+
+    feature_importance = pd.DataFrame({
+        'Feature': FEATURE_COLUMNS,
+        'Importance': rf_model.feature_importances_
+    }).sort_values('Importance', ascending=True)
+
+    joblib.dump(rf_model, paths['rf_model'])
+    joblib.dump(le_platform, paths['le_platform'])
+    joblib.dump(le_genre, paths['le_genre'])
+    joblib.dump(le_publisher, paths['le_publisher'])
+    feature_importance.to_csv(paths['feature_importance'], index=False)
+    return info
+
+
+def stage_compact(paths, params):
+    """Quantized Random Forest export plus a size/latency/accuracy report"""
+    from compact_forest import CompactForest, compare_forests, sweep_forests
+
+    rf_model = joblib.load(paths['rf_model'])
+    CompactForest.from_sklearn(rf_model, n_trees=params['n_trees'], prob_bits=params['prob_bits']) \
+        .save(paths['rf_compact'])
+
+    df_model = encode_model_frame(pd.read_csv(paths['processed']), *(
+        joblib.load(paths[key]) for key in ('le_platform', 'le_genre', 'le_publisher')))
+    _, X_test, _, y_test = split_model_data(df_model)
+    report = compare_forests(paths['rf_model'], paths['rf_compact'], X_test, y_test)
+    report["sweep"] = sweep_forests(rf_model, X_test, y_test)
+    _write_json(paths['compact_report'], report)
+    return {
+        "size_ratio": report['size_ratio'],
+        "accuracy": report['compact']['accuracy'],
+        "agreement": report['agreement']
+    }
+
+
+def stage_regression(paths, params):
+    """notebook/regression.ipynb: linear sales regression for goal seeking"""
+    from sklearn.linear_model import LinearRegression
+    from sklearn.metrics import r2_score
+    from sklearn.model_selection import train_test_split
+
+    df = pd.read_csv(paths['clean'])
+    df_encoded = pd.get_dummies(df[['Platform', 'Genre', 'Critic_Score', 'Global_Sales']], drop_first=True)
+    X = df_encoded.drop(columns=['Global_Sales'])
+    y = df_encoded['Global_Sales']
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=RANDOM_STATE)
+    model = LinearRegression().fit(X_train, y_train)
+
+    os.makedirs(os.path.dirname(paths['regression']), exist_ok=True)
+    joblib.dump(model, paths['regression'])
+    joblib.dump(X.columns.tolist(), paths['regression_features'])
+    return {"r2": round(float(r2_score(y_test, model.predict(X_test))), 4)}
+
+
+def stage_exports(paths, params):
+    """DSS_Video_Games_Analysis.ipynb: JSON exports for the web application"""
+    # Clean-data aggregates come from the streaming preprocess, not a reload of the CSV
+    with open(paths['clean_stats']) as f:
+        stats = json.load(f)
+    df_clustered = pd.read_csv(paths['processed'])
+    rf_model = joblib.load(paths['rf_model'])
+    le_platform = joblib.load(paths['le_platform'])
+    le_genre = joblib.load(paths['le_genre'])
+    le_publisher = joblib.load(paths['le_publisher'])
+    feature_importance = pd.DataFrame({
+        'Feature': FEATURE_COLUMNS,
+        'Importance': rf_model.feature_importances_
+    }).sort_values('Importance', ascending=True)
+
+    df_model = encode_model_frame(df_clustered, le_platform, le_genre, le_publisher)
+    _, X_test, _, y_test = split_model_data(df_model)
+    accuracy = float((rf_model.predict(X_test) == y_test).mean())
+
+    metadata = {
+        "platforms": list(le_platform.classes_),
+        "genres": list(le_genre.classes_),
+        "publishers": list(le_publisher.classes_),
+        "model_accuracy": accuracy,
+        "feature_importance": feature_importance.to_dict('records'),
+        "cluster_labels": CLUSTER_LABELS,
+        "success_categories": SUCCESS_ORDER,
+        **stats['metadata']
+    }
+    _write_json(paths['metadata'], metadata)
+    _write_json(paths['chart_data'], stats['chart_data'])
+    _write_json(paths['top_games'], stats['top_games'])
+
+    cluster_data = df_clustered[
+        ['Name', 'Platform', 'Genre', 'Global_Sales', 'Critic_Score', 'User_Score', 'Cluster']
+    ].head(500).to_dict('records')
+    _write_json(paths['cluster_data'], cluster_data)
+    return {"model_accuracy": round(accuracy, 4)}
+
+
+# exclusive: the stage uses params['jobs'] workers itself, so it runs alone in the main process
+Stage = namedtuple('Stage', ['name', 'func', 'inputs', 'outputs', 'params', 'exclusive'], defaults=[False])
+
+
+def build_stages(args):
+    return [
+        Stage('preprocess', stage_preprocess, ['raw'], ['clean', 'clean_stats'],
+              {'min_year': MIN_YEAR, 'zombie_platforms': ZOMBIE_PLATFORMS,
+               'chunk_size': args.chunk_size, 'jobs': args.jobs}, exclusive=True),
+        Stage('segments', stage_segments, ['clean'],
+              ['segmented', 'segment_kmeans', 'segment_scaler'], {'n_clusters': 4}),
+        Stage('features', stage_features, ['clean'], ['processed', 'scaler', 'kmeans'], {'n_clusters': 4}),
+        Stage('rules_success', stage_rules_success, ['segmented'], ['rules_success'],
+              {'min_support': args.min_support, 'min_lift': 1.0}),
+        Stage('rules_dss', stage_rules_dss, ['processed'], ['rules_dss'],
+              {'min_support': args.min_support, 'min_lift': 1.0}),
+        Stage('classifier', stage_classifier, ['processed'],
+              ['rf_model', 'le_platform', 'le_genre', 'le_publisher', 'feature_importance'],
+              {'search': args.search, 'cv_folds': args.cv_folds, 'jobs': args.jobs}, exclusive=True),
+        Stage('compact', stage_compact, ['rf_model', 'processed', 'le_platform', 'le_genre', 'le_publisher'],
+              ['rf_compact', 'compact_report'], {'n_trees': args.compact_trees, 'prob_bits': args.compact_bits}),
+        Stage('regression', stage_regression, ['clean'], ['regression', 'regression_features'], {}),
+        Stage('exports', stage_exports,
+              ['clean_stats', 'processed', 'rf_model', 'le_platform', 'le_genre', 'le_publisher'],
+              ['metadata', 'chart_data', 'top_games', 'cluster_data'], {}),
+    ]
+
+
+# ==================== CACHING ====================
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def stage_key(stage, paths):
+    """Content hash of a stage's inputs, parameters and pipeline version"""
+    # Worker count only affects speed, never the artifacts
+    params = {k: v for k, v in stage.params.items() if k != 'jobs'}
+    h = hashlib.sha256(json.dumps([PIPELINE_VERSION, stage.name, params], sort_keys=True).encode())
+    for key in stage.inputs:
+        h.update(key.encode())
+        h.update(file_hash(paths[key]).encode())
+    return h.hexdigest()
+
+
+def is_fresh(entry, key, stage, paths):
+    if not entry or entry.get('key') != key:
+        return False
+    outputs = entry.get('outputs', {})
+    for out in stage.outputs:
+        path = paths[out]
+        if not os.path.exists(path) or outputs.get(out) != file_hash(path):
+            return False
+    return True
+
+
+def load_manifest(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _run_stage(stage, paths):
+    start = time.perf_counter()
+    info = stage.func(paths, stage.params)
+    return info, time.perf_counter() - start
+
+
+# ==================== SCHEDULER ====================
+
+def run_pipeline(stages, paths, manifest_path, jobs=None, force=False, only=None):
+    """Run stages in dependency order in a process pool; returns the report rows"""
+    manifest = load_manifest(manifest_path)
+    producer = {out: s.name for s in stages for out in s.outputs}
+    deps = {s.name: {producer[i] for i in s.inputs if i in producer} for s in stages}
+    pending = {s.name: s for s in stages}
+    done, running, waiting, report = set(), {}, [], []
+    wall_start = time.perf_counter()
+
+    def finish(stage, key, info, elapsed):
+        manifest[stage.name] = {
+            'key': key,
+            'outputs': {out: file_hash(paths[out]) for out in stage.outputs}
+        }
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        report.append((stage.name, 'built', elapsed, info))
+        print(f"  ✅ {stage.name:<14} built in {elapsed:.2f}s")
+        done.add(stage.name)
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        while pending or running or waiting:
+            for name in [n for n in pending if deps[n] <= done]:
+                if waiting and not pending[name].exclusive:
+                    continue  # Held back until the exclusive stage ahead of it has run
+                stage = pending.pop(name)
+                key = stage_key(stage, paths)
+                forced = force or (only is not None and name in only)
+                if not forced and is_fresh(manifest.get(name), key, stage, paths):
+                    report.append((name, 'cached', 0.0, {}))
+                    print(f"  ⏭  {name:<14} cached")
+                    done.add(name)
+                elif stage.exclusive:
+                    waiting.append((stage, key))
+                else:
+                    print(f"  ▶  {name:<14} started")
+                    running[pool.submit(_run_stage, stage, paths)] = (stage, key)
+
+            if waiting and not running:
+                # Its own pool gets the whole worker budget, so nothing else runs meanwhile
+                stage, key = waiting.pop(0)
+                print(f"  ▶  {stage.name:<14} started (alone, {stage.params.get('jobs') or 1} workers)")
+                finish(stage, key, *_run_stage(stage, paths))
+                continue
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage, key = running.pop(future)
+                finish(stage, key, *future.result())
+
+    return report, time.perf_counter() - wall_start
+
+
+def print_report(report, total):
+    print("\n" + "=" * 60)
+    print(f"{'Stage':<16}{'Status':<9}{'Wall time':>10}  Details")
+    print("-" * 60)
+    for name, status, elapsed, info in report:
+        details = ", ".join(f"{k}={v}" for k, v in info.items())
+        print(f"{name:<16}{status:<9}{elapsed:>9.2f}s  {details}")
+    print("-" * 60)
+    print(f"{'Total':<25}{total:>9.2f}s")
+    print("=" * 60)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild DSS Video Games models and datasets")
+    parser.add_argument('--models-dir', default=MODELS_DIR)
+    parser.add_argument('--dataset-dir', default=DATASET_DIR)
+    parser.add_argument('--raw', help="Raw Video_Games.csv (default: <dataset-dir>/Video_Games.csv)")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument('--force', action='store_true', help="Ignore the stage cache")
+    parser.add_argument('--only', nargs='+', metavar='STAGE', help="Force-rebuild these stages")
+    parser.add_argument('--search', action='store_true', help="Cross-validated Random Forest grid search")
+    parser.add_argument('--cv-folds', type=int, default=5)
+    parser.add_argument('--min-support', type=float, default=0.01)
+    parser.add_argument('--compact-trees', type=int, help="Trees kept in the compact forest (default: all)")
+    parser.add_argument('--compact-bits', type=int, default=8, help="Bits per quantized leaf probability")
+    parser.add_argument('--chunk-size', type=int, default=50_000, help="Raw CSV rows per preprocessing chunk")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    segment_dir = SEGMENT_MODELS_DIR
+    if os.path.abspath(args.models_dir) != MODELS_DIR:
+        segment_dir = os.path.join(args.models_dir, 'segments')
+    paths = default_paths(args.models_dir, args.dataset_dir, segment_dir)
+    if args.raw:
+        paths['raw'] = args.raw
+    os.makedirs(args.models_dir, exist_ok=True)
+    os.makedirs(args.dataset_dir, exist_ok=True)
+
+    stages = build_stages(args)
+    if args.only:
+        unknown = set(args.only) - {s.name for s in stages}
+        if unknown:
+            sys.exit(f"Unknown stage(s): {', '.join(sorted(unknown))}")
+
+    print("\n" + "=" * 60)
+    print("🎮 DSS Video Games - Training Pipeline")
+    print("=" * 60)
+    report, total = run_pipeline(stages, paths, os.path.join(args.models_dir, MANIFEST_NAME),
+                                 jobs=args.jobs, force=args.force,
+                                 only=set(args.only) if args.only else None)
+    print_report(report, total)
+
+
+if __name__ == '__main__':
+    main()
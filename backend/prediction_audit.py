@@ -0,0 +1,432 @@
+"""
+🎮 DSS Video Games - Prediction Audit
+Append-only audit log of served predictions with online drift statistics.
+The request thread only queues a reference to the inputs and outputs; a
+writer thread serializes them to a rotating NDJSON log and updates running
+input/class distributions, which are compared with the training data
+(population stability index) for /api/monitoring/drift. Workers share their
+running statistics through the audit directory, so the report covers every
+worker of the server.
+"""
+
+import copy
+import glob
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter, deque
+
+import numpy as np
+
+from publisher_leaderboard import SUCCESS_CATEGORIES, success_codes
+from state_dir import ensure_private_dir
+
+# Categorical inputs -> dataset column; numeric inputs -> dataset column
+CATEGORICAL_INPUTS = {'platform': 'Platform', 'genre': 'Genre', 'publisher': 'Publisher'}
+NUMERIC_INPUTS = {'critic_score': 'Critic_Score', 'user_score': 'User_Score', 'year': 'Year_of_Release'}
+# Column of the year the model actually sees, after normalize_year()
+MODEL_YEAR_COLUMN = 5
+
+# Quantile bins per numeric input for the stability index
+DRIFT_BINS = 10
+# PSI below 0.1 is stable, up to 0.25 a moderate shift, above that significant
+PSI_MODERATE = 0.1
+PSI_SIGNIFICANT = 0.25
+# Predictions needed before a PSI is reported
+MIN_DRIFT_SAMPLES = 30
+# Values reported per categorical input, and distinct unknown labels tracked
+TOP_VALUES = 10
+MAX_UNKNOWN_LABELS = 100
+
+# Queued batches before new predictions are dropped from the log
+MAX_PENDING = 10000
+# Seconds between writer flushes
+FLUSH_SECONDS = 1.0
+
+
+def psi(expected, actual):
+    """Population stability index of two count or share vectors"""
+    expected = np.asarray(expected, dtype=float)
+    actual = np.asarray(actual, dtype=float)
+    e = np.clip(expected / max(expected.sum(), 1e-12), 1e-4, None)
+    a = np.clip(actual / max(actual.sum(), 1e-12), 1e-4, None)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+def psi_status(value):
+    if value is None:
+        return None
+    if value < PSI_MODERATE:
+        return 'stable'
+    return 'moderate' if value < PSI_SIGNIFICANT else 'significant'
+
+
+class _Numeric:
+    """Running mean/variance (Welford), range and reference-bin counts of one input"""
+
+    def __init__(self, values):
+        values = np.asarray(values, dtype=float)
+        inner = np.quantile(values, np.linspace(0, 1, DRIFT_BINS + 1)[1:-1])
+        self.edges = np.unique(inner)
+        self.expected = np.bincount(np.searchsorted(self.edges, values, side='right'),
+                                    minlength=len(self.edges) + 1)
+        self.reference = {"mean": float(values.mean()), "std": float(values.std()),
+                          "min": float(values.min()), "max": float(values.max())}
+        self.counts = np.zeros(len(self.edges) + 1, dtype=np.int64)
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.out_of_range = 0
+
+    def update(self, value):
+        if not math.isfinite(value):
+            return
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.counts[int(np.searchsorted(self.edges, value, side='right'))] += 1
+        if not self.reference["min"] <= value <= self.reference["max"]:
+            self.out_of_range += 1
+
+    def state(self):
+        return {"counts": self.counts.tolist(), "n": self.n, "mean": self.mean, "m2": self.m2,
+                "min": self.min, "max": self.max, "out_of_range": self.out_of_range}
+
+    def merge(self, state):
+        """Add another worker's running statistics (Chan et al. parallel variance)"""
+        if not state["n"]:
+            return
+        n = self.n + state["n"]
+        delta = state["mean"] - self.mean
+        self.mean += delta * state["n"] / n
+        self.m2 += state["m2"] + delta * delta * self.n * state["n"] / n
+        self.n = n
+        self.min = min(self.min, state["min"])
+        self.max = max(self.max, state["max"])
+        self.counts += np.asarray(state["counts"], dtype=np.int64)
+        self.out_of_range += state["out_of_range"]
+
+    def report(self):
+        drift = psi(self.expected, self.counts) if self.n >= MIN_DRIFT_SAMPLES else None
+        return {
+            "count": self.n,
+            "mean": round(self.mean, 4) if self.n else None,
+            "std": round(math.sqrt(self.m2 / self.n), 4) if self.n else None,
+            "min": self.min if self.n else None,
+            "max": self.max if self.n else None,
+            "out_of_range_rate": round(self.out_of_range / self.n, 4) if self.n else 0.0,
+            "training": {k: round(v, 4) for k, v in self.reference.items()},
+            "psi": round(drift, 4) if drift is not None else None,
+            "status": psi_status(drift)
+        }
+
+
+class _Categorical:
+    """Counts of known labels (by training code) plus unknown labels of one input"""
+
+    def __init__(self, codes, values):
+        self.codes = codes
+        self.labels = list(codes)
+        self.expected = np.zeros(len(codes), dtype=np.int64)
+        for value, count in Counter(values).items():
+            if value in codes:
+                self.expected[codes[value]] += count
+        self.counts = np.zeros(len(codes), dtype=np.int64)
+        self.unknown = 0
+        self.unknown_labels = Counter()
+
+    def update(self, value):
+        code = self.codes.get(value)
+        if code is not None:
+            self.counts[code] += 1
+            return True
+        self.unknown += 1
+        if value in self.unknown_labels or len(self.unknown_labels) < MAX_UNKNOWN_LABELS:
+            self.unknown_labels[value] += 1
+        return False
+
+    def state(self):
+        return {"counts": self.counts.tolist(), "unknown": self.unknown,
+                "unknown_labels": dict(self.unknown_labels)}
+
+    def merge(self, state):
+        self.counts += np.asarray(state["counts"], dtype=np.int64)
+        self.unknown += state["unknown"]
+        for value, count in state["unknown_labels"].items():
+            if value in self.unknown_labels or len(self.unknown_labels) < MAX_UNKNOWN_LABELS:
+                self.unknown_labels[value] += count
+
+    def report(self):
+        n = int(self.counts.sum()) + self.unknown
+        expected = self.expected / max(self.expected.sum(), 1)
+        top = np.argsort(-self.counts, kind='stable')[:TOP_VALUES]
+        drift = psi(self.expected, self.counts) if n >= MIN_DRIFT_SAMPLES else None
+        return {
+            "count": n,
+            "unknown_rate": round(self.unknown / n, 4) if n else 0.0,
+            "unknown_labels": [{"value": str(v), "count": c} for v, c in self.unknown_labels.most_common(TOP_VALUES)],
+            "top": [{"value": self.labels[i], "count": int(self.counts[i]),
+                     "share": round(self.counts[i] / n, 4), "training_share": round(float(expected[i]), 4)}
+                    for i in top if self.counts[i]],
+            "psi": round(drift, 4) if drift is not None else None,
+            "status": psi_status(drift)
+        }
+
+
+class DriftStats:
+    """Online input and predicted-class distributions against the training data"""
+
+    def __init__(self, df, category_codes, classes):
+        self.classes = [str(c) for c in classes]
+        self.categorical = {name: _Categorical(category_codes[name], df[column].astype(str).tolist())
+                            for name, column in CATEGORICAL_INPUTS.items()}
+        self.numeric = {name: _Numeric(df[column]) for name, column in NUMERIC_INPUTS.items()}
+        # The model sees remapped years, so their distribution is tracked too
+        self.numeric['model_year'] = _Numeric(df['Year_of_Release'])
+        training = np.bincount(success_codes(df['Global_Sales']), minlength=len(SUCCESS_CATEGORIES))
+        self.class_expected = np.array([training[SUCCESS_CATEGORIES.index(c)] if c in SUCCESS_CATEGORIES else 0
+                                        for c in self.classes])
+        self.class_index = {c: i for i, c in enumerate(self.classes)}
+        self.class_counts = np.zeros(len(self.classes), dtype=np.int64)
+        self.confidence_sum = 0.0
+        self.n = 0
+        self.with_unknown = 0
+        self.year_remapped = 0
+
+    def update(self, game, model_year, prediction, confidence):
+        """Add one prediction; returns the inputs whose labels were unknown"""
+        self.n += 1
+        unknown = [name for name, stats in self.categorical.items() if not stats.update(game.get(name))]
+        if unknown:
+            self.with_unknown += 1
+        for name in NUMERIC_INPUTS:
+            self.numeric[name].update(float(game[name]))
+        self.numeric['model_year'].update(model_year)
+        if model_year != game['year']:
+            self.year_remapped += 1
+        self.class_counts[self.class_index[prediction]] += 1
+        self.confidence_sum += confidence
+        return unknown
+
+    def state(self):
+        """Running counters as JSON-compatible data, for merging across workers"""
+        return {
+            "n": self.n, "with_unknown": self.with_unknown, "year_remapped": self.year_remapped,
+            "confidence_sum": self.confidence_sum, "class_counts": self.class_counts.tolist(),
+            "categorical": {name: stats.state() for name, stats in self.categorical.items()},
+            "numeric": {name: stats.state() for name, stats in self.numeric.items()}
+        }
+
+    def merge(self, state):
+        """Add the counters of another worker's state()"""
+        self.n += state["n"]
+        self.with_unknown += state["with_unknown"]
+        self.year_remapped += state["year_remapped"]
+        self.confidence_sum += state["confidence_sum"]
+        self.class_counts += np.asarray(state["class_counts"], dtype=np.int64)
+        for name, stats in self.categorical.items():
+            stats.merge(state["categorical"][name])
+        for name, stats in self.numeric.items():
+            stats.merge(state["numeric"][name])
+
+    def report(self):
+        n = self.n
+        class_drift = psi(self.class_expected, self.class_counts) if n >= MIN_DRIFT_SAMPLES else None
+        training = self.class_expected / max(self.class_expected.sum(), 1)
+        inputs = {name: stats.report() for name, stats in self.categorical.items()}
+        inputs.update({name: stats.report() for name, stats in self.numeric.items()})
+        statuses = {"classes": psi_status(class_drift), **{name: r["status"] for name, r in inputs.items()}}
+        return {
+            "predictions": n,
+            "unknown_category_rate": round(self.with_unknown / n, 4) if n else 0.0,
+            "year_remapped_rate": round(self.year_remapped / n, 4) if n else 0.0,
+            "classes": {
+                "counts": dict(zip(self.classes, self.class_counts.tolist())),
+                "share": {c: round(self.class_counts[i] / n, 4) if n else 0.0 for i, c in enumerate(self.classes)},
+                "training_share": {c: round(float(training[i]), 4) for i, c in enumerate(self.classes)},
+                "mean_confidence": round(self.confidence_sum / n, 4) if n else None,
+                "psi": round(class_drift, 4) if class_drift is not None else None,
+                "status": psi_status(class_drift)
+            },
+            "inputs": inputs,
+            "drifting": sorted(name for name, status in statuses.items() if status == 'significant')
+        }
+
+
+class PredictionAudit:
+    """Rotating NDJSON log of predictions written off the request thread.
+
+    record() only appends to a deque; the writer thread started on first use
+    (and again after a fork) drains it every FLUSH_SECONDS. Each process
+    writes its own predictions-<pid>.ndjson, rotated past max_bytes into
+    .1 ... .<backups>, and after each flush replaces its running statistics in
+    drift-<parent pid>-<pid>.json for report() in the other workers.
+    """
+
+    def __init__(self, log_dir, stats, max_bytes=16 * 1024 * 1024, backups=5):
+        self.log_dir = log_dir
+        self.stats = stats
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._pid = None
+        self._file = None
+        self._size = 0
+        self.logged = 0
+        self.dropped = 0
+        self.write_errors = 0
+        self.started = time.time()
+
+    @property
+    def path(self):
+        return os.path.join(self.log_dir, f'predictions-{os.getpid()}.ndjson')
+
+    @property
+    def stats_path(self):
+        # Workers of one server share the parent pid; earlier runs' files are ignored
+        return os.path.join(self.log_dir, f'drift-{os.getppid()}-{os.getpid()}.json')
+
+    def record(self, route, games, features, predictions, probabilities):
+        """Queue served predictions (parallel sequences) for logging"""
+        if self._pid != os.getpid():
+            self._start()
+        if len(self._queue) >= MAX_PENDING:
+            self.dropped += len(games)
+            return
+        self._queue.append((time.time(), route, games, features, predictions, probabilities))
+
+    def _start(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # A forked worker logs to its own file from its own thread
+            self._pid = os.getpid()
+            self._file = None
+            self._queue.clear()
+            threading.Thread(target=self._run, name='prediction-audit', daemon=True).start()
+
+    def _run(self):
+        while True:
+            time.sleep(FLUSH_SECONDS)
+            try:
+                self.drain()
+            except Exception:
+                self.write_errors += 1
+
+    def drain(self):
+        """Log and count everything queued so far"""
+        with self._lock:
+            lines = []
+            while self._queue:
+                ts, route, games, features, predictions, probabilities = self._queue.popleft()
+                for game, row, prediction, probs in zip(games, features, predictions, probabilities):
+                    model_year = int(row[MODEL_YEAR_COLUMN])
+                    confidence = float(max(probs))
+                    unknown = self.stats.update(game, model_year, str(prediction), confidence)
+                    entry = {
+                        "ts": round(ts, 6),
+                        "route": route,
+                        "input": game,
+                        "prediction": str(prediction),
+                        "probabilities": dict(zip(self.stats.classes, np.round(probs, 4).tolist())),
+                        "confidence": round(confidence, 4)
+                    }
+                    if unknown:
+                        entry["unknown"] = unknown
+                    if model_year != game['year']:
+                        entry["model_year"] = model_year
+                    lines.append(json.dumps(entry))
+            if lines:
+                self._write(''.join(line + '\n' for line in lines).encode())
+                self.logged += len(lines)
+                self._write_stats()
+
+    def _write(self, payload):
+        try:
+            if self._file is None:
+                ensure_private_dir(self.log_dir)
+                self._file = open(self.path, 'ab')
+                self._size = self._file.tell()
+            if self._size and self._size + len(payload) > self.max_bytes:
+                self._rotate()
+            self._file.write(payload)
+            self._file.flush()
+            self._size += len(payload)
+        except OSError:
+            self.write_errors += 1
+            self._file = None
+
+    def _write_stats(self):
+        state = {"pid": os.getpid(), "logged": self.logged, "dropped": self.dropped,
+                 "write_errors": self.write_errors, "stats": self.stats.state()}
+        path = self.stats_path
+        try:
+            with open(f'{path}.tmp', 'w') as f:
+                json.dump(state, f)
+            os.replace(f'{path}.tmp', path)
+        except OSError:
+            self.write_errors += 1
+
+    def _peer_states(self):
+        """Last flushed state of every other worker of this server"""
+        states = []
+        own = self.stats_path
+        for path in glob.glob(os.path.join(self.log_dir, f'drift-{os.getppid()}-*.json')):
+            if path == own:
+                continue
+            try:
+                with open(path) as f:
+                    states.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return states
+
+    def _rotate(self):
+        self._file.close()
+        path = self.path
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f'{path}.{i}'):
+                os.replace(f'{path}.{i}', f'{path}.{i + 1}')
+        if self.backups:
+            os.replace(path, f'{path}.1')
+        else:
+            os.remove(path)
+        self._file = open(path, 'ab')
+        self._size = 0
+
+    def report(self):
+        """Drift statistics of all workers: this process's, including predictions
+        still queued, plus the others' as of their last flush"""
+        self.drain()
+        with self._lock:
+            stats = copy.deepcopy(self.stats)
+            logged, dropped, write_errors = self.logged, self.dropped, self.write_errors
+        workers = [os.getpid()]
+        for state in self._peer_states():
+            merged = copy.deepcopy(stats)
+            try:
+                merged.merge(state["stats"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            stats = merged
+            workers.append(state["pid"])
+            logged += state["logged"]
+            dropped += state["dropped"]
+            write_errors += state["write_errors"]
+        return {
+            "worker_pid": os.getpid(),
+            "workers": sorted(workers),
+            "since": round(self.started, 3),
+            "log": {"dir": self.log_dir, "logged": logged, "dropped": dropped,
+                    "write_errors": write_errors, "max_bytes": self.max_bytes,
+                    "backups": self.backups},
+            **stats.report()
+        }
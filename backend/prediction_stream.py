@@ -0,0 +1,190 @@
+"""
+🎮 DSS Video Games - Prediction Stream
+Live prediction sessions for slider exploration. A session keeps the encoded
+platform/genre/publisher context of one client and a single pending update:
+a newer score/year update replaces one not yet evaluated, so a fast slider
+drag costs one forest pass per pushed result rather than one per tick.
+
+Sessions live in the worker serving the event stream. Updates that reach a
+different gunicorn worker are relayed to the owner over a Unix datagram
+socket (one per worker, in the relay directory); without Unix sockets
+(Windows) only same-process updates are delivered.
+"""
+
+import atexit
+import json
+import os
+import secrets
+import socket
+import threading
+import time
+
+from state_dir import ensure_private_dir
+
+# Seconds between keep-alive comments on an idle stream
+HEARTBEAT_SECONDS = 15
+# Streams without updates for this long are closed
+IDLE_SECONDS = 300
+# Largest relayed update datagram
+MAX_DATAGRAM = 4096
+
+RELAY_SUPPORTED = hasattr(socket, 'AF_UNIX')
+
+
+class StreamSession:
+    """One client's categorical context plus its latest unevaluated update"""
+
+    def __init__(self, session_id, context, labels):
+        self.id = session_id
+        self.context = context
+        self.labels = labels
+        self.received = 0
+        self.evaluated = 0
+        self.superseded = 0
+        self.closed = False
+        self.last_update = time.monotonic()
+        self._pending = None
+        self._cond = threading.Condition()
+
+    def push(self, update):
+        """Make update the next one evaluated; an unevaluated earlier update is dropped"""
+        with self._cond:
+            if self._pending is not None:
+                self.superseded += 1
+            self._pending = update
+            self.received += 1
+            self.last_update = time.monotonic()
+            self._cond.notify()
+
+    def next_update(self, timeout):
+        """The latest pending update, or None after timeout or once closed"""
+        with self._cond:
+            if self._pending is None and not self.closed:
+                self._cond.wait(timeout)
+            update, self._pending = self._pending, None
+            if update is not None:
+                self.evaluated += 1
+            return update
+
+    def idle(self):
+        return time.monotonic() - self.last_update > IDLE_SECONDS
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify()
+
+
+class StreamHub:
+    """Open sessions of this worker, capped at max_sessions, with the cross-worker relay"""
+
+    def __init__(self, relay_dir, max_sessions=4):
+        self.relay_dir = relay_dir
+        self.max_sessions = max_sessions
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._pid = None
+        self._sender = None
+        self.opened = 0
+        self.rejected = 0
+        # Update counts of closed sessions
+        self._closed_counts = {"received": 0, "evaluated": 0, "superseded": 0}
+        self.relayed_in = 0
+        self.relayed_out = 0
+
+    def _socket_path(self, pid):
+        return os.path.join(self.relay_dir, f'stream-{pid}.sock')
+
+    def _ensure_relay(self):
+        """Bind this worker's relay socket (again after a fork)"""
+        if self._pid == os.getpid() or not (RELAY_SUPPORTED and self.relay_dir):
+            return
+        self._pid = os.getpid()
+        self._sessions.clear()
+        self._sender = None
+        path = self._socket_path(self._pid)
+        try:
+            ensure_private_dir(self.relay_dir)
+            self._remove_socket(path)
+            receiver = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            receiver.bind(path)
+        except OSError as e:
+            print(f"⚠️ Prediction stream relay disabled: {e}")
+            return
+        atexit.register(self._remove_socket, path)
+        threading.Thread(target=self._receive, args=(receiver,), name='stream-relay', daemon=True).start()
+
+    @staticmethod
+    def _remove_socket(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _receive(self, receiver):
+        while True:
+            try:
+                message = json.loads(receiver.recv(MAX_DATAGRAM))
+                session = self._sessions.get(message["session"])
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+            if session is not None:
+                self.relayed_in += 1
+                session.push(message["update"])
+
+    def open(self, context, labels):
+        """New session, or None when this worker already serves max_sessions streams"""
+        with self._lock:
+            self._ensure_relay()
+            if len(self._sessions) >= self.max_sessions:
+                self.rejected += 1
+                return None
+            # The owning worker's pid prefixes the id so other workers can relay to it
+            session = StreamSession(f'{os.getpid()}-{secrets.token_urlsafe(12)}', context, labels)
+            self._sessions[session.id] = session
+            self.opened += 1
+            return session
+
+    def close(self, session):
+        session.close()
+        with self._lock:
+            if self._sessions.pop(session.id, None) is not None:
+                for key in self._closed_counts:
+                    self._closed_counts[key] += getattr(session, key)
+
+    def push(self, session_id, update):
+        """Deliver an update to its session here or in its worker; False if it is unknown"""
+        session = self._sessions.get(session_id)
+        if session is not None:
+            session.push(update)
+            return True
+        pid = session_id.split('-', 1)[0]
+        if not (RELAY_SUPPORTED and self.relay_dir and pid.isdigit()) or int(pid) == os.getpid():
+            return False
+        payload = json.dumps({"session": session_id, "update": update}).encode()
+        if len(payload) > MAX_DATAGRAM:
+            return False
+        try:
+            if self._sender is None:
+                self._sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            self._sender.sendto(payload, self._socket_path(pid))
+        except OSError:
+            return False
+        self.relayed_out += 1
+        return True
+
+    def metrics(self):
+        with self._lock:
+            sessions = list(self._sessions.values())
+            counts = {key: total + sum(getattr(s, key) for s in sessions)
+                      for key, total in self._closed_counts.items()}
+        return {
+            "open": len(sessions),
+            "max_sessions": self.max_sessions,
+            "opened": self.opened,
+            "rejected": self.rejected,
+            **counts,
+            "relayed_in": self.relayed_in,
+            "relayed_out": self.relayed_out,
+            "relay": bool(RELAY_SUPPORTED and self.relay_dir)
+        }
@@ -0,0 +1,233 @@
+"""
+🎮 DSS Video Games - Streaming Preprocessing
+Cleans the raw Video_Games.csv chunk by chunk across worker processes and
+accumulates the aggregates behind chart_data.json and metadata.json, so peak
+memory depends on the chunk size rather than the input size.
+"""
+
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+SELECTED_COLUMNS = ['Name', 'Platform', 'Year_of_Release', 'Genre', 'Publisher',
+                    'NA_Sales', 'EU_Sales', 'JP_Sales', 'Other_Sales', 'Global_Sales',
+                    'Critic_Score', 'User_Score']
+REGION_COLUMNS = ['NA_Sales', 'EU_Sales', 'JP_Sales', 'Other_Sales']
+NUMERIC_COLUMNS = REGION_COLUMNS + ['Global_Sales', 'Critic_Score', 'User_Score']
+GROUP_COLUMNS = ['Genre', 'Platform', 'Publisher', 'Year_of_Release']
+TOP_GAME_COLUMNS = ['Name', 'Platform', 'Genre', 'Publisher', 'Year_of_Release', 'Global_Sales',
+                    'NA_Sales', 'EU_Sales', 'JP_Sales', 'Critic_Score', 'User_Score']
+
+# Fixed dtypes so every chunk parses (and re-serializes) the same way
+RAW_DTYPES = {
+    'Name': object, 'Platform': object, 'Genre': object, 'Publisher': object,
+    'Year_of_Release': float, 'NA_Sales': float, 'EU_Sales': float, 'JP_Sales': float,
+    'Other_Sales': float, 'Global_Sales': float, 'Critic_Score': float, 'User_Score': object
+}
+
+SUCCESS_THRESHOLDS = [1, 2, 5]
+SUCCESS_CATEGORIES = ['Low', 'Moderate', 'Hit', 'Blockbuster']
+TOP_GAMES = 100
+TOP_PUBLISHERS = 15
+# Float sums change in the last bits with the chunk size, so the stats written
+# to clean_data_stats.json are rounded to this many decimals
+STATS_DECIMALS = 6
+
+
+def correlation_from_moments(count, sums, cross):
+    """Pearson correlation from a row count, per-column sums and cross-product sums.
+
+    Like DataFrame.corr(), columns without variance (and fewer than two rows) give NaN.
+    """
+    if count < 2:
+        return np.full(np.shape(cross), np.nan)
+    mean = sums / count
+    cov = cross / count - np.outer(mean, mean)
+    var = np.diag(cov).copy()
+    # Variance at rounding-noise level means the column is constant
+    var[var <= 1e-12 * np.diag(cross) / count] = np.nan
+    std = np.sqrt(var)
+    return cov / np.outer(std, std)
+
+
+def rounded(value, decimals=STATS_DECIMALS):
+    """value with every float in nested dicts and lists rounded"""
+    if isinstance(value, float):
+        return round(value, decimals)
+    if isinstance(value, dict):
+        return {k: rounded(v, decimals) for k, v in value.items()}
+    if isinstance(value, list):
+        return [rounded(v, decimals) for v in value]
+    return value
+
+
+def clean_chunk(df, min_year, zombie_platforms):
+    """notebook/data_preprocessing.ipynb rules applied to one chunk"""
+    df = df.copy()
+    df['User_Score'] = pd.to_numeric(df['User_Score'].replace('tbd', np.nan), errors='coerce')
+    df['Year_of_Release'] = pd.to_numeric(df['Year_of_Release'], errors='coerce')
+    df = df.dropna(subset=['Year_of_Release'])
+    df['Year_of_Release'] = df['Year_of_Release'].astype(int)
+    df = df[SELECTED_COLUMNS].dropna()
+    df = df[df['Year_of_Release'] >= min_year]
+    return df[~df['Platform'].isin(zombie_platforms)]
+
+
+class CleanAggregates:
+    """Mergeable sufficient statistics of the cleaned games"""
+
+    def __init__(self):
+        self.count = 0
+        self.sums = np.zeros(len(NUMERIC_COLUMNS))
+        self.cross = np.zeros((len(NUMERIC_COLUMNS), len(NUMERIC_COLUMNS)))
+        # value -> [count, Global_Sales, Critic_Score, User_Score] sums
+        self.groups = {column: {} for column in GROUP_COLUMNS}
+        self.success = Counter()
+        self.blockbuster_genre = Counter()
+        self.blockbuster_platform = Counter()
+        self.blockbuster_scores = np.zeros(2)
+        self.top_games = pd.DataFrame(columns=TOP_GAME_COLUMNS)
+
+    def update(self, df):
+        if not len(df):
+            return self
+        values = df[NUMERIC_COLUMNS].to_numpy(dtype=float)
+        self.count += len(df)
+        self.sums += values.sum(axis=0)
+        self.cross += values.T @ values
+
+        group_values = df[['Global_Sales', 'Critic_Score', 'User_Score']].to_numpy(dtype=float)
+        for column in GROUP_COLUMNS:
+            codes, uniques = pd.factorize(df[column].to_numpy())
+            sums = np.column_stack([np.bincount(codes, minlength=len(uniques))] +
+                                   [np.bincount(codes, weights=group_values[:, j], minlength=len(uniques))
+                                    for j in range(group_values.shape[1])])
+            self._merge_groups(column, dict(zip(uniques.tolist(), sums.tolist())))
+
+        categories = np.digitize(df['Global_Sales'].to_numpy(dtype=float), SUCCESS_THRESHOLDS)
+        self.success.update(SUCCESS_CATEGORIES[c] for c in categories)
+        blockbusters = df[categories == SUCCESS_CATEGORIES.index('Blockbuster')]
+        self.blockbuster_genre.update(blockbusters['Genre'])
+        self.blockbuster_platform.update(blockbusters['Platform'])
+        self.blockbuster_scores += blockbusters[['Critic_Score', 'User_Score']].to_numpy(dtype=float).sum(axis=0)
+
+        self._merge_top(df[TOP_GAME_COLUMNS])
+        return self
+
+    def _merge_groups(self, column, delta):
+        groups = self.groups[column]
+        for key, sums in delta.items():
+            old = groups.get(key)
+            groups[key] = sums if old is None else [a + b for a, b in zip(old, sums)]
+
+    def _merge_top(self, games):
+        # Earlier rows come first, so nlargest keeps the same ties as a full-frame pass
+        frames = [f for f in (self.top_games, games) if len(f)]
+        self.top_games = pd.concat(frames).nlargest(TOP_GAMES, 'Global_Sales') if frames else self.top_games
+
+    def merge(self, other):
+        """Fold in the aggregates of a later chunk"""
+        self.count += other.count
+        self.sums += other.sums
+        self.cross += other.cross
+        for column in GROUP_COLUMNS:
+            self._merge_groups(column, other.groups[column])
+        self.success.update(other.success)
+        self.blockbuster_genre.update(other.blockbuster_genre)
+        self.blockbuster_platform.update(other.blockbuster_platform)
+        self.blockbuster_scores += other.blockbuster_scores
+        self._merge_top(other.top_games)
+        return self
+
+    def correlation(self):
+        """Pearson correlation of NUMERIC_COLUMNS from counts, sums and cross products"""
+        return correlation_from_moments(self.count, self.sums, self.cross)
+
+    def _group_sum(self, column, field):
+        return {k: v[field] for k, v in sorted(self.groups[column].items())}
+
+    def chart_data(self):
+        """The chart_data.json fields that depend only on the clean dataset"""
+        sales = self._group_sum('Publisher', 1)
+        corr = self.correlation()
+        genre = self.groups['Genre']
+        return {
+            "genre_sales": self._group_sum('Genre', 1),
+            "platform_sales": self._group_sum('Platform', 1),
+            "publisher_sales": dict(sorted(sales.items(), key=lambda kv: -kv[1])[:TOP_PUBLISHERS]),
+            "yearly_sales": {int(k): v for k, v in self._group_sum('Year_of_Release', 1).items()},
+            "regional_sales": {c: float(self.sums[NUMERIC_COLUMNS.index(c)]) for c in REGION_COLUMNS},
+            "success_distribution": dict(self.success.most_common()),
+            "genre_avg_scores": {
+                "Critic_Score": {k: v[2] / v[0] for k, v in sorted(genre.items())},
+                "User_Score": {k: v[3] / v[0] for k, v in sorted(genre.items())}
+            },
+            "correlation_matrix": {
+                a: {b: float(corr[j, i]) for j, b in enumerate(NUMERIC_COLUMNS)}
+                for i, a in enumerate(NUMERIC_COLUMNS)
+            }
+        }
+
+    def metadata(self):
+        """The metadata.json fields that depend only on the clean dataset"""
+        years = list(self.groups['Year_of_Release'])
+        n_blockbusters = self.success['Blockbuster']
+        critic, user = self.blockbuster_scores / n_blockbusters if n_blockbusters else (float('nan'),) * 2
+        return {
+            "total_games": self.count,
+            "year_range": [int(min(years)), int(max(years))],
+            "avg_critic_score": float(self.sums[NUMERIC_COLUMNS.index('Critic_Score')] / self.count),
+            "avg_user_score": float(self.sums[NUMERIC_COLUMNS.index('User_Score')] / self.count),
+            "total_sales": float(self.sums[NUMERIC_COLUMNS.index('Global_Sales')]),
+            "best_genre": self.blockbuster_genre.most_common(1)[0][0] if n_blockbusters else None,
+            "best_platform": self.blockbuster_platform.most_common(1)[0][0] if n_blockbusters else None,
+            "avg_critic_blockbuster": float(critic),
+            "avg_user_blockbuster": float(user)
+        }
+
+    def top_games_records(self):
+        return self.top_games.to_dict('records')
+
+    def to_json(self):
+        """Rounded aggregates, identical for any chunk size"""
+        return rounded({
+            "chart_data": self.chart_data(),
+            "metadata": self.metadata(),
+            "top_games": self.top_games_records()
+        })
+
+
+def _process_chunk(chunk, min_year, zombie_platforms):
+    """Worker: clean one raw chunk; returns its CSV body and aggregates"""
+    clean = clean_chunk(chunk, min_year, zombie_platforms)
+    return clean.to_csv(index=False, header=False), CleanAggregates().update(clean)
+
+
+def stream_preprocess(raw_path, clean_path, min_year, zombie_platforms, chunk_size=50_000, jobs=None):
+    """Clean raw_path into clean_path in parallel chunks; returns the merged aggregates.
+
+    At most ``2 * jobs`` chunks are in flight, and results are written in input
+    order, so the output matches a single-frame pass.
+    """
+    workers = jobs or 1
+    totals = CleanAggregates()
+    reader = pd.read_csv(raw_path, chunksize=chunk_size, dtype=RAW_DTYPES)
+
+    with open(clean_path, 'w', newline='') as out, ProcessPoolExecutor(max_workers=workers) as pool:
+        out.write(','.join(SELECTED_COLUMNS) + '\n')
+        in_flight = []
+
+        def drain(limit):
+            while len(in_flight) > limit:
+                body, aggregates = in_flight.pop(0).result()
+                out.write(body)
+                totals.merge(aggregates)
+
+        for chunk in reader:
+            in_flight.append(pool.submit(_process_chunk, chunk, min_year, zombie_platforms))
+            drain(2 * workers)
+        drain(0)
+
+    return totals
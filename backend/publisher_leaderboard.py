@@ -0,0 +1,131 @@
+"""
+🎮 DSS Video Games - Publisher Leaderboard
+Per-publisher totals, success-category counts and success rates
+computed with grouped bincount reductions over integer codes
+"""
+
+import copy
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Success categories in code order; thresholds match categorize_success()
+SUCCESS_CATEGORIES = ['Low', 'Moderate', 'Hit', 'Blockbuster']
+SUCCESS_THRESHOLDS = [1, 2, 5]
+SUCCESSFUL = ['Hit', 'Blockbuster']
+
+SORT_KEYS = ('total_sales', 'success_rate', 'game_count', 'avg_sales')
+
+# Memoized query results kept per leaderboard before the cache is reset
+MAX_CACHED_QUERIES = 256
+
+
+def success_codes(global_sales):
+    """Map global sales to success category codes (index into SUCCESS_CATEGORIES)"""
+    return np.digitize(np.asarray(global_sales, dtype=float), SUCCESS_THRESHOLDS)
+
+
+class PublisherLeaderboard:
+    """Publisher statistics precomputed once, with memoized ranked queries"""
+
+    def __init__(self, publishers, global_sales):
+        codes, names = pd.factorize(pd.Series(publishers), sort=True)
+        self.publishers = np.asarray(names)
+        self.publisher_ids = {name: i for i, name in enumerate(self.publishers.tolist())}
+        self.category_counts, self.total_sales = self._sums(codes, global_sales)
+        self._derive()
+
+    def _sums(self, codes, global_sales):
+        """(publisher x category counts, sales per publisher) of the coded games"""
+        sales = np.asarray(global_sales, dtype=float)
+        n_publishers, n_categories = len(self.publishers), len(SUCCESS_CATEGORIES)
+        # One flat bincount gives the publisher x category count matrix
+        flat = codes * n_categories + success_codes(sales)
+        counts = np.bincount(flat, minlength=n_publishers * n_categories).reshape(n_publishers, n_categories)
+        return counts, np.bincount(codes, weights=sales, minlength=n_publishers)
+
+    def _derive(self):
+        self.game_count = self.category_counts.sum(axis=1)
+        self.avg_sales = self.total_sales / self.game_count
+
+        success_idx = [SUCCESS_CATEGORIES.index(c) for c in SUCCESSFUL]
+        self.success_count = self.category_counts[:, success_idx].sum(axis=1)
+        self.success_rate = self.success_count / self.game_count * 100
+        self._results = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, df):
+        return cls(df['Publisher'], df['Global_Sales'])
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def with_rows(self, df):
+        """Leaderboard with df's games added; None if they bring a new publisher"""
+        codes = np.array([self.publisher_ids.get(p, -1) for p in df['Publisher']], dtype=np.int64)
+        if (codes < 0).any():
+            return None
+        counts, sales = self._sums(codes, df['Global_Sales'])
+        board = copy.copy(self)
+        board.category_counts = self.category_counts + counts
+        board.total_sales = self.total_sales + sales
+        board._derive()
+        return board
+
+    def _order(self, sort_by, min_games):
+        if min_games < 1:
+            raise ValueError("min_games must be at least 1")
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f"sort_by must be one of {', '.join(SORT_KEYS)}")
+        eligible = np.flatnonzero(self.game_count >= min_games)
+        values = getattr(self, sort_by)[eligible]
+        # Stable descending sort, ties broken by total sales then name
+        order = np.lexsort((self.publishers[eligible], -self.total_sales[eligible], -values))
+        return eligible[order]
+
+    def top(self, top_n=10, min_games=1, sort_by='total_sales'):
+        """Ranked publisher records, cached per (top_n, min_games, sort_by)"""
+        if top_n < 1:
+            raise ValueError("top_n must be at least 1")
+        key = (top_n, min_games, sort_by)
+        with self._lock:
+            cached = self._results.get(key)
+        if cached is not None:
+            return cached
+
+        records = [
+            {
+                "publisher": str(self.publishers[i]),
+                "game_count": int(self.game_count[i]),
+                "total_sales": round(float(self.total_sales[i]), 2),
+                "avg_sales": round(float(self.avg_sales[i]), 2),
+                "success_count": int(self.success_count[i]),
+                "success_rate": round(float(self.success_rate[i]), 2),
+                "category_counts": dict(zip(SUCCESS_CATEGORIES, self.category_counts[i].tolist()))
+            }
+            for i in self._order(sort_by, min_games)[:top_n]
+        ]
+        with self._lock:
+            if len(self._results) >= MAX_CACHED_QUERIES:
+                self._results.clear()
+            self._results[key] = records
+        return records
+
+    def to_frame(self, top_n=10, min_games=1, sort_by='total_sales'):
+        """Leaderboard as a Publisher-indexed DataFrame"""
+        rows = self._order(sort_by, min_games)
+        if top_n:
+            rows = rows[:top_n]
+        return pd.DataFrame({
+            'Total Sales (M)': self.total_sales[rows].round(2),
+            'Success Rate (%)': self.success_rate[rows].round(2),
+            'Games': self.game_count[rows]
+        }, index=pd.Index(self.publishers[rows], name='Publisher'))
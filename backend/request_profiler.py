@@ -0,0 +1,225 @@
+"""
+🎮 DSS Video Games - Request Profiler
+Opt-in cProfile sampling of API requests: a configurable fraction of requests
+per route is profiled, each profile is written to a local directory, and the
+files of all workers are merged into per-route hotspot tables
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import random
+import re
+import sys
+import time
+
+from state_dir import ensure_private_dir
+
+# Runtime settings shared by all workers through the profile directory
+CONFIG_FILE = 'config.json'
+# Seconds between checks of the config file for changes made by other workers
+CONFIG_CHECK_SECONDS = 1.0
+# Profiles kept per route; older files are deleted
+MAX_PROFILES_PER_ROUTE = 50
+TOP_N = 20
+SORT_KEYS = {'tottime': 2, 'cumtime': 3}
+
+
+def parse_route_rates(value):
+    """'/api/predict=0.5,/api/games=0.1' -> {'/api/predict': 0.5, '/api/games': 0.1}"""
+    rates = {}
+    for item in (value or '').split(','):
+        if '=' in item:
+            route, rate = item.rsplit('=', 1)
+            rates[route.strip()] = float(rate)
+    return rates
+
+
+def _check_rate(rate):
+    rate = float(rate)
+    if not 0 <= rate <= 1:
+        raise ValueError("Sampling rates must be between 0 and 1")
+    return rate
+
+
+def _route_dir_name(route):
+    return re.sub(r'[^A-Za-z0-9]+', '_', route).strip('_') or 'root'
+
+
+def _function_name(key):
+    """(file, line, name) -> 'pandas/core/frame.py:1234(sort_values)'"""
+    filename, line, name = key
+    if not line:
+        return name
+    # Shortest form relative to an import root, e.g. site-packages or backend/
+    roots = [p for p in sys.path if p and filename.startswith(os.path.join(p, ''))]
+    if roots:
+        filename = os.path.relpath(filename, max(roots, key=len))
+    return f"{filename}:{line}({name})"
+
+
+class RequestProfiler:
+    """Decides which requests to profile and stores their profiles.
+
+    Disabled (every rate 0) the per-request cost is one time check; the
+    config file is re-read at most every CONFIG_CHECK_SECONDS.
+    """
+
+    def __init__(self, profile_dir, sample_rate=0.0, route_rates=None):
+        self.profile_dir = profile_dir
+        self._config_path = os.path.join(profile_dir, CONFIG_FILE)
+        self._defaults = {"sample_rate": _check_rate(sample_rate),
+                          "routes": {r: _check_rate(v) for r, v in (route_rates or {}).items()}}
+        self._config = self._defaults
+        self._config_mtime = None
+        self._next_check = 0.0
+        self.enabled = self._is_enabled(self._config)
+
+    @staticmethod
+    def _is_enabled(config):
+        return config["sample_rate"] > 0 or any(rate > 0 for rate in config["routes"].values())
+
+    def _reload(self):
+        try:
+            mtime = os.path.getmtime(self._config_path)
+        except OSError:
+            mtime = None
+        if mtime != self._config_mtime:
+            config = self._defaults
+            if mtime is not None:
+                try:
+                    with open(self._config_path) as f:
+                        config = json.load(f)
+                except (OSError, ValueError):
+                    return
+            self._config, self._config_mtime = config, mtime
+            self.enabled = self._is_enabled(config)
+
+    def active(self):
+        """Whether any route is sampled; picks up other workers' config changes"""
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._next_check = now + CONFIG_CHECK_SECONDS
+            self._reload()
+        return self.enabled
+
+    def config(self):
+        return {"enabled": self.enabled, "profile_dir": self.profile_dir, **self._config}
+
+    def configure(self, sample_rate=None, routes=None):
+        """Change the sampling rates for every worker; returns the new config"""
+        config = {
+            "sample_rate": self._config["sample_rate"] if sample_rate is None else _check_rate(sample_rate),
+            "routes": dict(self._config["routes"]) if routes is None else
+            {str(r): _check_rate(v) for r, v in routes.items()}
+        }
+        ensure_private_dir(self.profile_dir)
+        tmp_path = f'{self._config_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(config, f)
+        os.replace(tmp_path, self._config_path)
+        self._next_check = 0.0
+        self._reload()
+        return self.config()
+
+    def should_sample(self, route):
+        rate = self._config["routes"].get(route, self._config["sample_rate"])
+        return rate > 0 and random.random() < rate
+
+    def start(self):
+        """Start a profile for the current thread; None if profiling is unavailable"""
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:  # Python 3.12+: another request holds the global profiler
+            return None
+        return profile
+
+    def finish(self, route, profile, started):
+        """Stop the profile and write it, with its wall time, under the route's directory"""
+        profile.disable()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        route_dir = os.path.join(self.profile_dir, _route_dir_name(route))
+        ensure_private_dir(self.profile_dir)
+        os.makedirs(route_dir, exist_ok=True)
+        path = os.path.join(route_dir, f"{time.time():.6f}-{os.getpid()}-{elapsed_ms:.3f}ms.prof")
+        # Written aside and renamed, so readers never see a partial profile
+        profile.dump_stats(path + '.tmp')
+        os.replace(path + '.tmp', path)
+        route_file = os.path.join(route_dir, 'route')
+        if not os.path.exists(route_file):
+            with open(route_file, 'w') as f:
+                f.write(route)
+        self._prune(route_dir)
+
+    def _prune(self, route_dir):
+        files = sorted(f for f in os.listdir(route_dir) if f.endswith('.prof'))
+        for name in files[:-MAX_PROFILES_PER_ROUTE]:
+            try:
+                os.remove(os.path.join(route_dir, name))
+            except OSError:
+                pass
+
+    def _route_profiles(self):
+        """{route: [profile paths]} for every profiled route on disk"""
+        routes = {}
+        if not os.path.isdir(self.profile_dir):
+            return routes
+        for entry in os.scandir(self.profile_dir):
+            if not entry.is_dir():
+                continue
+            try:
+                with open(os.path.join(entry.path, 'route')) as f:
+                    route = f.read()
+            except OSError:
+                continue
+            files = sorted(f for f in os.listdir(entry.path) if f.endswith('.prof'))
+            if files:
+                routes[route] = [os.path.join(entry.path, f) for f in files]
+        return routes
+
+    def hotspots(self, route=None, top_n=TOP_N, sort_by='tottime'):
+        """Per-route top_n functions by self or cumulative time, averaged per profiled request"""
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f"sort_by must be one of {', '.join(SORT_KEYS)}")
+        report = {}
+        for name, paths in sorted(self._route_profiles().items()):
+            if route and name != route:
+                continue
+            stats = pstats.Stats()
+            wall_ms = []
+            for path in paths:
+                try:
+                    stats.add(path)
+                except (OSError, EOFError, ValueError, TypeError):
+                    continue  # Being written or pruned by another worker
+                wall_ms.append(float(os.path.basename(path).rsplit('-', 1)[1][:-len('ms.prof')]))
+            if not wall_ms:
+                continue
+            n = len(wall_ms)
+            rows = sorted(stats.stats.items(), key=lambda kv: -kv[1][SORT_KEYS[sort_by]])[:top_n]
+            report[name] = {
+                "samples": n,
+                "mean_ms": round(sum(wall_ms) / n, 3),
+                "max_ms": round(max(wall_ms), 3),
+                "hotspots": [
+                    {
+                        "function": _function_name(key),
+                        "calls": round(nc / n, 2),
+                        "tottime_ms": round(tt * 1000 / n, 3),
+                        "cumtime_ms": round(ct * 1000 / n, 3)
+                    }
+                    for key, (cc, nc, tt, ct, callers) in rows
+                ]
+            }
+        return report
+
+    def reset(self):
+        """Delete every stored profile (the sampling config is kept)"""
+        for paths in self._route_profiles().values():
+            for path in paths:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
@@ -0,0 +1,71 @@
+"""
+🎮 DSS Video Games - Result Cache
+LRU store of serialized query responses under a memory budget, keyed on the
+normalized query and the data version, with an ETag per key so clients that
+already hold a response get a 304.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def query_etag(key):
+    """Strong ETag for a cache key; equal keys always serialize to equal bytes"""
+    return hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+
+
+class ResultCache:
+    """LRU of (body, status, mimetype) responses, evicted past max_bytes of bodies"""
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._responses = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            response = self._responses.get(key)
+            if response is None:
+                self.misses += 1
+            else:
+                self._responses.move_to_end(key)
+                self.hits += 1
+            return response
+
+    def put(self, key, response):
+        size = len(response[0])
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._responses:
+                return
+            self._responses[key] = response
+            self.bytes_used += size
+            while self.bytes_used > self.max_bytes:
+                _, evicted = self._responses.popitem(last=False)
+                self.bytes_used -= len(evicted[0])
+                self.evictions += 1
+
+    def count_not_modified(self):
+        with self._lock:
+            self.not_modified += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._responses),
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "bytes": self.bytes_used,
+                "max_bytes": self.max_bytes
+            }
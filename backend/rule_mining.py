@@ -0,0 +1,302 @@
+"""
+🎮 DSS Video Games - Association Rule Mining
+Apriori frequent itemsets and association rules over one-hot game attributes
+(same semantics as mlxtend's apriori + association_rules), with item columns
+packed into bitsets so supports are AND + popcount
+"""
+
+import os
+import threading
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+# Transaction attributes of notebook/association_rules.ipynb
+RULE_COLUMNS = ['Platform', 'Genre', 'Score_Category', 'Cluster_Label']
+SCORE_BINS = [0, 69, 85, 100]
+SCORE_LABELS = ['Score_Low', 'Score_Mid', 'Score_High']
+
+# Default consequents: the Hit and Blockbuster market segments
+SUCCESS_TARGETS = ('Cluster_Label_High Sales / Hit', 'Cluster_Label_Massive / Blockbuster')
+
+# Mined results kept per miner before the cache is reset
+MAX_CACHED_QUERIES = 128
+
+# Set bits per byte value
+POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.int64)
+
+
+def one_hot_items(df, columns):
+    """One-hot encode categorical columns into a boolean item matrix.
+
+    Item names follow pd.get_dummies: ``<column>_<value>``.
+    """
+    dummies = pd.get_dummies(df[columns].astype(str).where(df[columns].notna()))
+    return dummies.to_numpy(dtype=bool), list(dummies.columns)
+
+
+def success_transactions(df):
+    """One-hot RULE_COLUMNS items of games carrying Cluster_Label"""
+    df = df.assign(Score_Category=pd.cut(df['Critic_Score'], bins=SCORE_BINS, labels=SCORE_LABELS))
+    return one_hot_items(df, RULE_COLUMNS)
+
+
+def pack_items(matrix):
+    """Boolean rows x items matrix -> items x bytes bitsets"""
+    return np.packbits(np.asarray(matrix, dtype=bool).T, axis=1)
+
+
+def popcount(bitsets):
+    """Set bits per row of a bitset array"""
+    return POPCOUNT[bitsets].sum(axis=-1)
+
+
+def frequent_itemsets(matrix, min_support, max_len=None, bitsets=None):
+    """Level-wise Apriori search over packed item bitsets.
+
+    Returns a dict mapping sorted item-index tuples to their support.
+    """
+    n_rows = matrix.shape[0]
+    if bitsets is None:
+        bitsets = pack_items(matrix)
+    supports = popcount(bitsets) / n_rows
+    frequent = {(i,): float(s) for i, s in enumerate(supports) if s >= min_support}
+    level = {itemset: bitsets[itemset[0]] for itemset in sorted(frequent)}
+    size = 1
+
+    while level and (max_len is None or size < max_len):
+        size += 1
+        keys = list(level)
+        candidates = []
+        # Join itemsets sharing the same (size - 2)-prefix, then prune by subsets
+        for a, b in combinations(keys, 2):
+            if a[:-1] != b[:-1]:
+                continue
+            candidate = a + (b[-1],) if a[-1] < b[-1] else b + (a[-1],)
+            if all(sub in level for sub in combinations(candidate, size - 1)):
+                candidates.append((candidate, a))
+        if not candidates:
+            break
+
+        # A candidate's rows are its prefix itemset's rows AND its last item's rows
+        joined = np.stack([level[parent] & bitsets[candidate[-1]] for candidate, parent in candidates])
+        counts = popcount(joined)
+        next_level = {}
+        for (candidate, _), rows, count in zip(candidates, joined, counts):
+            support = count / n_rows
+            if support >= min_support:
+                frequent[candidate] = float(support)
+                next_level[candidate] = rows
+        level = dict(sorted(next_level.items()))
+
+    return frequent
+
+
+def association_rules(itemsets, item_names, min_lift=1.0, min_confidence=0.0):
+    """Generate every antecedent -> consequent split of the frequent itemsets.
+
+    Returns a DataFrame with ``antecedents``/``consequents`` as tuples of item
+    names plus support, confidence and lift, sorted by lift descending.
+    """
+    rows = []
+    for itemset, support in itemsets.items():
+        if len(itemset) < 2:
+            continue
+        for k in range(1, len(itemset)):
+            for antecedent in combinations(itemset, k):
+                consequent = tuple(i for i in itemset if i not in antecedent)
+                confidence = support / itemsets[antecedent]
+                lift = confidence / itemsets[consequent]
+                if lift >= min_lift and confidence >= min_confidence:
+                    rows.append((
+                        tuple(item_names[i] for i in antecedent),
+                        tuple(item_names[i] for i in consequent),
+                        support, confidence, lift
+                    ))
+
+    rules = pd.DataFrame(rows, columns=['antecedents', 'consequents', 'support', 'confidence', 'lift'])
+    return rules.sort_values('lift', ascending=False, kind='mergesort').reset_index(drop=True)
+
+
+def format_items(items):
+    """Render an itemset the way the exported rule CSVs do"""
+    return ", ".join(items)
+
+
+class RuleMiner:
+    """Bitset transaction matrix of the game table, mined on demand.
+
+    Frequent itemsets are cached per ``min_support`` and rule tables per full
+    parameter set, so repeated queries are dictionary lookups.
+    """
+
+    def __init__(self, matrix, item_names):
+        self.item_names = list(item_names)
+        self.item_ids = {name: i for i, name in enumerate(self.item_names)}
+        self.n_rows = matrix.shape[0]
+        self.matrix = matrix
+        self.bitsets = pack_items(matrix)
+        self._itemsets = {}
+        self._rules = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, df):
+        return cls(*success_transactions(df))
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def itemsets(self, min_support, max_len=None):
+        key = (min_support, max_len)
+        if key not in self._itemsets:
+            found = frequent_itemsets(self.matrix, min_support, max_len, bitsets=self.bitsets)
+            with self._lock:
+                if len(self._itemsets) >= MAX_CACHED_QUERIES:
+                    self._itemsets.clear()
+                self._itemsets[key] = found
+        return self._itemsets[key]
+
+    def rules(self, min_support=0.01, min_confidence=0.0, min_lift=1.0, target=SUCCESS_TARGETS, max_len=None):
+        """Rules table for one parameter set; target items filter consequents (None keeps all)"""
+        if not 0 < min_support <= 1:
+            raise ValueError("min_support must be in (0, 1]")
+        if not 0 <= min_confidence <= 1:
+            raise ValueError("min_confidence must be in [0, 1]")
+        if min_lift < 0:
+            raise ValueError("min_lift must be non-negative")
+        targets = tuple(sorted(target)) if target else None
+        if targets:
+            unknown = [t for t in targets if t not in self.item_ids]
+            if unknown:
+                raise ValueError(f"Unknown target item(s): {', '.join(unknown)}")
+
+        key = (min_support, min_confidence, min_lift, targets, max_len)
+        if key not in self._rules:
+            table = association_rules(self.itemsets(min_support, max_len), self.item_names,
+                                      min_lift=min_lift, min_confidence=min_confidence)
+            if targets:
+                wanted = set(targets)
+                matches = np.fromiter((bool(wanted.intersection(c)) for c in table['consequents']), dtype=bool, count=len(table))
+                table = table[matches].reset_index(drop=True)
+            with self._lock:
+                if len(self._rules) >= MAX_CACHED_QUERIES:
+                    self._rules.clear()
+                self._rules[key] = table
+        return self._rules[key]
+
+
+# ==================== RULE MATCHING ====================
+
+# Critic score items of the two exported rule sets (see backend/pipeline.py):
+# rules_dss uses <70 / 70-85 / >=85, rules_success uses pd.cut bins (0,69], (69,85], (85,100]
+DSS_SCORE_ITEMS = [(70, 'Score_Low'), (85, 'Score_Mid'), (float('inf'), 'Score_High')]
+
+# Item prefixes of the attributes a game input fixes; Score_Category_ comes
+# before Score_ since its items start with both
+INPUT_ATTRIBUTES = ('Score_Category_', 'Platform_', 'Genre_', 'Score_')
+
+
+def input_attribute(item):
+    """Prefix of the input attribute an item describes, or None for outcome items"""
+    return next((prefix for prefix in INPUT_ATTRIBUTES if item.startswith(prefix)), None)
+
+
+def game_items(platform, genre, critic_score):
+    """Rule items describing a game input, in both exported rule vocabularies"""
+    if not np.isfinite(critic_score):
+        raise ValueError(f"critic_score must be a finite number (got {critic_score})")
+    items = [f'Platform_{platform}', f'Genre_{genre}']
+    items.append(next(item for bound, item in DSS_SCORE_ITEMS if critic_score < bound))
+    if SCORE_BINS[0] < critic_score <= SCORE_BINS[-1]:
+        label = next(label for bound, label in zip(SCORE_BINS[1:], SCORE_LABELS) if critic_score <= bound)
+        items.append(f'Score_Category_{label}')
+    return items
+
+
+def parse_items(text):
+    """Inverse of format_items"""
+    return tuple(item.strip() for item in str(text).split(', ') if item.strip())
+
+
+class RuleIndex:
+    """Inverted index from antecedent item to rule ids.
+
+    Rule ids are assigned in descending lift order, so the matches of an input
+    come out ranked by sorting their ids. Consequent items on input attributes
+    (platform, genre, score) are kept per rule, so rules whose consequent
+    contradicts the input can be dropped.
+    """
+
+    def __init__(self, rules):
+        rules = rules.sort_values('lift', ascending=False, kind='mergesort').reset_index(drop=True)
+        self.records = [
+            {
+                "source": source,
+                "antecedent": format_items(antecedents),
+                "consequent": format_items(consequents),
+                "support": float(support),
+                "confidence": float(confidence),
+                "lift": float(lift)
+            }
+            for source, antecedents, consequents, support, confidence, lift in rules[
+                ['source', 'antecedents', 'consequents', 'support', 'confidence', 'lift']
+            ].itertuples(index=False)
+        ]
+        self.sizes = [len(a) for a in rules['antecedents']]
+        self.consequent_inputs = [tuple((input_attribute(item), item) for item in consequents
+                                        if input_attribute(item))
+                                  for consequents in rules['consequents']]
+        postings = {}
+        for rule_id, antecedents in enumerate(rules['antecedents']):
+            for item in antecedents:
+                postings.setdefault(item, []).append(rule_id)
+        self.postings = {item: tuple(ids) for item, ids in postings.items()}
+
+    def __len__(self):
+        return len(self.records)
+
+    @classmethod
+    def from_csvs(cls, sources):
+        """Build from exported rule CSVs; sources maps source name -> path"""
+        frames = []
+        for source, path in sources.items():
+            if not os.path.exists(path):
+                continue
+            df = pd.read_csv(path)
+            # rules_success_factors.csv uses the notebook's Indonesian headers
+            df = df.rename(columns={'Sebab (Antecedents)': 'antecedents', 'Akibat (Consequents)': 'consequents'})
+            frames.append(pd.DataFrame({
+                'source': source,
+                'antecedents': df['antecedents'].map(parse_items),
+                'consequents': df['consequents'].map(parse_items),
+                'support': df['support'],
+                'confidence': df['confidence'],
+                'lift': df['lift']
+            }))
+        if not frames:
+            return cls(pd.DataFrame(columns=['source', 'antecedents', 'consequents', 'support', 'confidence', 'lift']))
+        return cls(pd.concat(frames, ignore_index=True))
+
+    def match(self, items, limit=None):
+        """Rules whose antecedents are all among items and whose consequent does not
+        give an attribute of items another value, highest lift first"""
+        items = set(items)
+        fixed = {input_attribute(item) for item in items}
+        hits = {}
+        for item in items:
+            for rule_id in self.postings.get(item, ()):
+                hits[rule_id] = hits.get(rule_id, 0) + 1
+        matched = sorted(
+            rule_id for rule_id, n in hits.items()
+            if n == self.sizes[rule_id] and not any(attribute in fixed and item not in items
+                                                    for attribute, item in self.consequent_inputs[rule_id])
+        )
+        return [self.records[rule_id] for rule_id in matched[:limit]]
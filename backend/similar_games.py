@@ -0,0 +1,138 @@
+"""
+🎮 DSS Video Games - Similar Games
+Nearest-neighbour lookup of games in the standardized clustering feature
+space plus one-hot platform and genre, served from a KD-tree
+"""
+
+import numpy as np
+from sklearn.neighbors import KDTree
+
+# Inputs of models/scaler.joblib (DSS_Video_Games_Analysis.ipynb clustering)
+SCALED_FEATURES = ['Global_Sales', 'Critic_Score', 'User_Score', 'NA_Ratio', 'EU_Ratio', 'JP_Ratio']
+
+# Spec keys accepted for each scaled feature
+SPEC_FIELDS = {
+    'Global_Sales': 'global_sales',
+    'Critic_Score': 'critic_score',
+    'User_Score': 'user_score',
+    'NA_Ratio': 'na_ratio',
+    'EU_Ratio': 'eu_ratio',
+    'JP_Ratio': 'jp_ratio'
+}
+
+# Distance added per mismatched category is 2 * CATEGORY_WEIGHT ** 2
+CATEGORY_WEIGHT = 1.0
+
+RESULT_COLUMNS = ['Name', 'Platform', 'Genre', 'Publisher', 'Year_of_Release',
+                  'Global_Sales', 'Critic_Score', 'User_Score']
+
+MAX_NEIGHBOURS = 100
+
+EMPTY_ROWS = np.empty(0, dtype=np.int64)
+
+
+def sales_ratios(df):
+    """Regional share of global sales, 0 where a game has no recorded sales"""
+    total = df['Global_Sales'].to_numpy(dtype=float)
+    return {
+        f'{region}_Ratio': np.divide(df[f'{region}_Sales'].to_numpy(dtype=float), total,
+                                     out=np.zeros(len(df)), where=total > 0)
+        for region in ['NA', 'EU', 'JP']
+    }
+
+
+class SimilarGames:
+    """KD-tree over one game table snapshot"""
+
+    def __init__(self, df, scaler):
+        self.df = df.reset_index(drop=True)
+        self.scaler = scaler
+        self.platforms = sorted(self.df['Platform'].unique())
+        self.genres = sorted(self.df['Genre'].unique())
+        self.platform_ids = {p: i for i, p in enumerate(self.platforms)}
+        self.genre_ids = {g: i for i, g in enumerate(self.genres)}
+
+        raw = self.df[['Global_Sales', 'Critic_Score', 'User_Score']].assign(**sales_ratios(self.df))
+        raw = raw[SCALED_FEATURES].to_numpy(dtype=float)
+        # Spec fields left out are filled with the typical game
+        self.defaults = dict(zip(SCALED_FEATURES, np.median(raw, axis=0).tolist()))
+        self.features = self._encode(raw, self.df['Platform'], self.df['Genre'])
+        self.tree = KDTree(self.features)
+        self.years = self.df['Year_of_Release'].to_numpy()
+        self.platform_codes = np.array([self.platform_ids[p] for p in self.df['Platform']])
+        self.genre_codes = np.array([self.genre_ids[g] for g in self.df['Genre']])
+        self.games = self.df[RESULT_COLUMNS].to_dict('records')
+
+    def __len__(self):
+        return len(self.df)
+
+    def _encode(self, raw, platforms, genres):
+        # StandardScaler.transform without the per-call DataFrame validation
+        scaled = (raw - self.scaler.mean_) / self.scaler.scale_
+        n = len(scaled)
+        onehot = np.zeros((n, len(self.platforms) + len(self.genres)))
+        rows = np.arange(n)
+        platform_codes = np.array([self.platform_ids.get(p, -1) for p in platforms])
+        genre_codes = np.array([self.genre_ids.get(g, -1) for g in genres])
+        # Unknown categories stay all-zero, equally far from every known value
+        known = platform_codes >= 0
+        onehot[rows[known], platform_codes[known]] = CATEGORY_WEIGHT
+        known = genre_codes >= 0
+        onehot[rows[known], len(self.platforms) + genre_codes[known]] = CATEGORY_WEIGHT
+        return np.hstack([scaled, onehot])
+
+    def encode_specs(self, specs):
+        """Feature rows for hypothetical games given as spec dicts"""
+        raw = np.array([[float(spec.get(SPEC_FIELDS[f], self.defaults[f])) for f in SCALED_FEATURES]
+                        for spec in specs], dtype=float)
+        return self._encode(raw, [s.get('platform') for s in specs], [s.get('genre') for s in specs])
+
+    def allowed_rows(self, platform=None, genre=None, year_min=None, year_max=None):
+        """Boolean row mask for the filters; None when nothing is filtered"""
+        if not (platform or genre or year_min or year_max):
+            return None
+        mask = np.ones(len(self.df), dtype=bool)
+        if platform:
+            mask &= self.platform_codes == self.platform_ids.get(platform, -1)
+        if genre:
+            mask &= self.genre_codes == self.genre_ids.get(genre, -1)
+        if year_min:
+            mask &= self.years >= year_min
+        if year_max:
+            mask &= self.years <= year_max
+        return mask
+
+    def query(self, features, k=10, allowed=None, exclude=None):
+        """k nearest (row ids, distances) per feature row, honouring filters.
+
+        Filtered queries over-fetch and double the fetch size until k rows
+        pass or the whole table has been visited.
+        """
+        n = len(self.df)
+        exclude = exclude if exclude is not None else [None] * len(features)
+        n_allowed = n if allowed is None else int(allowed.sum())
+        results = [(EMPTY_ROWS, np.empty(0))] * len(features)
+        if not n_allowed or not k:
+            return results
+        # Twice the expected fetch size for the filter's selectivity, plus the excluded query game
+        fetch = min(n, -(-k * n // n_allowed) * (1 if allowed is None else 2) + 1)
+        pending = np.arange(len(features))
+
+        while len(pending):
+            dist, ind = self.tree.query(features[pending], k=fetch)
+            retry = []
+            for q, d, rows in zip(pending, dist, ind):
+                keep = rows != exclude[q] if exclude[q] is not None else np.ones(len(rows), dtype=bool)
+                if allowed is not None:
+                    keep &= allowed[rows]
+                if keep.sum() >= k or fetch == n:
+                    results[q] = (rows[keep][:k], d[keep][:k])
+                else:
+                    retry.append(q)
+            pending = np.asarray(retry, dtype=int)
+            fetch = min(n, fetch * 2)
+        return results
+
+    def records(self, rows, distances):
+        return [{"id": row, **self.games[row], "distance": round(d, 4)}
+                for row, d in zip(np.asarray(rows).tolist(), np.asarray(distances).tolist())]
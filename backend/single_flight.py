@@ -0,0 +1,133 @@
+"""
+🎮 DSS Video Games - Single Flight
+Coalesces concurrent identical computations: the first caller for a key
+computes, everyone who arrives while it runs waits and shares the result.
+Optionally extended across processes with a lock file and result file per key.
+"""
+
+import hashlib
+import os
+import threading
+import time
+
+from state_dir import ensure_private_dir
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process coalescing
+    fcntl = None
+
+# Result files older than this are removed by the periodic sweep
+RESULT_TTL_SECONDS = 60
+SWEEP_EVERY = 100
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Per-key in-flight deduplication.
+
+    With ``shared_dir`` (and fcntl available) the leader thread of each
+    process also takes an exclusive lock file for the key; a process that
+    gets the lock after another one finished reuses the result file written
+    since it arrived instead of recomputing. ``dump``/``load`` convert results
+    to and from bytes for that file.
+    """
+
+    def __init__(self, shared_dir=None, dump=None, load=None):
+        self.shared_dir = shared_dir if shared_dir and fcntl else None
+        self.dump = dump
+        self.load = load
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.stats = {"leaders": 0, "followers": 0, "shared": 0, "errors": 0}
+        if self.shared_dir:
+            # Result files are served as responses, so only this user may write them
+            ensure_private_dir(self.shared_dir)
+
+    def do(self, key, compute):
+        """Result of compute() for key, shared with concurrent callers of the same key"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.stats["leaders"] += 1
+            else:
+                self.stats["followers"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._compute_shared(key, compute) if self.shared_dir else compute()
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self.stats["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def _paths(self, key):
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        base = os.path.join(self.shared_dir, digest)
+        return base + '.lock', base + '.result'
+
+    def _compute_shared(self, key, compute):
+        arrived = time.time()
+        lock_path, result_path = self._paths(key)
+        with open(lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                # Another worker finished this key while we waited for the lock
+                try:
+                    if os.path.getmtime(result_path) >= arrived:
+                        with open(result_path, 'rb') as f:
+                            result = self.load(f.read())
+                        with self._lock:
+                            self.stats["shared"] += 1
+                        return result
+                except OSError:
+                    pass
+
+                result = compute()
+                tmp_path = f'{result_path}.{os.getpid()}.tmp'
+                with open(tmp_path, 'wb') as f:
+                    f.write(self.dump(result))
+                os.replace(tmp_path, result_path)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+        self._writes += 1
+        if self._writes % SWEEP_EVERY == 0:
+            self._sweep()
+        return result
+
+    def _sweep(self):
+        """Drop result and lock files of keys not computed recently.
+
+        A lock removed while still in use only costs one duplicate computation.
+        """
+        cutoff = time.time() - RESULT_TTL_SECONDS
+        for name in os.listdir(self.shared_dir):
+            path = os.path.join(self.shared_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff and name.endswith(('.result', '.lock')):
+                    os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,44 @@
+"""
+🎮 DSS Video Games - State Directories
+Local directories for state the app keeps between requests and restarts:
+warm-cache snapshots, prediction audit logs, stream relay sockets and request
+profiles. By default they live in the user's cache directory rather than a
+shared temp directory. They are created with mode 0700 and checked before
+use, so another local user cannot plant a snapshot that is unpickled on
+load, read the audit log, or pre-create the relay sockets.
+"""
+
+import os
+import stat
+
+APP_DIR_NAME = 'dss-video-games'
+
+
+def user_cache_dir():
+    """%LOCALAPPDATA% on Windows, else $XDG_CACHE_HOME or ~/.cache"""
+    if os.name == 'nt' and os.environ.get('LOCALAPPDATA'):
+        return os.environ['LOCALAPPDATA']
+    return os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+
+
+def default_state_dir(name):
+    """Directory for one kind of state under the user cache directory"""
+    return os.path.join(user_cache_dir(), APP_DIR_NAME, name)
+
+
+def is_private(st):
+    """Whether stat result st belongs to this user and only this user can write it"""
+    if not hasattr(os, 'getuid'):  # Windows: no POSIX ownership to check
+        return True
+    return st.st_uid == os.getuid() and not st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+def ensure_private_dir(path):
+    """Create path (mode 0700) if missing; PermissionError unless it is a private directory"""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode):
+        raise PermissionError(f"{path} is not a directory")
+    if not is_private(st):
+        raise PermissionError(f"{path} is not owned by this user or is writable by others")
+    return path
@@ -0,0 +1,102 @@
+import threading
+import time
+
+import pytest
+
+from admission import AdmissionController, Shed
+
+
+def wait_for_queue(controller, depth):
+    deadline = time.monotonic() + 2
+    while controller.metrics()["queue_depth"] < depth:
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def queued_acquire(controller, route, order):
+    """Start a thread that acquires route and records it in order once admitted"""
+    def run():
+        controller.acquire(route, 'client')
+        order.append(route)
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def test_full_queue_sheds_with_503():
+    controller = AdmissionController(capacity=1, max_queue=0, max_wait=1)
+    controller.acquire('/api/games', 'a')
+    with pytest.raises(Shed) as shed:
+        controller.acquire('/api/games', 'b')
+    assert shed.value.status == 503
+    assert shed.value.retry_after >= 1
+    assert controller.metrics()["routes"]["/api/games"]["shed"]["queue_full"] == 1
+
+
+def test_rate_limit_is_per_client_with_retry_after():
+    controller = AdmissionController(capacity=10, max_queue=10, max_wait=1,
+                                     route_limits={'/api/predict': 10}, rate=0.5, burst=2)
+    for _ in range(2):
+        controller.acquire('/api/predict', 'a')
+        controller.release('/api/predict')
+    with pytest.raises(Shed) as shed:
+        controller.acquire('/api/predict', 'a')
+    assert shed.value.status == 429
+    # One token refills in 1 / 0.5 = 2 seconds
+    assert shed.value.retry_after == 2
+    controller.acquire('/api/predict', 'b')
+    # Unlimited routes are not rate limited
+    controller.acquire('/api/games', 'a')
+
+
+def test_waiter_times_out_and_leaves_the_queue():
+    controller = AdmissionController(capacity=1, max_queue=5, max_wait=0.05)
+    controller.acquire('/api/games', 'a')
+    with pytest.raises(Shed) as shed:
+        controller.acquire('/api/games', 'b')
+    assert shed.value.status == 503
+    metrics = controller.metrics()
+    assert metrics["queue_depth"] == 0
+    assert metrics["routes"]["/api/games"]["shed"]["timed_out"] == 1
+    # The slot is still held by the first request, and is free after its release
+    controller.release('/api/games')
+    assert controller.acquire('/api/games', 'b') == 0.0
+
+
+def test_release_admits_cheapest_waiter_first_then_fifo():
+    controller = AdmissionController(capacity=1, max_queue=5, max_wait=2,
+                                     route_costs={'/api/predict': 1, '/api/predict/batch': 2})
+    controller.acquire('/api/games', 'a')
+    order = []
+    threads = []
+    for depth, route in enumerate(['/api/predict/batch', '/api/predict', '/api/games', '/api/games/facets'], 1):
+        threads.append(queued_acquire(controller, route, order))
+        wait_for_queue(controller, depth)
+    for expected in range(1, 5):
+        controller.release('/api/games' if expected == 1 else order[-1])
+        deadline = time.monotonic() + 2
+        while len(order) < expected:
+            assert time.monotonic() < deadline
+            time.sleep(0.001)
+    for thread in threads:
+        thread.join()
+    assert order == ['/api/games', '/api/games/facets', '/api/predict', '/api/predict/batch']
+
+
+def test_release_skips_waiters_over_their_route_limit():
+    controller = AdmissionController(capacity=2, max_queue=5, max_wait=2,
+                                     route_limits={'/api/predict': 1}, route_costs={'/api/predict': 1})
+    controller.acquire('/api/predict', 'a')
+    controller.acquire('/api/games', 'a')
+    order = []
+    predict = queued_acquire(controller, '/api/predict', order)
+    wait_for_queue(controller, 1)
+    games = queued_acquire(controller, '/api/games/facets', order)
+    wait_for_queue(controller, 2)
+    # Freeing a cheap slot cannot start the queued predict (its route is at its limit)
+    controller.release('/api/games')
+    games.join(2)
+    assert order == ['/api/games/facets']
+    controller.release('/api/predict')
+    predict.join(2)
+    assert order == ['/api/games/facets', '/api/predict']
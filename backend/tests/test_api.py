@@ -0,0 +1,144 @@
+import json
+import os
+
+import pytest
+
+# Ingest into memory only, never into the shipped dataset's journal
+os.environ['DSS_INGEST_JOURNAL'] = ''
+
+
+@pytest.fixture(scope="module")
+def client():
+    import api
+    return api.app.test_client()
+
+
+@pytest.mark.parametrize("payload", [[1, 2], {"games": [{"Name": "x"}, "y"]}, {"games": "nope"}])
+def test_ingest_rejects_malformed_payload(client, payload):
+    response = client.post('/api/games/ingest', json=payload)
+    assert response.status_code == 400
+    assert response.get_json()["success"] is False
+
+
+def test_rate_limit_key_ignores_client_forwarded_for(client):
+    import api
+    with api.app.test_request_context('/api/predict', headers={'X-Forwarded-For': '203.0.113.7'},
+                                      environ_base={'REMOTE_ADDR': '10.0.0.9'}):
+        assert api.client_id() == '10.0.0.9'
+
+
+@pytest.mark.parametrize("query", ["top_n=-1", "top_n=0", "min_games=0", "sort_by=name"])
+def test_publisher_leaderboard_rejects_bad_arguments(client, query):
+    response = client.get(f'/api/analytics/publishers?{query}')
+    assert response.status_code == 400
+    assert response.get_json()["error"]
+
+
+def test_publisher_leaderboard_top_n(client):
+    response = client.get('/api/analytics/publishers?top_n=3&sort_by=game_count')
+    assert response.status_code == 200
+    counts = [row["game_count"] for row in response.get_json()]
+    assert len(counts) == 3 and counts == sorted(counts, reverse=True)
+
+
+@pytest.mark.parametrize("field, value", [("critic_score", "nan"), ("user_score", "inf"), ("critic_score", "-Infinity")])
+def test_predict_rejects_non_finite_scores(client, field, value):
+    response = client.post('/api/predict', json={"platform": "PS4", "genre": "Action", field: value})
+    assert response.status_code == 400
+    assert response.get_json()["error"] == f"{field} must be a finite number (got {float(value)})"
+
+
+def test_predict_explanation_adds_up_to_the_predicted_probability(client):
+    response = client.post('/api/predict?explain=1', json={
+        "platform": "PS4", "genre": "Action", "publisher": "Ubisoft", "critic_score": 82, "user_score": 7.9,
+        "year": 2015})
+    result = response.get_json()
+    explanation = result["explanation"]
+    assert explanation["class"] == result["prediction"]
+    # Each term is rounded to 4 decimals
+    total = explanation["base_value"] + sum(c["contribution"] for c in explanation["contributions"])
+    assert total == pytest.approx(result["probabilities"][result["prediction"]], abs=1e-3)
+
+
+def test_facets_revalidate_with_etag_until_the_data_changes(client):
+    first = client.get('/api/games/facets?platform=PS4&genre=Action')
+    etag = first.headers['ETag']
+    assert first.status_code == 200 and first.headers['Cache-Control'] == 'no-cache'
+
+    # Same normalized query in another order and with a blank parameter
+    again = client.get('/api/games/facets?genre=Action&search=&platform=PS4', headers={'If-None-Match': etag})
+    assert again.status_code == 304 and again.data == b''
+    other = client.get('/api/games/facets?platform=PC', headers={'If-None-Match': etag})
+    assert other.status_code == 200
+
+    ingested = client.post('/api/games/ingest', json={"games": [{
+        "Name": "ETag Test", "Platform": "PS4", "Year_of_Release": 2015, "Genre": "Action",
+        "Publisher": "Ubisoft", "NA_Sales": 0.5, "EU_Sales": 0.3, "JP_Sales": 0.1, "Other_Sales": 0.1,
+        "Critic_Score": 80, "User_Score": 7.5}]})
+    assert ingested.status_code == 200
+    changed = client.get('/api/games/facets?platform=PS4&genre=Action', headers={'If-None-Match': etag})
+    assert changed.status_code == 200 and changed.headers['ETag'] != etag
+    assert changed.get_json()["total"] == first.get_json()["total"] + 1
+
+
+MATRIX_BASE = {"genre": "Action", "publisher": "Ubisoft", "critic_score": 78, "user_score": 7.2}
+
+
+def test_matrix_cells_match_single_predictions(client):
+    response = client.post('/api/predict/matrix', json={
+        "base": MATRIX_BASE, "vary": {"year": [2014, 2027], "platform": ["PS4", "PC", "XOne"]}, "top": 4})
+    result = response.get_json()
+    # Axes follow the platform, genre, publisher, year order whatever the key order of vary
+    assert result["dimensions"] == ["platform", "year"] and result["shape"] == [3, 2]
+
+    for i, platform in enumerate(result["values"]["platform"]):
+        for j, year in enumerate(result["values"]["year"]):
+            single = client.post('/api/predict', json={**MATRIX_BASE, "platform": platform, "year": year}).get_json()
+            assert result["predictions"][i][j] == single["prediction"]
+            for cls, probability in single["probabilities"].items():
+                assert result["probabilities"][cls][i][j] == pytest.approx(probability, abs=1e-4)
+
+    scores = [cell["score"] for cell in result["ranking"]]
+    assert len(scores) == 4 and scores == sorted(scores, reverse=True)
+    best = result["ranking"][0]
+    i, j = result["values"]["platform"].index(best["platform"]), result["values"]["year"].index(best["year"])
+    assert result["scores"][i][j] == best["score"]
+
+
+@pytest.mark.parametrize("body, error", [
+    ({"vary": {}}, "vary must map"),
+    ({"vary": {"critic_score": [1, 2]}}, "Cannot vary critic_score"),
+    ({"vary": {"platform": ["PS4", "Dreamcast 2"]}}, "Unknown platform: Dreamcast 2"),
+    ({"vary": {"year": []}}, "year must be a non-empty list"),
+    ({"vary": {"platform": ["PS4"]}, "rank_by": ["Legendary"]}, "rank_by must name classes"),
+    ({"vary": {"publisher": "all", "year": list(range(1900, 2100))}}, "combinations per matrix"),
+])
+def test_matrix_rejects_bad_requests(client, body, error):
+    response = client.post('/api/predict/matrix', json={"base": MATRIX_BASE, **body})
+    assert response.status_code == 400
+    assert error in response.get_json()["error"]
+
+
+def read_event(events):
+    event, data = next(events).decode().strip().split("\n")
+    return event.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+
+def test_stream_evaluates_only_the_latest_update(client):
+    response = client.get('/api/predict/stream?platform=PS4&genre=Action&critic_score=70&seq=1', buffered=False)
+    events = response.iter_encoded()
+    try:
+        event, session = read_event(events)
+        assert event == 'session'
+        event, first = read_event(events)
+        assert (event, first["seq"], first["input"]["critic_score"]) == ('prediction', 1, 70)
+        for seq, score in ((2, 60), (3, 90)):
+            pushed = client.post(f'/api/predict/stream/{session["session_id"]}',
+                                 json={"platform": "PS4", "genre": "Action", "critic_score": score, "seq": seq})
+            assert pushed.status_code == 202
+        event, latest = read_event(events)
+        assert (latest["seq"], latest["input"]["critic_score"], latest["superseded"]) == (3, 90, 1)
+    finally:
+        response.close()
+    closed = client.post(f'/api/predict/stream/{session["session_id"]}', json={"critic_score": 50})
+    assert closed.status_code == 404
@@ -0,0 +1,40 @@
+import io
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from compact_forest import CompactForest, sweep_forests
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(400, 5))
+    y = np.where(X[:, 0] + X[:, 1] * X[:, 2] > 0, 'Hit', np.where(X[:, 3] > 0.5, 'Blockbuster', 'Low'))
+    return RandomForestClassifier(n_estimators=20, max_depth=8, random_state=0).fit(X, y), X, y
+
+
+def test_leaves_follow_sklearn_paths(fitted):
+    model, X, _ = fitted
+    compact = CompactForest.from_sklearn(model)
+    assert (compact.leaves(X) - compact.roots == model.apply(X)).all()
+
+
+def test_saved_forest_predicts_like_sklearn(fitted):
+    model, X, _ = fitted
+    buffer = io.BytesIO()
+    CompactForest.from_sklearn(model, prob_bits=8).save(buffer)
+    buffer.seek(0)
+    compact = CompactForest.load(buffer)
+    assert (compact.predict(X) == model.predict(X)).all()
+    assert np.abs(compact.predict_proba(X) - model.predict_proba(X)).max() < 0.01
+
+
+def test_sweep_covers_every_configuration(fitted):
+    model, X, y = fitted
+    rows = sweep_forests(model, X, y, tree_counts=(5, 20, 50), bit_widths=(4, 8), repeat=1)
+    assert [(r["trees"], r["prob_bits"]) for r in rows] == [(5, 4), (5, 8), (20, 4), (20, 8)]
+    full = rows[-1]
+    assert full["agreement"] == 1.0
+    assert rows[0]["file_bytes"] < rows[1]["file_bytes"] < full["file_bytes"]
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from facets import FACET_COLUMNS, FacetIndex
+
+
+@pytest.fixture(scope="module")
+def games():
+    rng = np.random.default_rng(5)
+    n = 203  # Not a multiple of 8, so the last packed byte is partial
+    return pd.DataFrame({
+        'Platform': rng.choice(['PS4', 'XOne', 'PC', '3DS'], n),
+        'Genre': rng.choice(['Action', 'Sports', 'Puzzle', 'Shooter'], n),
+        'Publisher': rng.choice(['EA', 'Ubisoft', 'Nintendo', None], n, p=[0.4, 0.3, 0.2, 0.1]),
+        'Year_of_Release': rng.integers(2009, 2017, n).astype(float),
+    })
+
+
+def pandas_counts(df, filters, rows=None):
+    """Reference: each facet counted under every filter but its own"""
+    masks = {}
+    for facet in ('platform', 'genre', 'publisher'):
+        if filters.get(facet):
+            masks[facet] = df[FACET_COLUMNS[facet]].isin(np.atleast_1d(filters[facet]))
+    if filters.get('year_min') or filters.get('year_max'):
+        years = df['Year_of_Release']
+        masks['year'] = (years >= filters.get('year_min', -np.inf)) & (years <= filters.get('year_max', np.inf))
+    base = pd.Series(True, index=df.index)
+    if rows is not None:
+        base = df.index.isin(rows)
+    facets = {}
+    for facet, column in FACET_COLUMNS.items():
+        mask = base.copy()
+        for other, other_mask in masks.items():
+            if other != facet:
+                mask &= other_mask
+        counts = df.loc[mask, column].value_counts()
+        facets[facet] = {value: int(counts.get(value, 0)) for value in sorted(df[column].dropna().unique())}
+    total = base.copy()
+    for mask in masks.values():
+        total &= mask
+    return int(total.sum()), facets
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"platform": "PS4"},
+    {"platform": ["PS4", "PC"], "genre": "Action"},
+    {"publisher": "Nintendo", "year_min": 2012},
+    {"genre": ["Puzzle", "Shooter"], "year_min": 2010, "year_max": 2013},
+    {"platform": "Switch"},
+])
+@pytest.mark.parametrize("searched", [False, True])
+def test_counts_match_pandas(games, filters, searched):
+    index = FacetIndex(games)
+    rows = np.arange(0, len(games), 3) if searched else None
+    result = index.counts(**filters, rows=index.rows_bitmap(rows) if searched else None)
+    total, facets = pandas_counts(games, filters, rows)
+    assert result["total"] == total
+    assert {facet: {item["value"]: item["count"] for item in items}
+            for facet, items in result["facets"].items()} == facets
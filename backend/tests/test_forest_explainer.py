@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from forest_explainer import EXPLAIN_BLOCK, ForestExplainer
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(600, 4))
+    y = np.where(X[:, 0] * X[:, 1] > 0.3, 'Hit', np.where(X[:, 2] > 0, 'Moderate', 'Low'))
+    return RandomForestClassifier(n_estimators=15, max_depth=7, random_state=0).fit(X, y), X
+
+
+def test_contributions_add_up_to_predict_proba(fitted):
+    model, X = fitted
+    # More rows than one block, so the block boundary is covered
+    X = np.vstack([X, X[:EXPLAIN_BLOCK]])
+    explainer = ForestExplainer(model)
+    total = explainer.base_value + explainer.contributions(X).sum(axis=1)
+    np.testing.assert_allclose(total, model.predict_proba(X), atol=1e-12)
+
+
+def test_first_trees_explain_their_own_average(fitted):
+    model, X = fitted
+    explainer = ForestExplainer(model, n_trees=5)
+    expected = np.mean([tree.predict_proba(X) for tree in model.estimators_[:5]], axis=0)
+    total = explainer.base_value + explainer.contributions(X).sum(axis=1)
+    np.testing.assert_allclose(total, expected, atol=1e-12)
+
+
+def test_explain_orders_by_absolute_effect(fitted):
+    model, X = fitted
+    explainer = ForestExplainer(model)
+    record = explainer.explain(X[:1], ['Hit'])[0]
+    effects = [abs(c["contribution"]) for c in record["contributions"]]
+    assert record["class"] == 'Hit'
+    assert effects == sorted(effects, reverse=True)
+    assert sorted(c["feature"] for c in record["contributions"]) == ['0', '1', '2', '3']
+    proba = model.predict_proba(X[:1])[0][list(model.classes_).index('Hit')]
+    assert record["base_value"] + sum(c["contribution"] for c in record["contributions"]) == pytest.approx(proba, abs=1e-3)
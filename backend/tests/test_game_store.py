@@ -0,0 +1,124 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from facets import FacetIndex
+from game_store import GameStore, build_snapshot, validate_records, with_rows
+from publisher_leaderboard import PublisherLeaderboard
+from year_cube import MomentCube, YearCube
+
+GAME = {"Name": "Test Game", "Platform": "PS4", "Year_of_Release": 2015, "Genre": "Action",
+        "Publisher": "Sony Computer Entertainment", "NA_Sales": 0.5, "EU_Sales": 0.3,
+        "JP_Sales": 0.1, "Other_Sales": 0.1, "Critic_Score": 80, "User_Score": 7.5}
+
+
+def assign_segments(df):
+    return df.assign(Cluster=0, Cluster_Label='Test Segment')
+
+
+@pytest.fixture
+def base_frame():
+    return assign_segments(pd.DataFrame([dict(GAME, Name=f"Base {i}", Global_Sales=1.0) for i in range(3)]))
+
+
+@pytest.mark.parametrize("records", [[1, 2], [GAME, "game"], [GAME, None], {"games": [GAME]}])
+def test_validate_rejects_non_object_records(records):
+    with pytest.raises(ValueError):
+        validate_records(records)
+
+
+def test_validate_rejects_negative_and_non_finite_sales():
+    df, rejected = validate_records([GAME, dict(GAME, NA_Sales=-2), dict(GAME, EU_Sales=float('inf'))])
+    assert len(df) == 1
+    assert [r["index"] for r in rejected] == [1, 2]
+    assert "Negative sales: NA_Sales" in rejected[0]["error"]
+    assert "Non-finite fields: EU_Sales" in rejected[1]["error"]
+
+
+def test_failed_segment_assignment_is_not_journaled(tmp_path, base_frame):
+    def failing(df):
+        raise ValueError("cannot place")
+
+    journal = tmp_path / "ingested.ndjson"
+    store = GameStore(base_frame, failing, journal_path=str(journal))
+    with pytest.raises(ValueError):
+        store.ingest([GAME])
+    assert not journal.exists() or journal.read_text() == ""
+
+
+def test_replay_skips_bad_journal_lines(tmp_path, base_frame):
+    journal = tmp_path / "ingested.ndjson"
+    journal.write_text("{broken\n[1, 2]\n" + json.dumps(dict(GAME, NA_Sales=-2)) + "\n"
+                       + json.dumps(dict(GAME, Name="Replayed")) + "\n")
+    store = GameStore(base_frame, assign_segments, journal_path=str(journal))
+    assert store.current().df['Name'].tolist()[-1] == "Replayed"
+    assert len(store.current()) == len(base_frame) + 1
+
+
+def test_workers_converge_on_journal_order(tmp_path, base_frame):
+    journal = str(tmp_path / "ingested.ndjson")
+    snapshot = build_snapshot(base_frame)
+    first = GameStore(base_frame, assign_segments, journal_path=journal, snapshot=snapshot)
+    second = GameStore(base_frame, assign_segments, journal_path=journal, snapshot=snapshot)
+    first.ingest([dict(GAME, Name="A")])
+    second.ingest([dict(GAME, Name="B")])
+    first.ingest([dict(GAME, Name="C")])
+    names = [store.current().df['Name'].tolist()[-3:] for store in (first, second)]
+    assert names == [["A", "B", "C"], ["A", "B", "C"]]
+    assert os.path.getsize(journal) > 0
+
+
+
+def varied_frame(n, seed):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame([
+        dict(GAME, Name=f"Game {seed}-{i}", Platform=str(rng.choice(["PS4", "XOne", "PC"])),
+             Genre=str(rng.choice(["Action", "Sports"])), Year_of_Release=int(rng.integers(2010, 2016)),
+             Publisher=str(rng.choice(["Sony Computer Entertainment", "EA", "Ubisoft"])),
+             NA_Sales=float(rng.uniform(0, 2)), Critic_Score=float(rng.integers(40, 95)))
+        for i in range(n)])
+    return df.assign(Global_Sales=df[['NA_Sales', 'EU_Sales', 'JP_Sales', 'Other_Sales']].sum(axis=1))
+
+
+def derived_state(value):
+    if isinstance(value, FacetIndex):
+        return value.counts(), value.counts(platform='PS4', year_min=2013), value.counts(genre=['Puzzle', 'Sports'])
+    if isinstance(value, PublisherLeaderboard):
+        return value.top(top_n=10, sort_by='success_rate')
+    # Prefix sums add the new rows in a different order than a rebuild
+    return np.round(value.cumulative, 9).tolist()
+
+
+KNOWN_VALUES = dict(GAME, Name="Known values", Platform="PC", Genre="Sports", Year_of_Release=2012)
+NEW_VALUES = dict(GAME, Name="New values", Platform="Switch", Genre="Puzzle", Publisher="Nintendo",
+                  Year_of_Release=2011)
+
+
+@pytest.mark.parametrize("build, new_values_extend", [
+    (YearCube, False),
+    (MomentCube, False),
+    (PublisherLeaderboard.from_frame, False),
+    (FacetIndex, True),
+])
+@pytest.mark.parametrize("appended", [KNOWN_VALUES, NEW_VALUES])
+def test_extended_values_match_a_rebuild(build, new_values_extend, appended):
+    store = GameStore(assign_segments(varied_frame(29, seed=1)), assign_segments)
+    builds = []
+
+    def compute(snapshot):
+        builds.append(snapshot.version)
+        return build(snapshot.df)
+
+    for records in ([appended], varied_frame(5, seed=2).to_dict('records')):
+        snapshot = store.current()
+        snapshot.memo('derived', lambda: compute(snapshot), extend=with_rows)
+        store.ingest(records)
+    snapshot = store.current()
+    value = snapshot.memo('derived', lambda: compute(snapshot), extend=with_rows)
+
+    assert derived_state(value) == derived_state(build(snapshot.df))
+    rebuilt = appended is NEW_VALUES and not new_values_extend
+    assert builds == ([0, 1] if rebuilt else [0])
@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+import inference_bench
+from inference_bench import MIN_REGRESSION_MS, find_regressions
+
+
+def results(**sizes):
+    return {"case": {"sizes": {size: {"p50_ms": ms} for size, ms in sizes.items()}}}
+
+
+def test_find_regressions_applies_tolerance_and_noise_floor():
+    tiny = MIN_REGRESSION_MS / 4
+    baseline = {"results": results(**{"10": 1.0, "100": 1.0, "1000": tiny, "5000": 2.0})}
+    # 10: within tolerance; 1000: 3x slower but under the noise floor; 9999: no baseline
+    current = results(**{"10": 1.2, "100": 1.3, "1000": 3 * tiny, "5000": 2.0, "9999": 50.0})
+    assert find_regressions(current, baseline, tolerance=0.25) == [
+        {"case": "case", "size": 100, "baseline_ms": 1.0, "p50_ms": 1.3, "ratio": 1.3}]
+
+
+def test_check_exits_on_a_regression_against_the_stored_baseline(tmp_path, monkeypatch):
+    monkeypatch.setattr(inference_bench, 'TIME_BUDGET_SECONDS', 0.05)
+    history = tmp_path / "bench.json"
+    args = ['--history', str(history), '--sizes', '1000', '--cases', 'encode_dict_lookup', '--check']
+
+    inference_bench.main(args)
+    stored = json.loads(history.read_text())
+    assert stored["baseline"]["results"]["encode_dict_lookup"]["sizes"]["1000"]["p50_ms"] > 0
+
+    # A baseline 1000x faster than anything this machine can do
+    stored["baseline"]["results"]["encode_dict_lookup"]["sizes"]["1000"]["p50_ms"] /= 1000
+    history.write_text(json.dumps(stored))
+    with pytest.raises(SystemExit) as exit_info:
+        inference_bench.main(args)
+    assert exit_info.value.code == 1
+    last = json.loads(history.read_text())["runs"][-1]
+    assert [r["case"] for r in last["regressions"]] == ["encode_dict_lookup"]
+    assert last["changed_since_baseline"] == {}
@@ -0,0 +1,26 @@
+import os
+
+from pipeline import Stage, run_pipeline
+
+
+def write_pid(paths, params):
+    with open(paths[params['out']], 'w') as f:
+        f.write(f"{os.getpid()} {os.path.exists(paths['exclusive'])}")
+    return {}
+
+
+def test_exclusive_stage_runs_alone_in_the_main_process(tmp_path):
+    paths = {name: str(tmp_path / name) for name in ('source', 'first', 'exclusive', 'other')}
+    open(paths['source'], 'w').close()
+    stages = [
+        Stage('first', write_pid, ['source'], ['first'], {'out': 'first'}),
+        Stage('exclusive', write_pid, ['first'], ['exclusive'], {'out': 'exclusive', 'jobs': 2}, exclusive=True),
+        Stage('other', write_pid, ['first'], ['other'], {'out': 'other'}),
+    ]
+    report, _ = run_pipeline(stages, paths, str(tmp_path / 'manifest.json'), jobs=2)
+
+    pids = {name: open(paths[name]).read().split()[0] for name in ('first', 'exclusive', 'other')}
+    assert pids['exclusive'] == str(os.getpid()) != pids['first']
+    # Ready alongside the exclusive stage, but started only after it finished
+    assert open(paths['other']).read().endswith("True")
+    assert [name for name, *_ in report] == ['first', 'exclusive', 'other']
@@ -0,0 +1,73 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+import prediction_audit
+from prediction_audit import DriftStats, PredictionAudit
+from publisher_leaderboard import SUCCESS_CATEGORIES
+
+CODES = {'platform': {'PC': 0, 'PS4': 1}, 'genre': {'Action': 0, 'Sports': 1}, 'publisher': {'EA': 0}}
+
+
+def training_frame():
+    rng = np.random.default_rng(0)
+    n = 200
+    return pd.DataFrame({
+        'Platform': rng.choice(['PC', 'PS4'], n), 'Genre': rng.choice(['Action', 'Sports'], n),
+        'Publisher': 'EA', 'Critic_Score': rng.uniform(30, 95, n), 'User_Score': rng.uniform(2, 9, n),
+        'Year_of_Release': rng.integers(2000, 2016, n).astype(float), 'Global_Sales': rng.exponential(1, n)
+    })
+
+
+def drift_stats():
+    return DriftStats(training_frame(), CODES, SUCCESS_CATEGORIES)
+
+
+def predictions(n, seed):
+    rng = np.random.default_rng(seed)
+    for i in range(n):
+        game = {'platform': str(rng.choice(['PC', 'PS4', 'Switch'])), 'genre': 'Action', 'publisher': 'EA',
+                'critic_score': float(rng.uniform(20, 100)), 'user_score': float(rng.uniform(0, 10)),
+                'year': int(rng.integers(2005, 2030))}
+        probabilities = rng.dirichlet(np.ones(len(SUCCESS_CATEGORIES)))
+        features = [0, 0, 0, game['critic_score'], game['user_score'], min(game['year'], 2016)]
+        yield game, features, SUCCESS_CATEGORIES[int(np.argmax(probabilities))], probabilities
+
+
+def test_merged_worker_stats_match_one_worker():
+    single, first, second = drift_stats(), drift_stats(), drift_stats()
+    for i, (game, features, prediction, probabilities) in enumerate(predictions(120, seed=1)):
+        args = (game, features[5], prediction, float(max(probabilities)))
+        single.update(*args)
+        (first if i % 3 else second).update(*args)
+    first.merge(second.state())
+    assert first.report() == single.report()
+
+
+def test_report_includes_other_workers(tmp_path, monkeypatch):
+    own, peer = PredictionAudit(str(tmp_path), drift_stats()), PredictionAudit(str(tmp_path), drift_stats())
+    batches = {audit: list(zip(*predictions(40, seed))) for audit, seed in ((own, 2), (peer, 3))}
+    own.record('/api/predict/batch', *batches[own])
+
+    with monkeypatch.context() as patched:
+        patched.setattr(prediction_audit.os, 'getpid', lambda: 424242)
+        peer.record('/api/predict/batch', *batches[peer])
+        peer.drain()
+
+    report = own.report()
+    assert report["workers"] == sorted([prediction_audit.os.getpid(), 424242])
+    assert report["predictions"] == report["log"]["logged"] == 80
+
+
+def test_record_stays_within_request_budget(tmp_path):
+    audit = PredictionAudit(str(tmp_path), drift_stats())
+    game, features, prediction, probabilities = next(predictions(1, seed=4))
+    audit.record('/api/predict', [game], [features], [prediction], [probabilities])
+    calls = 2000
+    start = time.perf_counter()
+    for _ in range(calls):
+        audit.record('/api/predict', [game], [features], [prediction], [probabilities])
+    per_call = (time.perf_counter() - start) / calls
+    # README promises the request thread only queues; 50 µs leaves room for slow CI machines
+    assert per_call < 50e-6, f"record() took {per_call * 1e6:.1f} µs"
@@ -0,0 +1,90 @@
+import multiprocessing
+import shutil
+import tempfile
+import threading
+
+import pytest
+
+from prediction_stream import RELAY_SUPPORTED, StreamHub, StreamSession
+
+
+@pytest.fixture
+def relay_dir():
+    # Unix socket paths are short, so stay out of pytest's long tmp_path
+    path = tempfile.mkdtemp(prefix='dss-stream-', dir='/tmp' if RELAY_SUPPORTED else None)
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def test_only_the_latest_pending_update_is_evaluated():
+    session = StreamSession('s', context={}, labels={})
+    for score in (50, 60, 70):
+        session.push({"critic_score": score})
+    assert session.next_update(0) == {"critic_score": 70}
+    assert session.next_update(0) is None
+    assert (session.received, session.evaluated, session.superseded) == (3, 1, 2)
+
+
+def test_waiting_for_an_update_ends_on_push_or_close():
+    session = StreamSession('s', context={}, labels={})
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(session.next_update(5)))
+    waiter.start()
+    session.push({"year": 2015})
+    waiter.join(5)
+    waiter = threading.Thread(target=lambda: results.append(session.next_update(5)))
+    waiter.start()
+    session.close()
+    waiter.join(5)
+    assert not waiter.is_alive()
+    assert results == [{"year": 2015}, None]
+
+
+def test_hub_caps_sessions_and_keeps_counts_of_closed_ones():
+    hub = StreamHub(None, max_sessions=1)
+    session = hub.open({}, {})
+    assert hub.open({}, {}) is None
+    assert hub.push(session.id, {"year": 2010})
+    session.next_update(0)
+    hub.close(session)
+    assert not hub.push(session.id, {"year": 2011})
+    assert hub.open({}, {}) is not None
+    metrics = hub.metrics()
+    assert (metrics["open"], metrics["opened"], metrics["rejected"]) == (1, 2, 1)
+    assert (metrics["received"], metrics["evaluated"], metrics["relay"]) == (1, 1, False)
+
+
+def serve_one_update(relay_dir, queue):
+    hub = StreamHub(relay_dir)
+    session = hub.open({}, {})
+    queue.put(session.id)
+    queue.put((session.next_update(5), hub.metrics()["relayed_in"]))
+
+
+@pytest.mark.skipif(not RELAY_SUPPORTED, reason="needs Unix sockets")
+def test_update_reaching_another_worker_is_relayed_to_the_owner(relay_dir):
+    context = multiprocessing.get_context('fork')
+    queue = context.Queue()
+    owner = context.Process(target=serve_one_update, args=(relay_dir, queue))
+    owner.start()
+    try:
+        session_id = queue.get(timeout=5)
+        hub = StreamHub(relay_dir)
+        assert hub.push(session_id, {"critic_score": 85})
+        assert queue.get(timeout=5) == ({"critic_score": 85}, 1)
+        assert hub.metrics()["relayed_out"] == 1
+    finally:
+        owner.join(5)
+        if owner.is_alive():
+            owner.kill()
+    assert owner.exitcode == 0
+
+
+@pytest.mark.skipif(not RELAY_SUPPORTED, reason="needs Unix sockets")
+def test_updates_for_unknown_sessions_are_not_delivered(relay_dir):
+    hub = StreamHub(relay_dir)
+    hub.open({}, {})
+    assert not hub.push('not-a-session', {"year": 2010})
+    # A worker that is gone has no socket to relay to
+    assert not hub.push('999999999-gone', {"year": 2010})
+    assert hub.metrics()["relayed_out"] == 0
@@ -0,0 +1,38 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from preprocess import SELECTED_COLUMNS, stream_preprocess
+
+
+@pytest.fixture
+def raw_csv(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 500
+    regions = rng.integers(0, 300, size=(n, 4)) / 100
+    df = pd.DataFrame({
+        'Name': [f"Game {i}" for i in range(n)],
+        'Platform': rng.choice(['PS4', 'XOne', 'PC', 'Wii'], n),
+        'Year_of_Release': rng.choice([2011, 2014, 2015, np.nan], n),
+        'Genre': rng.choice(['Action', 'Sports', 'Shooter'], n),
+        'Publisher': rng.choice(['EA', 'Ubisoft', 'Activision'], n),
+        'NA_Sales': regions[:, 0], 'EU_Sales': regions[:, 1], 'JP_Sales': regions[:, 2],
+        'Other_Sales': regions[:, 3], 'Global_Sales': regions.sum(axis=1).round(2),
+        'Critic_Score': rng.integers(20, 99, n).astype(float),
+        'User_Score': rng.choice(['7.1', '8.4', 'tbd', '5.5'], n)
+    })
+    path = tmp_path / "raw.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+def test_stats_do_not_depend_on_chunk_size(tmp_path, raw_csv):
+    outputs = []
+    for chunk_size in (7, 64, 10_000):
+        clean = tmp_path / f"clean-{chunk_size}.csv"
+        stats = stream_preprocess(raw_csv, clean, 2013, ['Wii'], chunk_size=chunk_size, jobs=1)
+        outputs.append((json.dumps(stats.to_json()), clean.read_text()))
+    assert outputs[0] == outputs[1] == outputs[2]
+    assert outputs[0][1].splitlines()[0] == ','.join(SELECTED_COLUMNS)
@@ -0,0 +1,25 @@
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import publisher_leaderboard
+from publisher_leaderboard import PublisherLeaderboard
+
+
+def test_concurrent_queries_survive_cache_resets(monkeypatch):
+    monkeypatch.setattr(publisher_leaderboard, 'MAX_CACHED_QUERIES', 2)
+    board = PublisherLeaderboard([f"P{i % 7}" for i in range(50)], [i / 10 for i in range(50)])
+
+    def query(i):
+        return board.top(top_n=i % 7 + 1, min_games=i % 3 + 1, sort_by='avg_sales')
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(query, range(400)))
+    assert [len(r) for r in results] == [len(query(i)) for i in range(400)]
+
+
+def test_pickled_leaderboard_gets_its_own_lock():
+    board = PublisherLeaderboard(["A", "B", "A"], [1.0, 6.0, 3.0])
+    board.top()
+    restored = pickle.loads(pickle.dumps(board))
+    assert restored._lock is not board._lock
+    assert restored.top(top_n=1) == [board.top(top_n=2)[0]]
@@ -0,0 +1,65 @@
+import time
+
+import pytest
+
+import request_profiler
+from request_profiler import RequestProfiler, parse_route_rates
+
+
+def busy_lookup(n):
+    return sum(i * i for i in range(n))
+
+
+def profile_requests(profiler, route, count):
+    for _ in range(count):
+        started = time.perf_counter()
+        profile = profiler.start()
+        busy_lookup(2000)
+        busy_lookup(2000)
+        profiler.finish(route, profile, started)
+
+
+def test_parse_route_rates_and_validation(tmp_path):
+    assert parse_route_rates(" /api/predict=0.5,/api/games=1, junk") == {'/api/predict': 0.5, '/api/games': 1.0}
+    with pytest.raises(ValueError):
+        RequestProfiler(str(tmp_path), sample_rate=1.5)
+    with pytest.raises(ValueError):
+        RequestProfiler(str(tmp_path), route_rates={'/api/games': -0.1})
+
+
+def test_route_rate_overrides_the_default(tmp_path):
+    profiler = RequestProfiler(str(tmp_path), sample_rate=1.0, route_rates={'/api/games': 0.0})
+    assert profiler.active()
+    assert all(profiler.should_sample('/api/predict') for _ in range(50))
+    assert not any(profiler.should_sample('/api/games') for _ in range(50))
+    assert not RequestProfiler(str(tmp_path / "off")).active()
+
+
+def test_configure_reaches_other_workers(tmp_path):
+    first, second = RequestProfiler(str(tmp_path)), RequestProfiler(str(tmp_path))
+    assert not second.active()
+    first.configure(routes={'/api/predict': 1.0})
+    second._next_check = 0.0  # as if CONFIG_CHECK_SECONDS had passed
+    assert second.active()
+    assert second.should_sample('/api/predict') and not second.should_sample('/api/games')
+
+
+def test_hotspots_average_per_request_and_prune(tmp_path, monkeypatch):
+    monkeypatch.setattr(request_profiler, 'MAX_PROFILES_PER_ROUTE', 3)
+    profiler = RequestProfiler(str(tmp_path), sample_rate=1.0)
+    profile_requests(profiler, '/api/games', 5)
+    profile_requests(profiler, '/api/predict', 1)
+
+    report = profiler.hotspots(sort_by='cumtime')
+    assert sorted(report) == ['/api/games', '/api/predict']
+    games = report['/api/games']
+    assert games["samples"] == 3
+    lookup = next(h for h in games["hotspots"] if h["function"].endswith("(busy_lookup)"))
+    assert lookup["calls"] == 2
+    assert lookup["cumtime_ms"] <= games["max_ms"]
+    assert list(profiler.hotspots(route='/api/predict')) == ['/api/predict']
+    with pytest.raises(ValueError):
+        profiler.hotspots(sort_by='calls')
+
+    profiler.reset()
+    assert profiler.hotspots() == {}
@@ -0,0 +1,34 @@
+from result_cache import ResultCache, query_etag
+
+
+def response(size):
+    return b"x" * size, 200, 'application/json'
+
+
+def test_lru_eviction_stays_within_the_byte_budget():
+    cache = ResultCache(max_bytes=10)
+    cache.put('a', response(4))
+    cache.put('b', response(4))
+    assert cache.get('a') is not None  # 'a' is now the most recently used
+    cache.put('c', response(4))
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    stats = cache.stats()
+    assert (stats["entries"], stats["bytes"], stats["evictions"]) == (2, 8, 1)
+    assert (stats["hits"], stats["misses"]) == (3, 1)
+
+
+def test_oversized_and_repeated_puts_are_ignored():
+    cache = ResultCache(max_bytes=10)
+    cache.put('big', response(11))
+    cache.put('a', response(3))
+    cache.put('a', response(5))
+    assert cache.get('big') is None
+    assert cache.get('a') == response(3)
+    assert cache.stats()["bytes"] == 3
+
+
+def test_etag_depends_only_on_the_key():
+    key = ('/api/games', (('platform', 'PS4'),), 'inputs', 100)
+    assert query_etag(key) == query_etag(tuple(key))
+    assert query_etag(key) != query_etag(key[:3] + (101,))
@@ -0,0 +1,35 @@
+import pandas as pd
+import pytest
+
+from rule_mining import RuleIndex, game_items
+
+
+def rule_index(rules):
+    return RuleIndex(pd.DataFrame(
+        [("test", antecedents, consequents, 0.1, 0.5, lift) for antecedents, consequents, lift in rules],
+        columns=['source', 'antecedents', 'consequents', 'support', 'confidence', 'lift']))
+
+
+def test_match_drops_rules_whose_consequent_contradicts_the_input():
+    index = rule_index([
+        (('Platform_PS4',), ('Is_Hit',), 3.0),
+        (('Platform_PS4',), ('Genre_Shooter',), 2.5),
+        (('Platform_PS4',), ('Score_Category_Score_Mid',), 2.0),
+        (('Platform_PS4',), ('Genre_Action', 'Is_Hit'), 1.5),
+        (('Platform_PS4',), ('Score_Category_Score_Low',), 1.2),
+    ])
+    matched = index.match(game_items('PS4', 'Action', 40))
+    assert [(r["consequent"], r["lift"]) for r in matched] == [
+        ("Is_Hit", 3.0), ("Genre_Action, Is_Hit", 1.5), ("Score_Category_Score_Low", 1.2)]
+
+
+def test_match_requires_every_antecedent():
+    index = rule_index([(('Platform_PS4', 'Genre_Shooter'), ('Is_Hit',), 2.0)])
+    assert index.match(game_items('PS4', 'Action', 80)) == []
+    assert len(index.match(game_items('PS4', 'Shooter', 80))) == 1
+
+
+@pytest.mark.parametrize("score", [float('nan'), float('inf'), float('-inf')])
+def test_game_items_rejects_non_finite_scores(score):
+    with pytest.raises(ValueError, match="critic_score must be a finite number"):
+        game_items('PS4', 'Action', score)
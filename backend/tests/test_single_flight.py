@@ -0,0 +1,82 @@
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from single_flight import SingleFlight
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def blocked_compute(release, calls, result):
+    def compute():
+        calls.append(threading.get_ident())
+        release.wait(5)
+        return result
+    return compute
+
+
+def test_concurrent_callers_share_one_computation():
+    flight, release, calls = SingleFlight(), threading.Event(), []
+    compute = blocked_compute(release, calls, {"rows": 3})
+    with ThreadPoolExecutor(6) as pool:
+        futures = [pool.submit(flight.do, 'key', compute) for _ in range(6)]
+        wait_until(lambda: flight.stats["followers"] == 5)
+        release.set()
+        results = [f.result() for f in futures]
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert flight.stats["leaders"] == 1
+
+
+def test_followers_get_the_leaders_error_and_the_key_is_retried():
+    flight, release = SingleFlight(), threading.Event()
+
+    def failing():
+        release.wait(5)
+        raise ValueError("boom")
+
+    with ThreadPoolExecutor(3) as pool:
+        futures = [pool.submit(flight.do, 'key', failing) for _ in range(3)]
+        wait_until(lambda: flight.stats["followers"] == 2)
+        release.set()
+        for future in futures:
+            with pytest.raises(ValueError, match="boom"):
+                future.result()
+    assert flight.stats["errors"] == 1
+    assert flight.do('key', lambda: "fresh") == "fresh"
+
+
+def test_different_keys_do_not_wait_for_each_other():
+    flight, release, calls = SingleFlight(), threading.Event(), []
+    with ThreadPoolExecutor(1) as pool:
+        blocked = pool.submit(flight.do, 'slow', blocked_compute(release, calls, 1))
+        wait_until(lambda: calls)
+        assert flight.do('fast', lambda: 2) == 2
+        release.set()
+        assert blocked.result() == 1
+
+
+def test_worker_that_waited_on_the_lock_reuses_the_result_file(tmp_path):
+    # Two instances stand in for two worker processes sharing the directory
+    first, second = (SingleFlight(str(tmp_path), dump=pickle.dumps, load=pickle.loads) for _ in range(2))
+    release, calls = threading.Event(), []
+    with ThreadPoolExecutor(2) as pool:
+        leader = pool.submit(first.do, 'key', blocked_compute(release, calls, [1, 2]))
+        wait_until(lambda: calls)
+        waiter = pool.submit(second.do, 'key', blocked_compute(release, calls, "recomputed"))
+        time.sleep(0.05)
+        release.set()
+        assert leader.result() == waiter.result() == [1, 2]
+    assert len(calls) == 1
+    assert second.stats["shared"] == 1
+
+    # A result written before the caller arrived is stale and not reused
+    assert second.do('key', lambda: "later") == "later"
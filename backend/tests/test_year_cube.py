@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from preprocess import NUMERIC_COLUMNS
+from year_cube import MomentCube
+
+
+@pytest.fixture(scope="module")
+def games():
+    rng = np.random.default_rng(3)
+    n = 400
+    regions = rng.integers(0, 250, size=(n, 4)) / 100
+    df = pd.DataFrame({
+        'Platform': rng.choice(['PS4', 'XOne', 'PC', 'WiiU'], n),
+        'Genre': rng.choice(['Action', 'Sports', 'Puzzle'], n),
+        'Year_of_Release': rng.integers(2010, 2017, n),
+        'NA_Sales': regions[:, 0], 'EU_Sales': regions[:, 1], 'JP_Sales': regions[:, 2],
+        'Other_Sales': regions[:, 3], 'Global_Sales': regions.sum(axis=1),
+        'Critic_Score': rng.integers(30, 98, n).astype(float),
+        'User_Score': rng.integers(20, 95, n) / 10
+    })
+    # One slice where JP sales never vary, so its correlations are undefined
+    df.loc[df['Platform'] == 'WiiU', 'JP_Sales'] = 0.0
+    return df
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"platform": "PS4"},
+    {"genre": ["Action", "Puzzle"]},
+    {"year_min": 2012, "year_max": 2014},
+    {"platform": ["PC", "XOne"], "genre": "Sports", "year_min": 2013},
+    {"platform": "WiiU"},
+])
+def test_correlation_matches_pandas(games, filters):
+    count, corr = MomentCube(games).correlation(**filters)
+    mask = np.ones(len(games), dtype=bool)
+    for key, column in (("platform", 'Platform'), ("genre", 'Genre')):
+        if key in filters:
+            mask &= games[column].isin(np.atleast_1d(filters[key]))
+    mask &= games['Year_of_Release'] >= filters.get("year_min", 0)
+    mask &= games['Year_of_Release'] <= filters.get("year_max", 9999)
+    expected = games.loc[mask, NUMERIC_COLUMNS].corr()
+
+    assert count == mask.sum()
+    np.testing.assert_allclose(corr, expected.to_numpy(), atol=1e-9)
+
+
+def test_fewer_than_two_games_have_no_correlation(games):
+    count, corr = MomentCube(games.head(1)).correlation()
+    assert count == 1
+    assert np.isnan(corr).all()
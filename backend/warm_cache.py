@@ -0,0 +1,140 @@
+"""
+🎮 DSS Video Games - Warm Cache
+Snapshots of computed in-memory state (indexes, cubes, trained models,
+pre-serialized payloads) in a versioned file that is memory-mapped on load.
+A snapshot is keyed by a hash of the files the state was built from, so a
+process with unchanged inputs starts warm and stale snapshots are discarded.
+
+File layout: MAGIC, header length (8 bytes), JSON header, pickle stream, then
+the pickle's out-of-band buffers (numpy array data) at 64-byte aligned
+offsets. Loading maps the file and hands those buffers to pickle without
+copying, so arrays are paged in from disk as they are touched.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import struct
+
+from state_dir import ensure_private_dir, is_private
+
+MAGIC = b'DSSWARM\0'
+# Bump when the layout or the pickled state changes shape
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+FILE_PREFIX = 'warm-'
+FILE_SUFFIX = '.bin'
+
+
+def source_files(directory):
+    """The .py files of a directory, for keying state on the code that builds it"""
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith('.py'))
+
+
+def inputs_key(paths):
+    """Hash of the format version plus each input file's name and contents"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f'{FORMAT_VERSION}\n'.encode())
+    for path in paths:
+        h.update(os.path.basename(path).encode() + b'\0')
+        try:
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    h.update(chunk)
+        except OSError:
+            h.update(b'<missing>')
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def _padding(offset):
+    return -offset % ALIGNMENT
+
+
+def write_snapshot(path, key, state):
+    """Write state to path atomically (written aside, then renamed)"""
+    buffers = []
+    payload = pickle.dumps(state, protocol=5, buffer_callback=buffers.append)
+    raws = [b.raw() for b in buffers]
+
+    # Offsets are relative to the start of the data section after the header
+    offsets, offset = [], len(payload)
+    for raw in raws:
+        offset += _padding(offset)
+        offsets.append([offset, raw.nbytes])
+        offset += raw.nbytes
+    header = json.dumps({"version": FORMAT_VERSION, "key": key, "pickle_size": len(payload),
+                         "buffers": offsets}).encode()
+    header += b' ' * _padding(len(MAGIC) + 8 + len(header))
+
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'wb') as f:
+        f.write(MAGIC + struct.pack('<Q', len(header)) + header + payload)
+        position = len(payload)
+        for raw, (start, size) in zip(raws, offsets):
+            f.write(b'\0' * (start - position))
+            f.write(raw)
+            position = start + size
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path, key):
+    """State stored at path if it was written for key; None if missing, stale, corrupt
+    or not a private file of this user (unpickling runs code, so others' files are never loaded)"""
+    try:
+        with open(path, 'rb') as f:
+            if not is_private(os.fstat(f.fileno())):
+                return None
+            # Copy-on-write mapping: arrays stay writable, the file is never modified
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    except (OSError, ValueError):
+        return None
+    try:
+        if mapped[:len(MAGIC)] != MAGIC:
+            return None
+        (header_size,) = struct.unpack_from('<Q', mapped, len(MAGIC))
+        start = len(MAGIC) + 8
+        header = json.loads(mapped[start:start + header_size])
+        if header.get("version") != FORMAT_VERSION or header.get("key") != key:
+            return None
+        data = memoryview(mapped)[start + header_size:]
+        buffers = [data[offset:offset + size] for offset, size in header["buffers"]]
+        return pickle.loads(data[:header["pickle_size"]], buffers=buffers)
+    except Exception:
+        return None
+
+
+class WarmCache:
+    """Snapshot file for one inputs_key() in a cache directory"""
+
+    def __init__(self, cache_dir, key, name='state'):
+        self.cache_dir = cache_dir
+        self.name = name
+        self.key = key
+        self.path = os.path.join(cache_dir, f'{FILE_PREFIX}{name}-{self.key}{FILE_SUFFIX}')
+
+    def load(self):
+        """The stored state for the current inputs, or None (also if the directory is not private)"""
+        try:
+            ensure_private_dir(self.cache_dir)
+        except OSError as e:
+            print(f"⚠️ Warm cache not loaded: {e}")
+            return None
+        return read_snapshot(self.path, self.key)
+
+    def save(self, state):
+        """Store state for the current inputs and remove snapshots of older inputs"""
+        ensure_private_dir(self.cache_dir)
+        write_snapshot(self.path, self.key, state)
+        self.discard_stale()
+
+    def discard_stale(self):
+        prefix = f'{FILE_PREFIX}{self.name}-'
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.startswith(prefix) and entry.name.endswith(FILE_SUFFIX) and entry.path != self.path:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
@@ -0,0 +1,159 @@
+"""
+🎮 DSS Video Games - Year Cube
+Cumulative-by-year sums of counts, sales and scores (and the moments behind
+correlations) for every Platform x Genre slice, so any year range total for a
+filter combination is two lookups
+"""
+
+import copy
+
+import numpy as np
+
+from preprocess import NUMERIC_COLUMNS, REGION_COLUMNS, correlation_from_moments
+
+# Sums kept per cube cell: count first, then one sum per column
+AGGREGATE_FIELDS = ['count', 'Global_Sales', 'Critic_Score', 'User_Score'] + REGION_COLUMNS
+
+# Range sums are rounded to this many decimals to drop the cancellation error of
+# differencing prefix sums; sales and scores carry at most two decimals
+SUM_DECIMALS = 6
+
+
+def _as_list(values):
+    if values is None or isinstance(values, str):
+        return [values] if values else []
+    return list(values)
+
+
+class YearCube:
+    """Prefix sums over years for (platform, genre) slices.
+
+    ``cumulative[p, g, y]`` holds the ``fields`` sums of every game with
+    platform p, genre g and a release year before ``years[y]``. The extra last
+    platform and genre index is the "any" margin, so unfiltered and single
+    value queries never sum over slices.
+    """
+
+    fields = AGGREGATE_FIELDS
+
+    def __init__(self, df):
+        self.platforms = sorted(df['Platform'].unique())
+        self.genres = sorted(df['Genre'].unique())
+        self.platform_ids = {p: i for i, p in enumerate(self.platforms)}
+        self.genre_ids = {g: i for i, g in enumerate(self.genres)}
+        years = df['Year_of_Release'].to_numpy(dtype=int)
+        self.year_min = int(years.min()) if len(years) else 0
+        self.years = np.arange(self.year_min, (int(years.max()) + 1) if len(years) else 0)
+
+        self.cumulative = self._prefix_sums(df)
+
+    def _prefix_sums(self, df):
+        """Cumulative cube of df's rows over this cube's platforms, genres and years"""
+        n_p, n_g, n_y = len(self.platforms), len(self.genres), len(self.years)
+        p = df['Platform'].map(self.platform_ids).to_numpy(dtype=int)
+        g = df['Genre'].map(self.genre_ids).to_numpy(dtype=int)
+        flat = (p * n_g + g) * n_y + (df['Year_of_Release'].to_numpy(dtype=int) - self.year_min)
+        values = self.row_values(df)
+        size = n_p * n_g * n_y
+        cells = np.column_stack([np.bincount(flat, weights=values[:, j], minlength=size)
+                                 for j in range(len(self.fields))]).reshape(n_p, n_g, n_y, -1)
+
+        # Margins over all platforms / all genres, then prefix sums with a leading zero year
+        with_margins = np.zeros((n_p + 1, n_g + 1, n_y, len(self.fields)))
+        with_margins[:n_p, :n_g] = cells
+        with_margins[n_p, :n_g] = cells.sum(axis=0)
+        with_margins[:, n_g] = with_margins[:, :n_g].sum(axis=1)
+        cumulative = np.zeros((n_p + 1, n_g + 1, n_y + 1, len(self.fields)))
+        np.cumsum(with_margins, axis=2, out=cumulative[:, :, 1:])
+        return cumulative
+
+    def with_rows(self, df):
+        """Cube with df's rows added; None if they need a platform, genre or year it lacks"""
+        known = (set(df['Platform']) <= self.platform_ids.keys() and set(df['Genre']) <= self.genre_ids.keys()
+                 and np.isin(df['Year_of_Release'].to_numpy(dtype=int), self.years).all())
+        if not known:
+            return None
+        cube = copy.copy(self)
+        cube.cumulative = self.cumulative + self._prefix_sums(df)
+        return cube
+
+    def row_values(self, df):
+        """Per-game contribution to each of ``fields``, count first"""
+        return np.column_stack([np.ones(len(df)), df[self.fields[1:]].to_numpy(dtype=float)])
+
+    def _year_bounds(self, year_min=None, year_max=None):
+        """Prefix indexes [lo, hi) for the inclusive year range, clipped to the cube"""
+        n_y = len(self.years)
+        lo = 0 if year_min is None else int(np.clip(year_min - self.year_min, 0, n_y))
+        hi = n_y if year_max is None else int(np.clip(year_max - self.year_min + 1, 0, n_y))
+        return lo, max(lo, hi)
+
+    def _slice_ids(self, values, ids):
+        """Cube indexes for the selected values; the margin index when unfiltered"""
+        values = _as_list(values)
+        if not values:
+            return [len(ids)]
+        return [ids[v] for v in values if v in ids]
+
+    def range_sums(self, platform=None, genre=None, year_min=None, year_max=None):
+        """``fields`` sums for the filters, per (platform, genre) slice"""
+        lo, hi = self._year_bounds(year_min, year_max)
+        p = self._slice_ids(platform, self.platform_ids)
+        g = self._slice_ids(genre, self.genre_ids)
+        prefix = self.cumulative[np.ix_(p, g)]
+        return np.round(prefix[:, :, hi] - prefix[:, :, lo], SUM_DECIMALS)
+
+    def totals(self, platform=None, genre=None, year_min=None, year_max=None):
+        """``fields`` sums over all games matching the filters, as a dict"""
+        sums = self.range_sums(platform, genre, year_min, year_max).sum(axis=(0, 1))
+        return dict(zip(self.fields, sums.tolist()))
+
+    def group_sums(self, column, platform=None, genre=None, year_min=None, year_max=None):
+        """(values, ``fields`` sums per value) of column for the filters; empty groups dropped"""
+        if column == 'Year_of_Release':
+            p = self._slice_ids(platform, self.platform_ids)
+            g = self._slice_ids(genre, self.genre_ids)
+            lo, hi = self._year_bounds(year_min, year_max)
+            prefix = self.cumulative[np.ix_(p, g)][:, :, lo:hi + 1].sum(axis=(0, 1))
+            sums, keys = np.round(np.diff(prefix, axis=0), SUM_DECIMALS), self.years[lo:hi].tolist()
+        elif column == 'Platform':
+            keys = self.platforms
+            if platform:
+                keys = [k for k in keys if k in set(_as_list(platform))]
+            g = self._slice_ids(genre, self.genre_ids)
+            lo, hi = self._year_bounds(year_min, year_max)
+            prefix = self.cumulative[[self.platform_ids[k] for k in keys]][:, g].sum(axis=1)
+            sums = np.round(prefix[:, hi] - prefix[:, lo], SUM_DECIMALS)
+        elif column == 'Genre':
+            keys = self.genres
+            if genre:
+                keys = [k for k in keys if k in set(_as_list(genre))]
+            p = self._slice_ids(platform, self.platform_ids)
+            lo, hi = self._year_bounds(year_min, year_max)
+            prefix = self.cumulative[p][:, [self.genre_ids[k] for k in keys]].sum(axis=0)
+            sums = np.round(prefix[:, hi] - prefix[:, lo], SUM_DECIMALS)
+        else:
+            raise ValueError(f"Year cube has no {column} dimension")
+
+        sums = np.reshape(sums, (len(keys), len(self.fields)))
+        present = sums[:, 0] > 0
+        return [k for k, keep in zip(keys, present) if keep], sums[present]
+
+
+class MomentCube(YearCube):
+    """Year cube of the sufficient statistics for correlations of NUMERIC_COLUMNS:
+    game count, per-column sums and every pairwise cross-product sum"""
+
+    fields = (['count'] + NUMERIC_COLUMNS +
+              [f'{a}*{b}' for a in NUMERIC_COLUMNS for b in NUMERIC_COLUMNS])
+
+    def row_values(self, df):
+        x = df[NUMERIC_COLUMNS].to_numpy(dtype=float)
+        return np.column_stack([np.ones(len(x)), x, (x[:, :, None] * x[:, None, :]).reshape(len(x), -1)])
+
+    def correlation(self, platform=None, genre=None, year_min=None, year_max=None):
+        """(game count, NUMERIC_COLUMNS correlation matrix) for the filters"""
+        sums = self.range_sums(platform, genre, year_min, year_max).sum(axis=(0, 1))
+        k = len(NUMERIC_COLUMNS)
+        count = sums[0]
+        return int(count), correlation_from_moments(count, sums[1:k + 1], sums[k + 1:].reshape(k, k))
@@ -22,6 +22,11 @@ interface Game {
   User_Score: number;
 }
 
+interface FacetCount {
+  value: string | number;
+  count: number;
+}
+
 export default function DataExplorer({ metadata }: DataExplorerProps) {
   const [games, setGames] = useState<Game[]>([]);
   const [loading, setLoading] = useState(true);
@@ -35,15 +40,21 @@ export default function DataExplorer({ metadata }: DataExplorerProps) {
   const [genre, setGenre] = useState('');
   const [sortBy, setSortBy] = useState('Global_Sales');
   const [sortOrder, setSortOrder] = useState('desc');
+  const [facets, setFacets] = useState<Record<string, FacetCount[]>>({});
 
   useEffect(() => {
     fetchGames();
   }, [page, platform, genre, sortBy, sortOrder]);
 
+  useEffect(() => {
+    fetchFacets();
+  }, [platform, genre]);
+
   useEffect(() => {
     const debounce = setTimeout(() => {
       setPage(1);
       fetchGames();
+      fetchFacets();
     }, 500);
     return () => clearTimeout(debounce);
   }, [search]);
@@ -73,6 +84,28 @@ export default function DataExplorer({ metadata }: DataExplorerProps) {
     setLoading(false);
   };
 
+  const fetchFacets = async () => {
+    try {
+      const params = new URLSearchParams();
+      if (search) params.append('search', search);
+      if (platform) params.append('platform', platform);
+      if (genre) params.append('genre', genre);
+
+      const response = await fetch(`/api/games/facets?${params}`);
+      const data = await response.json();
+
+      setFacets(data.facets);
+    } catch (error) {
+      console.error('Error fetching facets:', error);
+    }
+  };
+
+  // Option label with the number of games it would leave under the other filters
+  const facetLabel = (facet: string, value: string) => {
+    const count = facets[facet]?.find((f) => f.value === value)?.count;
+    return count === undefined ? value : `${value} (${count})`;
+  };
+
   const totalPages = Math.ceil(total / limit);
 
   const handleSort = (column: string) => {
@@ -129,7 +162,7 @@ export default function DataExplorer({ metadata }: DataExplorerProps) {
             >
               <option value="">All Platforms</option>
               {metadata?.platforms?.map((p: string) => (
-                <option key={p} value={p}>{p}</option>
+                <option key={p} value={p}>{facetLabel('platform', p)}</option>
               ))}
             </select>
           </div>
@@ -144,7 +177,7 @@ export default function DataExplorer({ metadata }: DataExplorerProps) {
             >
               <option value="">All Genres</option>
               {metadata?.genres?.map((g: string) => (
-                <option key={g} value={g}>{g}</option>
+                <option key={g} value={g}>{facetLabel('genre', g)}</option>
               ))}
             </select>
           </div>
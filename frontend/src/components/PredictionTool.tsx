@@ -1,7 +1,7 @@
 'use client';
 
-import { useState } from 'react';
-import { Wand2, Sparkles, TrendingUp, AlertTriangle, CheckCircle, Info, XCircle } from 'lucide-react';
+import { useEffect, useRef, useState } from 'react';
+import { Wand2, Sparkles, TrendingUp, AlertTriangle, CheckCircle, Info, XCircle, LayoutGrid, Zap } from 'lucide-react';
 
 interface PredictionToolProps {
   metadata: any;
@@ -13,17 +13,103 @@ interface Recommendation {
   message: string;
 }
 
+interface MatchedRule {
+  source: string;
+  antecedent: string;
+  consequent: string;
+  support: number;
+  confidence: number;
+  lift: number;
+}
+
+interface FeatureContribution {
+  feature: string;
+  value: string | number;
+  contribution: number;
+}
+
+interface Explanation {
+  class: string;
+  base_value: number;
+  contributions: FeatureContribution[];
+}
+
 interface PredictionResult {
   success: boolean;
   prediction: string;
   probabilities: Record<string, number>;
   confidence: number;
   recommendations: Recommendation[];
+  matched_rules?: MatchedRule[];
+  explanation?: Explanation;
+}
+
+interface StreamPrediction {
+  seq: number;
+  prediction: string;
+  probabilities: Record<string, number>;
+  confidence: number;
+  recommendations: Recommendation[];
+  matched_rules: MatchedRule[];
+  superseded: number;
+}
+
+interface StreamUpdate {
+  critic_score: number;
+  user_score: number;
+  year: number;
+  seq: number;
+}
+
+interface SurfaceResult {
+  success: boolean;
+  critic_scores: number[];
+  user_scores: number[];
+  classes: string[];
+  probabilities: Record<string, number[][]>;
+  predictions: string[][];
+}
+
+interface MatrixCell {
+  platform: string;
+  genre: string;
+  score: number;
+  prediction: string;
 }
 
+interface SimilarGame {
+  id: number;
+  Name: string;
+  Platform: string;
+  Genre: string;
+  Publisher: string;
+  Year_of_Release: number;
+  Global_Sales: number;
+  Critic_Score: number;
+  User_Score: number;
+  distance: number;
+}
+
+const FEATURE_LABELS: Record<string, string> = {
+  Platform_Encoded: 'Platform',
+  Genre_Encoded: 'Genre',
+  Publisher_Encoded: 'Publisher',
+  Critic_Score: 'Critic Score',
+  User_Score: 'User Score',
+  Year_of_Release: 'Release Year'
+};
+
+const SURFACE_RESOLUTION = 21;
+const SIMILAR_GAMES = 5;
+const SHIP_OPTIONS = 5;
+
 export default function PredictionTool({ metadata }: PredictionToolProps) {
   const [loading, setLoading] = useState(false);
   const [result, setResult] = useState<PredictionResult | null>(null);
+  const [surface, setSurface] = useState<SurfaceResult | null>(null);
+  const [surfaceClass, setSurfaceClass] = useState('Hit');
+  const [similar, setSimilar] = useState<SimilarGame[]>([]);
+  const [shipOptions, setShipOptions] = useState<MatrixCell[]>([]);
   
   // Form state
   const [platform, setPlatform] = useState('PS4');
@@ -33,24 +119,171 @@ export default function PredictionTool({ metadata }: PredictionToolProps) {
   const [userScore, setUserScore] = useState(7.0);
   const [year, setYear] = useState(2026);
 
-  const handlePredict = async () => {
-    setLoading(true);
+  // Live slider predictions: one server-sent event stream per platform/genre/publisher
+  const [live, setLive] = useState(false);
+  const [streamEpoch, setStreamEpoch] = useState(0);
+  const sessionRef = useRef<string | null>(null);
+  const streamFailedRef = useRef(false);
+  const seqRef = useRef(0);
+  const appliedSeqRef = useRef(0);
+  const predictedSeqRef = useRef(0);
+  const inFlightRef = useRef(false);
+  const queuedRef = useRef<StreamUpdate | null>(null);
+  const scoresRef = useRef({ criticScore, userScore, year });
+  scoresRef.current = { criticScore, userScore, year };
+  const hasResult = result !== null;
+
+  useEffect(() => {
+    if (!hasResult) return;
+    const { criticScore, userScore, year } = scoresRef.current;
+    const params = new URLSearchParams({
+      platform,
+      genre,
+      publisher,
+      critic_score: String(criticScore),
+      user_score: String(userScore),
+      year: String(year),
+      seq: String(seqRef.current)
+    });
+    const source = new EventSource(`/api/predict/stream?${params}`);
+    const stop = () => {
+      source.close();
+      sessionRef.current = null;
+      setLive(false);
+    };
+    source.addEventListener('session', (event) => {
+      sessionRef.current = JSON.parse((event as MessageEvent).data).session_id;
+      streamFailedRef.current = false;
+      setLive(true);
+    });
+    source.addEventListener('prediction', (event) => {
+      const data: StreamPrediction = JSON.parse((event as MessageEvent).data);
+      if (data.seq < appliedSeqRef.current) return;
+      appliedSeqRef.current = data.seq;
+      // The explanation belongs to the last full prediction, so it is dropped once scores move
+      setResult((previous) => previous && {
+        ...previous,
+        prediction: data.prediction,
+        probabilities: data.probabilities,
+        confidence: data.confidence,
+        recommendations: data.recommendations,
+        matched_rules: data.matched_rules,
+        explanation: data.seq <= predictedSeqRef.current ? previous.explanation : undefined
+      });
+    });
+    source.addEventListener('end', stop);
+    source.onerror = () => {
+      // Busy or unreachable: stay on "Predict Success" until the context changes
+      streamFailedRef.current = true;
+      stop();
+    };
+    return stop;
+  }, [hasResult, platform, genre, publisher, streamEpoch]);
+
+  // Only one update request in flight; the server also skips updates it has not evaluated yet
+  const sendUpdate = async (update: StreamUpdate) => {
+    if (inFlightRef.current) {
+      queuedRef.current = update;
+      return;
+    }
+    inFlightRef.current = true;
     try {
-      const response = await fetch('/api/predict', {
+      const response = await fetch(`/api/predict/stream/${sessionRef.current}`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({
-          platform,
-          genre,
-          publisher,
-          critic_score: criticScore,
-          user_score: userScore,
-          year
-        })
+        body: JSON.stringify(update)
       });
+      if (response.status === 404) {
+        sessionRef.current = null;
+        setStreamEpoch((epoch) => epoch + 1);
+      }
+    } catch (error) {
+      console.error('Live prediction update error:', error);
+    }
+    inFlightRef.current = false;
+    const queued = queuedRef.current;
+    queuedRef.current = null;
+    if (queued && sessionRef.current) sendUpdate(queued);
+  };
+
+  useEffect(() => {
+    if (!hasResult) return;
+    seqRef.current += 1;
+    if (sessionRef.current) {
+      sendUpdate({ critic_score: criticScore, user_score: userScore, year, seq: seqRef.current });
+    } else if (!live && !streamFailedRef.current) {
+      // The stream closed while idle; reopening it evaluates the current scores
+      setStreamEpoch((epoch) => epoch + 1);
+    }
+  }, [criticScore, userScore, year]);
+
+  const handlePredict = async () => {
+    setLoading(true);
+    // Stream results for earlier slider positions must not overwrite this full prediction
+    predictedSeqRef.current = seqRef.current;
+    appliedSeqRef.current = seqRef.current;
+    try {
+      const [response, surfaceResponse, similarResponse, matrixResponse] = await Promise.all([
+        fetch('/api/predict?explain=1', {
+          method: 'POST',
+          headers: { 'Content-Type': 'application/json' },
+          body: JSON.stringify({
+            platform,
+            genre,
+            publisher,
+            critic_score: criticScore,
+            user_score: userScore,
+            year
+          })
+        }),
+        fetch('/api/predict/surface', {
+          method: 'POST',
+          headers: { 'Content-Type': 'application/json' },
+          body: JSON.stringify({
+            platform,
+            genre,
+            publisher,
+            year,
+            resolution: SURFACE_RESOLUTION
+          })
+        }),
+        fetch('/api/games/similar', {
+          method: 'POST',
+          headers: { 'Content-Type': 'application/json' },
+          body: JSON.stringify({
+            query: {
+              platform,
+              genre,
+              critic_score: criticScore,
+              user_score: userScore
+            },
+            k: SIMILAR_GAMES
+          })
+        }),
+        fetch('/api/predict/matrix', {
+          method: 'POST',
+          headers: { 'Content-Type': 'application/json' },
+          body: JSON.stringify({
+            base: {
+              publisher,
+              critic_score: criticScore,
+              user_score: userScore,
+              year
+            },
+            vary: { platform: 'all', genre: 'all' },
+            top: SHIP_OPTIONS
+          })
+        })
+      ]);
       
       const data = await response.json();
       setResult(data);
+      const surfaceData = await surfaceResponse.json();
+      setSurface(surfaceData.success ? surfaceData : null);
+      const similarData = await similarResponse.json();
+      setSimilar(similarData.success ? similarData.results[0].similar : []);
+      const matrixData = await matrixResponse.json();
+      setShipOptions(matrixData.success ? matrixData.ranking : []);
     } catch (error) {
       console.error('Prediction error:', error);
     }
@@ -240,7 +473,14 @@ export default function PredictionTool({ metadata }: PredictionToolProps) {
               {/* Prediction Result Card */}
               <div className={`rounded-2xl p-6 bg-gradient-to-br ${getCategoryColor(result.prediction)} text-white`}>
                 <div className="text-center">
-                  <p className="text-white/80 mb-2">Predicted Category</p>
+                  <p className="text-white/80 mb-2 flex items-center justify-center gap-2">
+                    Predicted Category
+                    {live && (
+                      <span className="flex items-center gap-1 text-xs bg-white/20 rounded-full px-2 py-0.5" title="Updates live as you move the sliders">
+                        <Zap className="w-3 h-3" /> Live
+                      </span>
+                    )}
+                  </p>
                   <div className="text-6xl mb-3">{getCategoryEmoji(result.prediction)}</div>
                   <h2 className="text-4xl font-bold mb-2">{result.prediction}</h2>
                   <p className="text-white/80">
@@ -275,6 +515,128 @@ export default function PredictionTool({ metadata }: PredictionToolProps) {
                 </div>
               </div>
 
+              {/* Best Platform x Genre Combinations */}
+              {shipOptions.length > 0 && (
+                <div className="glass rounded-2xl p-6">
+                  <h3 className="text-lg font-semibold text-white mb-1">🚀 Where to Ship</h3>
+                  <p className="text-white/50 text-xs mb-4">
+                    Platform × genre combinations with the highest Hit + Blockbuster probability for this publisher and scores
+                  </p>
+                  <div className="space-y-2">
+                    {shipOptions.map((option) => (
+                      <div
+                        key={`${option.platform}-${option.genre}`}
+                        className={`flex items-center justify-between p-3 rounded-xl ${
+                          option.platform === platform && option.genre === genre ? 'bg-purple-500/20' : 'bg-white/5'
+                        }`}
+                      >
+                        <span className="text-white text-sm">
+                          {option.platform} · {option.genre}
+                          <span className="text-white/40"> ({option.prediction})</span>
+                        </span>
+                        <span className="text-white font-semibold text-sm">{(option.score * 100).toFixed(1)}%</span>
+                      </div>
+                    ))}
+                  </div>
+                </div>
+              )}
+
+              {/* What-if Sensitivity Surface */}
+              {surface && (
+                <div className="glass rounded-2xl p-6">
+                  <div className="flex items-center justify-between mb-4">
+                    <h3 className="text-lg font-semibold text-white flex items-center gap-2">
+                      <LayoutGrid className="w-5 h-5" />
+                      What-if: Critic × User Score
+                    </h3>
+                    <select
+                      value={surfaceClass}
+                      onChange={(e) => setSurfaceClass(e.target.value)}
+                      className="input-field text-sm py-1"
+                    >
+                      {surface.classes.map((c) => (
+                        <option key={c} value={c}>{c}</option>
+                      ))}
+                    </select>
+                  </div>
+                  <div className="flex gap-2">
+                    <div className="flex flex-col justify-between text-white/40 text-xs py-1">
+                      <span>{surface.user_scores[surface.user_scores.length - 1]}</span>
+                      <span>User</span>
+                      <span>{surface.user_scores[0]}</span>
+                    </div>
+                    <div
+                      className="flex-1 grid gap-px"
+                      style={{ gridTemplateColumns: `repeat(${surface.critic_scores.length}, minmax(0, 1fr))` }}
+                    >
+                      {surface.user_scores.map((_, i) => surface.user_scores.length - 1 - i).map((row) =>
+                        surface.critic_scores.map((critic, col) => {
+                          const probability = surface.probabilities[surfaceClass]?.[row]?.[col] ?? 0;
+                          const user = surface.user_scores[row];
+                          const isCurrent =
+                            Math.abs(critic - criticScore) <= 50 / (surface.critic_scores.length - 1) &&
+                            Math.abs(user - userScore) <= 5 / (surface.user_scores.length - 1);
+                          return (
+                            <div
+                              key={`${row}-${col}`}
+                              title={`Critic ${critic} · User ${user}: ${(probability * 100).toFixed(1)}% ${surfaceClass} (${surface.predictions[row][col]})`}
+                              className={`aspect-square rounded-sm ${isCurrent ? 'ring-2 ring-white' : ''}`}
+                              style={{ backgroundColor: `rgba(168, 85, 247, ${0.08 + probability * 0.92})` }}
+                            />
+                          );
+                        })
+                      )}
+                    </div>
+                  </div>
+                  <div className="flex justify-between text-white/40 text-xs mt-1 ml-8">
+                    <span>{surface.critic_scores[0]}</span>
+                    <span>Critic Score</span>
+                    <span>{surface.critic_scores[surface.critic_scores.length - 1]}</span>
+                  </div>
+                  <p className="text-white/40 text-xs mt-3">
+                    💡 Probability of <span className="text-white/70">{surfaceClass}</span> for every score combination; the outlined cell is your current input
+                  </p>
+                </div>
+              )}
+
+              {/* Feature Contributions */}
+              {result.explanation && (
+                <div className="glass rounded-2xl p-6">
+                  <h3 className="text-lg font-semibold text-white mb-1">🧭 Why {result.explanation.class}?</h3>
+                  <p className="text-white/50 text-xs mb-4">
+                    Starting from the average {(result.explanation.base_value * 100).toFixed(1)}%, each input moves the {result.explanation.class} probability
+                  </p>
+                  <div className="space-y-3">
+                    {result.explanation.contributions.map((item) => {
+                      const maxAbs = Math.max(...result.explanation!.contributions.map((c) => Math.abs(c.contribution)), 1e-6);
+                      const width = (Math.abs(item.contribution) / maxAbs) * 50;
+                      return (
+                        <div key={item.feature}>
+                          <div className="flex justify-between text-sm mb-1">
+                            <span className="text-white/70">
+                              {FEATURE_LABELS[item.feature] || item.feature}
+                              <span className="text-white/40"> = {item.value}</span>
+                            </span>
+                            <span className={item.contribution >= 0 ? 'text-green-400' : 'text-red-400'}>
+                              {item.contribution >= 0 ? '+' : ''}{(item.contribution * 100).toFixed(1)}%
+                            </span>
+                          </div>
+                          <div className="relative h-2 bg-white/10 rounded-full">
+                            <div
+                              className={`absolute h-full rounded-full ${item.contribution >= 0 ? 'bg-green-500' : 'bg-red-500'}`}
+                              style={{
+                                width: `${width}%`,
+                                left: item.contribution >= 0 ? '50%' : `${50 - width}%`
+                              }}
+                            />
+                          </div>
+                        </div>
+                      );
+                    })}
+                  </div>
+                </div>
+              )}
+
               {/* Recommendations */}
               <div className="glass rounded-2xl p-6">
                 <h3 className="text-lg font-semibold text-white mb-4">💡 Recommendations</h3>
@@ -300,6 +662,52 @@ export default function PredictionTool({ metadata }: PredictionToolProps) {
                   ))}
                 </div>
               </div>
+
+              {/* Matching Association Rules */}
+              {result.matched_rules && result.matched_rules.length > 0 && (
+                <div className="glass rounded-2xl p-6">
+                  <h3 className="text-lg font-semibold text-white mb-4">🔗 Matching Rules</h3>
+                  <div className="space-y-3">
+                    {result.matched_rules.map((rule, index) => (
+                      <div key={index} className="p-4 rounded-xl bg-white/5">
+                        <p className="text-white text-sm">
+                          <span className="text-purple-300">{rule.antecedent}</span>
+                          <span className="text-white/40"> → </span>
+                          <span className="text-pink-300">{rule.consequent}</span>
+                        </p>
+                        <p className="text-white/50 text-xs mt-1">
+                          Lift {rule.lift.toFixed(2)} · Confidence {(rule.confidence * 100).toFixed(1)}% · Support {(rule.support * 100).toFixed(1)}%
+                        </p>
+                      </div>
+                    ))}
+                  </div>
+                </div>
+              )}
+
+              {/* Similar Existing Games */}
+              {similar.length > 0 && (
+                <div className="glass rounded-2xl p-6">
+                  <h3 className="text-lg font-semibold text-white mb-4">🎯 Similar Games</h3>
+                  <div className="space-y-2">
+                    {similar.map((game) => (
+                      <div key={game.id} className="flex items-center justify-between p-3 rounded-xl bg-white/5">
+                        <div>
+                          <p className="text-white text-sm font-medium">{game.Name}</p>
+                          <p className="text-white/50 text-xs">
+                            {game.Platform} · {game.Genre} · {game.Year_of_Release}
+                          </p>
+                        </div>
+                        <div className="text-right">
+                          <p className="text-white text-sm">{game.Global_Sales.toFixed(2)}M</p>
+                          <p className="text-white/50 text-xs">
+                            Critic {game.Critic_Score} · User {game.User_Score}
+                          </p>
+                        </div>
+                      </div>
+                    ))}
+                  </div>
+                </div>
+              )}
             </>
           ) : (
             /* Empty State */